@@ -0,0 +1,128 @@
+"""
+Storage for the shared response cache (app.cache.response_cache).
+
+RedisBackend works with Redis or any server speaking its protocol (Valkey, KeyDB, Dragonfly);
+MemoryBackend keeps the same operations in the worker's memory and is used when no server is
+configured or while it is unavailable.
+"""
+import time
+from collections import OrderedDict
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import cast
+
+from redis import asyncio as redis
+from redis.exceptions import RedisError
+
+# what a failing cache server raises; the response cache switches to memory on these
+BACKEND_ERRORS = (RedisError, OSError, TimeoutError)
+
+
+class CacheBackend:
+    async def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        raise NotImplementedError
+
+    async def add(self, key: str, value: bytes, ttl: float) -> bool:
+        """Set only if the key does not exist; True if it was set"""
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    async def incr(self, *keys: str) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisBackend(CacheBackend):
+    def __init__(self, url: str, timeout: float):
+        # short timeouts: a slow cache server must cost a request less than the query it saves;
+        # responses are not decoded, values come back as bytes
+        self.client = redis.Redis.from_url(url, socket_timeout=timeout, socket_connect_timeout=timeout)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return cast(Optional[bytes], await self.client.get(key))
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        return cast(List[Optional[bytes]], await self.client.mget(keys))
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self.client.set(key, value, px=max(int(ttl * 1000), 1))
+
+    async def add(self, key: str, value: bytes, ttl: float) -> bool:
+        return bool(await self.client.set(key, value, px=max(int(ttl * 1000), 1), nx=True))
+
+    async def delete(self, key: str) -> None:
+        await self.client.delete(key)
+
+    async def incr(self, *keys: str) -> None:
+        async with self.client.pipeline(transaction=False) as pipeline:
+            for key in keys:
+                pipeline.incr(key)
+            await pipeline.execute()
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+class MemoryBackend(CacheBackend):
+    """LRU of at most max_size values; counters (incr) are kept apart and never evicted"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._values: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._counters: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        if key in self._counters:
+            return str(self._counters[key]).encode()
+        entry = self._values.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._values[key]
+            return None
+        self._values.move_to_end(key)
+        return entry[1]
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        return [await self.get(key) for key in keys]
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        if self.max_size <= 0:
+            return
+        self._values[key] = (time.monotonic() + ttl, value)
+        self._values.move_to_end(key)
+        while len(self._values) > self.max_size:
+            self._values.popitem(last=False)
+
+    async def add(self, key: str, value: bytes, ttl: float) -> bool:
+        if await self.get(key) is not None:
+            return False
+        await self.set(key, value, ttl)
+        return True
+
+    async def delete(self, key: str) -> None:
+        self._values.pop(key, None)
+
+    async def incr(self, *keys: str) -> None:
+        for key in keys:
+            self._counters[key] = self._counters.get(key, 0) + 1
+
+    def clear(self) -> None:
+        self._values.clear()
+        self._counters.clear()
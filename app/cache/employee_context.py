@@ -0,0 +1,126 @@
+"""
+Per-worker LRU of rendered employee context documents (GET /employees/v1/{id}/context).
+
+Entries are the exact response bytes, so a hit costs a dict lookup. Write paths call invalidate()
+which drops the entry here and announces the ids on the employee_context NOTIFY channel; the TTL
+bounds staleness for anything a notification missed. A read that started before an invalidation
+must not store its (old) document afterwards, hence the per-employee generation token. Both
+invalidations also drop the coalesced reads of the same employees (app.cache.single_flight), and
+invalidate()/clear() the entries of the shared response cache (app.cache.response_cache); other
+workers drop its in-memory entries when they receive the notification.
+"""
+import json
+import time
+from collections import OrderedDict
+from typing import Dict
+from typing import Iterable
+from typing import Optional
+from typing import Tuple
+
+from app.cache.response_cache import employee_scope
+from app.cache.response_cache import response_cache
+from app.cache.single_flight import single_flight
+from app.common.config import settings
+from app.common.logging import logger
+from app.events.pg_notify import MAX_PAYLOAD_BYTES
+from app.events.pg_notify import PgNotifyListener
+from app.events.pg_notify import notify
+
+EMPLOYEE_CONTEXT_CHANNEL = "employee_context"
+_ALL = "*"
+
+
+class EmployeeContextCache:
+    __slots__ = ("ttl", "max_size", "_entries", "_generations", "_epoch")
+
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[int, Tuple[float, bytes]]" = OrderedDict()
+        self._generations: Dict[int, int] = {}
+        self._epoch = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, employee_id: int) -> Optional[bytes]:
+        entry = self._entries.get(employee_id)
+        if entry is None:
+            return None
+        expires_at, blob = entry
+        if expires_at < time.monotonic():
+            del self._entries[employee_id]
+            return None
+        self._entries.move_to_end(employee_id)
+        return blob
+
+    def token(self, employee_id: int) -> Tuple[int, int]:
+        """Take before reading from the database, pass to put()"""
+        return self._epoch, self._generations.get(employee_id, 0)
+
+    def put(self, employee_id: int, blob: bytes, token: Tuple[int, int]) -> None:
+        if self.max_size <= 0 or token != self.token(employee_id):
+            return
+        self._entries[employee_id] = (time.monotonic() + self.ttl, blob)
+        self._entries.move_to_end(employee_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate_local(self, employee_ids: Iterable[int]) -> None:
+        employee_ids = list(employee_ids)
+        for employee_id in employee_ids:
+            self._entries.pop(employee_id, None)
+            self._generations[employee_id] = self._generations.get(employee_id, 0) + 1
+        single_flight.forget_employees(employee_ids)
+
+    def clear_local(self) -> None:
+        self._entries.clear()
+        self._generations.clear()
+        self._epoch += 1
+        single_flight.clear()
+
+    async def invalidate(self, *employee_ids: int) -> None:
+        """Drop the documents here and in every other worker"""
+        ids = sorted(set(employee_ids))
+        if not ids:
+            return
+        # shared entries first: a read in between would otherwise coalesce on the old version again
+        await response_cache.invalidate_employees(ids)
+        self.invalidate_local(ids)
+        payload = json.dumps(ids, separators=(",", ":"))
+        if len(payload.encode()) > MAX_PAYLOAD_BYTES:
+            await self.clear()
+            return
+        await notify(EMPLOYEE_CONTEXT_CHANNEL, payload)
+
+    async def clear(self) -> None:
+        await response_cache.clear()
+        self.clear_local()
+        await notify(EMPLOYEE_CONTEXT_CHANNEL, _ALL)
+
+    async def _on_notification(self, payload: str) -> None:
+        if payload == _ALL:
+            await self._resync()
+            return
+        try:
+            ids = [int(employee_id) for employee_id in json.loads(payload)]
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Malformed employee context notification, clearing cache: {str(e)}")
+            await self._resync()
+            return
+        self.invalidate_local(ids)
+        # the sender bumped the shared versions; the ones in this worker's memory are its own
+        await response_cache.invalidate_local(*(employee_scope(employee_id) for employee_id in ids))
+
+    async def _resync(self) -> None:
+        self.clear_local()
+        await response_cache.clear_local()
+
+    def attach(self, listener: PgNotifyListener) -> None:
+        listener.subscribe(EMPLOYEE_CONTEXT_CHANNEL, self._on_notification, on_reconnect=self._resync)
+
+
+employee_context_cache = EmployeeContextCache(
+    ttl=settings.EMPLOYEE_CONTEXT_CACHE_TTL_SECONDS,
+    max_size=settings.EMPLOYEE_CONTEXT_CACHE_SIZE,
+)
@@ -0,0 +1,278 @@
+"""
+Response cache shared by all workers and pods, for expensive GET endpoints.
+
+Values are the serialized response bytes, stored in Redis (RESPONSE_CACHE_URL, any server speaking
+its protocol) or, without a server or while it is unavailable, in the worker's memory.
+
+Keys are versioned: a cached method names a scope (the quest list, an employee) and the key
+includes the current version of that scope and a global epoch. Write paths call invalidate() for
+the scopes they changed, which increments the versions; entries under the old versions are never
+read again and expire on their own. A read that loaded its data before a write and stores it
+afterwards stores it under the old version, so it cannot bring back stale data.
+
+Hot keys do not stampede:
+- an entry is recomputed before it expires, with a probability growing towards the expiry and
+  with the time the computation took (XFetch: now - delta * beta * ln(rand) >= expiry), so one of
+  the readers usually refreshes it while the others still get hits;
+- whoever recomputes holds a lock (SET NX with RESPONSE_CACHE_LOCK_SECONDS); meanwhile the other
+  readers get the expired entry, which is kept for another TTL, or, if there is none, wait for the
+  entry to appear instead of querying the database as well.
+
+Fills read from the primary (app.common.replicas.on_primary): a replica may not have replayed the
+write whose invalidation caused the miss, and the entry would keep its rows under the new version
+for the whole TTL.
+
+Bodies above RESPONSE_CACHE_COMPRESS_MIN_BYTES are compressed with zlib. Lookups are counted per
+endpoint and outcome in response_cache_lookups; the hit ratio of an endpoint is
+(hit + stale + waited) / all.
+
+Entries in memory are kept at most RESPONSE_CACHE_FALLBACK_TTL_SECONDS. Employee invalidations and
+clear() of other workers reach them through the employee_context notifications
+(EmployeeContextCache calls invalidate_local()/clear_local()); other scopes rely on that TTL. When
+the server fails, the worker uses memory for
+RESPONSE_CACHE_RETRY_SECONDS; if an invalidation could not be sent meanwhile, the global epoch
+is incremented once the server is back, which drops everything cached before.
+"""
+import asyncio
+import functools
+import math
+import random
+import struct
+import time
+import zlib
+from typing import Awaitable
+from typing import Callable
+from typing import Iterable
+from typing import Optional
+from typing import Tuple
+
+from app.cache.backends import BACKEND_ERRORS
+from app.cache.backends import CacheBackend
+from app.cache.backends import MemoryBackend
+from app.cache.backends import RedisBackend
+from app.common.config import settings
+from app.common.logging import logger
+from app.common.metrics import registry
+from app.common.replicas import on_primary
+
+# bump when the layout of cached values changes, entries of the previous layout are then ignored
+FORMAT = 1
+PREFIX = f"rc{FORMAT}"
+EPOCH_KEY = f"{PREFIX}:epoch"
+
+HIT = "hit"
+STALE = "stale"
+WAITED = "waited"
+EARLY = "early"
+MISS = "miss"
+
+LOOKUPS = registry.counter("response_cache_lookups", "Response cache lookups", ("endpoint", "outcome"))
+BACKEND_FAILURES = registry.counter("response_cache_backend_failures", "Cache server errors, memory used instead")
+
+# expires_at (unix time), time the value took to compute in seconds, flags
+_HEADER = struct.Struct("!dfB")
+_COMPRESSED = 1
+_WAIT_STEP = 0.05
+
+
+def quests_scope() -> str:
+    return "quests"
+
+
+def employee_scope(employee_id: int, *args) -> str:
+    return f"employee:{employee_id}"
+
+
+def encode(body: bytes, expires_at: float, delta: float, compress_min_bytes: int) -> bytes:
+    flags = 0
+    if 0 <= compress_min_bytes <= len(body):
+        body, flags = zlib.compress(body, 1), _COMPRESSED
+    return _HEADER.pack(expires_at, delta, flags) + body
+
+
+def decode(value: bytes) -> Tuple[float, float, bytes]:
+    expires_at, delta, flags = _HEADER.unpack_from(value)
+    body = value[_HEADER.size:]
+    if flags & _COMPRESSED:
+        body = zlib.decompress(body)
+    return expires_at, delta, body
+
+
+class ResponseCache:
+    def __init__(self, url: Optional[str], memory_size: int):
+        self.url = url or None
+        self.memory = MemoryBackend(memory_size)
+        self.shared: Optional[CacheBackend] = None
+        self._down_until = 0.0
+        self._lost_invalidations = False
+
+    def _backend(self) -> CacheBackend:
+        if self.url is None or time.monotonic() < self._down_until:
+            return self.memory
+        if self.shared is None:
+            # created on first use, in the process (and event loop) that uses it
+            self.shared = RedisBackend(self.url, settings.RESPONSE_CACHE_TIMEOUT_MS / 1000)
+        return self.shared
+
+    def _failed(self, e: BaseException) -> None:
+        BACKEND_FAILURES.inc()
+        if time.monotonic() >= self._down_until:
+            logger.warning(
+                f"Response cache server failed, using memory for {settings.RESPONSE_CACHE_RETRY_SECONDS}s: {str(e)}"
+            )
+        self._down_until = time.monotonic() + settings.RESPONSE_CACHE_RETRY_SECONDS
+
+    async def _call(self, backend: CacheBackend, operation: str, *args):
+        if backend is not self.memory and time.monotonic() < self._down_until:
+            backend = self.memory
+        try:
+            return await getattr(backend, operation)(*args)
+        except BACKEND_ERRORS as e:
+            if backend is self.memory:
+                raise
+            self._failed(e)
+            return await getattr(self.memory, operation)(*args)
+
+    async def _recover(self, backend: CacheBackend) -> None:
+        if backend is self.memory or not self._lost_invalidations:
+            return
+        try:
+            await backend.incr(EPOCH_KEY)
+        except BACKEND_ERRORS as e:
+            self._failed(e)
+        else:
+            self._lost_invalidations = False
+            logger.info("Response cache server is back, entries cached before the failure are dropped")
+
+    async def get_or_load(self, endpoint: str, key: str, scope: Optional[str], ttl: float,
+                          loader: Callable[[], Awaitable[bytes]]) -> bytes:
+        backend = self._backend()
+        await self._recover(backend)
+        version_keys = [EPOCH_KEY] if scope is None else [EPOCH_KEY, f"{PREFIX}:v:{scope}"]
+        versions = await self._call(backend, "get_many", version_keys)
+        key = f"{PREFIX}:{endpoint}:{key}:" + ".".join((version or b"0").decode() for version in versions)
+        lock_key = f"{key}:lock"
+
+        value = await self._call(backend, "get", key)
+        if value is not None:
+            expires_at, delta, body = decode(value)
+            # XFetch: 1 - random() is in (0, 1], so the logarithm is defined
+            now = time.time()
+            if now - delta * settings.RESPONSE_CACHE_BETA * math.log(1.0 - random.random()) < expires_at:
+                LOOKUPS.inc(endpoint=endpoint, outcome=HIT)
+                return body
+            if not await self._call(backend, "add", lock_key, b"1", settings.RESPONSE_CACHE_LOCK_SECONDS):
+                # someone else is already recomputing it
+                LOOKUPS.inc(endpoint=endpoint, outcome=HIT if now < expires_at else STALE)
+                return body
+            LOOKUPS.inc(endpoint=endpoint, outcome=EARLY)
+            return await self._fill(backend, key, lock_key, ttl, loader)
+
+        if await self._call(backend, "add", lock_key, b"1", settings.RESPONSE_CACHE_LOCK_SECONDS):
+            LOOKUPS.inc(endpoint=endpoint, outcome=MISS)
+            return await self._fill(backend, key, lock_key, ttl, loader)
+
+        # another worker is computing it
+        deadline = time.monotonic() + settings.RESPONSE_CACHE_LOCK_SECONDS
+        while time.monotonic() < deadline and self._backend() is backend:
+            await asyncio.sleep(_WAIT_STEP)
+            value = await self._call(backend, "get", key)
+            if value is not None:
+                LOOKUPS.inc(endpoint=endpoint, outcome=WAITED)
+                return decode(value)[2]
+        LOOKUPS.inc(endpoint=endpoint, outcome=MISS)
+        return await loader()
+
+    async def _fill(self, backend: CacheBackend, key: str, lock_key: str, ttl: float,
+                    loader: Callable[[], Awaitable[bytes]]) -> bytes:
+        started = time.monotonic()
+        try:
+            with on_primary():
+                body = await loader()
+        except BaseException:
+            await self._release(backend, lock_key)
+            raise
+        delta = time.monotonic() - started
+        if time.monotonic() < self._down_until:
+            backend = self.memory
+        if backend is self.memory:
+            ttl = min(ttl, settings.RESPONSE_CACHE_FALLBACK_TTL_SECONDS)
+        value = encode(body, time.time() + ttl, delta, settings.RESPONSE_CACHE_COMPRESS_MIN_BYTES)
+        try:
+            # kept for another TTL after the expiry, served while one reader recomputes it
+            await backend.set(key, value, ttl * 2)
+            await backend.delete(lock_key)
+        except BACKEND_ERRORS as e:
+            if backend is self.memory:
+                raise
+            self._failed(e)
+        return body
+
+    async def _release(self, backend: CacheBackend, lock_key: str) -> None:
+        try:
+            await backend.delete(lock_key)
+        except BACKEND_ERRORS as e:
+            if backend is self.memory:
+                raise
+            self._failed(e)
+
+    async def invalidate(self, *scopes: str) -> None:
+        if scopes:
+            await self._bump(*(f"{PREFIX}:v:{scope}" for scope in scopes))
+
+    async def invalidate_employees(self, employee_ids: Iterable[int]) -> None:
+        await self.invalidate(*(employee_scope(employee_id) for employee_id in employee_ids))
+
+    async def clear(self) -> None:
+        await self._bump(EPOCH_KEY)
+
+    async def invalidate_local(self, *scopes: str) -> None:
+        """Versions in this worker's memory only, for an invalidation another worker announced"""
+        if scopes:
+            await self.memory.incr(*(f"{PREFIX}:v:{scope}" for scope in scopes))
+
+    async def clear_local(self) -> None:
+        await self.memory.incr(EPOCH_KEY)
+
+    async def _bump(self, *keys: str) -> None:
+        await self.memory.incr(*keys)
+        backend = self._backend()
+        if backend is self.memory:
+            self._lost_invalidations = self.url is not None
+            return
+        try:
+            await backend.incr(*keys)
+        except BACKEND_ERRORS as e:
+            self._failed(e)
+            self._lost_invalidations = True
+
+    async def close(self) -> None:
+        if self.shared is not None:
+            await self.shared.close()
+            self.shared = None
+
+
+response_cache = ResponseCache(settings.RESPONSE_CACHE_URL, settings.RESPONSE_CACHE_MEMORY_SIZE)
+
+
+def cached(endpoint: str, ttl: float, scope: Optional[Callable[..., str]] = None):
+    """
+    Cache the bytes the decorated read method returns under its endpoint name and positional
+    arguments; scope(*arguments) names the version the entry depends on, without it the entry
+    only expires after ttl seconds
+    """
+
+    def decorator(method: Callable[..., Awaitable[bytes]]):
+        @functools.wraps(method)
+        async def wrapper(self, *args):
+            return await response_cache.get_or_load(
+                endpoint,
+                ":".join(str(arg) for arg in args) or "-",
+                scope(*args) if scope is not None else None,
+                ttl,
+                lambda: method(self, *args),
+            )
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,196 @@
+"""
+Request coalescing for read methods of services (single-flight) with a short per-worker micro-cache.
+
+A method decorated with @coalesced(name) is keyed by its name and arguments. The first call of a key
+runs the method, calls of the same key arriving while it runs wait for it and get the same result
+(the serialized response bytes), and for SINGLE_FLIGHT_TTL_SECONDS afterwards the result is served
+from memory. A burst of identical requests thus costs one database round trip per worker.
+
+Write paths call forget() (or, for employee data, EmployeeContextCache.invalidate(), which also
+drops the coalesced reads of those employees here and in other workers): the entry is dropped and a
+call already running for the key no longer takes new waiters nor stores its result. Anything not
+invalidated explicitly is at most SINGLE_FLIGHT_TTL_SECONDS old.
+
+Results may come from a read replica, so for others they are at most the replica lag plus
+SINGLE_FLIGHT_TTL_SECONDS old, as a replica read would be. A request whose client has just written
+(it carries a write position, app.common.replicas) bypasses both the micro-cache and coalescing: a
+load that started on a lagging replica after the invalidation would give it back its old data.
+
+Calls, micro-cache hits and coalesced calls are counted per name in the single_flight_calls metric
+and per key for the SINGLE_FLIGHT_TRACKED_KEYS most recently used keys (GET /admin/v1/single-flight).
+"""
+import asyncio
+import functools
+import time
+from collections import OrderedDict
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from app.common.config import settings
+from app.common.metrics import registry
+from app.common.replicas import reads_own_writes
+
+Key = Tuple
+
+HIT = "hit"
+COALESCED = "coalesced"
+LOADED = "loaded"
+
+CALLS = registry.counter("single_flight_calls", "Calls of coalesced read methods", ("name", "outcome"))
+
+# names whose first argument is an employee id, dropped by forget_employees()
+EMPLOYEE_KEYS = {"quests.employee", "employee.skills", "employee.profile"}
+
+
+class _LeaderCancelled(Exception):
+    """The call that was loading the key was cancelled, a waiter loads it itself"""
+
+
+class KeyStats:
+    __slots__ = ("key", "calls", "hits", "coalesced", "loads", "last_call")
+
+    def __init__(self, key: Key):
+        self.key = key
+        self.calls = 0
+        self.hits = 0
+        self.coalesced = 0
+        self.loads = 0
+        self.last_call = 0.0
+
+
+class SingleFlight:
+    def __init__(self, ttl: float, max_size: int, tracked_keys: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.tracked_keys = tracked_keys
+        self._entries: "OrderedDict[Key, Tuple[float, bytes]]" = OrderedDict()
+        self._in_flight: Dict[Key, asyncio.Future] = {}
+        self._generations: Dict[Key, int] = {}
+        self._epoch = 0
+        self._stats: "OrderedDict[Key, KeyStats]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def do(self, key: Key, loader: Callable[[], Awaitable[bytes]]) -> bytes:
+        if reads_own_writes():
+            self._count(key, LOADED)
+            return await loader()
+        while True:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] >= time.monotonic():
+                    self._count(key, HIT)
+                    return entry[1]
+                del self._entries[key]
+
+            future = self._in_flight.get(key)
+            if future is None:
+                self._count(key, LOADED)
+                return await self._load(key, loader)
+
+            self._count(key, COALESCED)
+            try:
+                # shield: a waiter that is cancelled must not cancel the call the others wait for
+                return await asyncio.shield(future)
+            except _LeaderCancelled:
+                continue
+
+    async def _load(self, key: Key, loader: Callable[[], Awaitable[bytes]]) -> bytes:
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        token = self._token(key)
+        try:
+            value = await loader()
+        except BaseException as e:
+            future.set_exception(_LeaderCancelled() if isinstance(e, asyncio.CancelledError) else e)
+            # retrieved, so that a call nobody waited for is not reported as "never retrieved"
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            if token == self._token(key):
+                self._store(key, value)
+            return value
+        finally:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    def _token(self, key: Key) -> Tuple[int, int]:
+        return self._epoch, self._generations.get(key, 0)
+
+    def _store(self, key: Key, value: bytes) -> None:
+        if self.ttl <= 0 or self.max_size <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def forget(self, *keys: Key) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+            self._in_flight.pop(key, None)
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    def forget_employees(self, employee_ids: Iterable[int]) -> None:
+        self.forget(*(
+            (name, employee_id) for employee_id in employee_ids for name in EMPLOYEE_KEYS
+        ))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._in_flight.clear()
+        self._generations.clear()
+        self._epoch += 1
+
+    def _count(self, key: Key, outcome: str) -> None:
+        CALLS.inc(name=key[0], outcome=outcome)
+        if self.tracked_keys <= 0:
+            return
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = KeyStats(key)
+            while len(self._stats) > self.tracked_keys:
+                self._stats.popitem(last=False)
+        else:
+            self._stats.move_to_end(key)
+        stats.calls += 1
+        stats.last_call = time.time()
+        if outcome == HIT:
+            stats.hits += 1
+        elif outcome == COALESCED:
+            stats.coalesced += 1
+        else:
+            stats.loads += 1
+
+    def key_stats(self, name: Optional[str] = None) -> List[KeyStats]:
+        return [stats for stats in self._stats.values() if name is None or stats.key[0] == name]
+
+    def reset_stats(self) -> None:
+        self._stats.clear()
+
+
+single_flight = SingleFlight(
+    ttl=settings.SINGLE_FLIGHT_TTL_SECONDS,
+    max_size=settings.SINGLE_FLIGHT_CACHE_SIZE,
+    tracked_keys=settings.SINGLE_FLIGHT_TRACKED_KEYS,
+)
+
+
+def coalesced(name: str):
+    """Key the decorated read method by name and positional arguments, see the module docstring"""
+
+    def decorator(method: Callable[..., Awaitable[bytes]]):
+        @functools.wraps(method)
+        async def wrapper(self, *args):
+            return await single_flight.do((name, *args), lambda: method(self, *args))
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,135 @@
+"""
+Process-local copy of the skill catalog for autocomplete and the duplicate-name check.
+
+Names are kept in one case-folded sorted list with parallel name/id arrays, so a prefix lookup is
+a bisect plus a short forward scan. Workers learn about skills created elsewhere through the
+skill_catalog NOTIFY channel and fully reload after a listener reconnect and every
+SKILL_CATALOG_RELOAD_SECONDS as a safety net.
+"""
+import asyncio
+import json
+from array import array
+from bisect import bisect_left
+from bisect import bisect_right
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from app.common.config import settings
+from app.common.logging import logger
+from app.database import session_maker
+from app.events.pg_notify import PgNotifyListener
+from app.events.pg_notify import notify
+from app.repositories.skill_repository import SkillRepository
+
+SKILL_CATALOG_CHANNEL = "skill_catalog"
+
+
+class SkillCatalog:
+    __slots__ = ("reload_interval", "_keys", "_names", "_ids", "_loaded", "_task")
+
+    def __init__(self, reload_interval: float):
+        self.reload_interval = reload_interval
+        self._keys: List[str] = []
+        self._names: List[str] = []
+        self._ids = array("q")
+        self._loaded = False
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def replace(self, skills: Sequence[Tuple[int, str]]) -> None:
+        entries = sorted((name.casefold(), name, skill_id) for skill_id, name in skills)
+        # rebind all three at once so readers never see lists of different lengths
+        self._keys, self._names, self._ids = (
+            [key for key, _, _ in entries],
+            [name for _, name, _ in entries],
+            array("q", (skill_id for _, _, skill_id in entries)),
+        )
+        self._loaded = True
+
+    def add(self, skill_id: int, name: str) -> None:
+        key = name.casefold()
+        start, end = bisect_left(self._keys, key), bisect_right(self._keys, key)
+        if any(self._ids[i] == skill_id for i in range(start, end)):
+            return
+        self._keys.insert(end, key)
+        self._names.insert(end, name)
+        self._ids.insert(end, skill_id)
+
+    def contains(self, name: str) -> bool:
+        """Exact (case-sensitive) name match, same semantics as the unique constraint"""
+        key = name.casefold()
+        start = bisect_left(self._keys, key)
+        for i in range(start, len(self._keys)):
+            if self._keys[i] != key:
+                return False
+            if self._names[i] == name:
+                return True
+        return False
+
+    def autocomplete(self, prefix: str, limit: int = 10) -> List[Tuple[int, str]]:
+        """(id, name) of skills whose name starts with prefix, case-insensitive, alphabetical"""
+        key = prefix.casefold()
+        start = bisect_left(self._keys, key)
+        result = []
+        for i in range(start, min(start + limit, len(self._keys))):
+            if not self._keys[i].startswith(key):
+                break
+            result.append((self._ids[i], self._names[i]))
+        return result
+
+    async def load(self) -> int:
+        async with session_maker() as session:
+            skills = await SkillRepository(session).get_names()
+        self.replace(skills)
+        logger.info(f"Skill catalog loaded: {len(skills)} skills")
+        return len(skills)
+
+    async def publish_created(self, skill_id: int, name: str) -> None:
+        """Add locally and tell the other workers"""
+        self.add(skill_id, name)
+        await notify(SKILL_CATALOG_CHANNEL, json.dumps({"id": skill_id, "name": name}))
+
+    def _on_notification(self, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+            self.add(int(message["id"]), message["name"])
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring malformed skill catalog notification: {str(e)}")
+
+    async def _reload(self) -> None:
+        try:
+            await self.load()
+        except Exception as e:
+            logger.error(f"Skill catalog reload failed: {str(e)}")
+
+    def attach(self, listener: PgNotifyListener) -> None:
+        listener.subscribe(SKILL_CATALOG_CHANNEL, self._on_notification, on_reconnect=self._reload)
+
+    def start(self) -> None:
+        if self._task is None and self.reload_interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            await self._reload()
+
+
+skill_catalog = SkillCatalog(reload_interval=settings.SKILL_CATALOG_RELOAD_SECONDS)
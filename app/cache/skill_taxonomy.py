@@ -0,0 +1,137 @@
+"""
+Process-local copy of the skill taxonomy for category expansion without database round trips.
+
+The tree is small (categories plus the skill -> category mapping), so any change is announced on
+the skill_taxonomy NOTIFY channel and every worker simply reloads it.
+"""
+import asyncio
+from collections import defaultdict
+from typing import Any
+from typing import Awaitable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+from app.common.config import settings
+from app.common.logging import logger
+from app.database import session_maker
+from app.events.pg_notify import PgNotifyListener
+from app.events.pg_notify import notify
+from app.repositories.skill_taxonomy_repository import SkillTaxonomyRepository
+
+SKILL_TAXONOMY_CHANNEL = "skill_taxonomy"
+
+
+class SkillTaxonomy:
+    __slots__ = ("reload_interval", "_names", "_children", "_roots", "_skills", "_loaded", "_task")
+
+    def __init__(self, reload_interval: float):
+        self.reload_interval = reload_interval
+        self._names: Dict[int, str] = {}
+        self._children: Dict[int, List[int]] = {}
+        self._roots: List[int] = []
+        self._skills: Dict[int, List[int]] = {}
+        self._loaded = False
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def replace(self, categories: Iterable[Tuple[int, str, Optional[int]]],
+                skills: Iterable[Tuple[int, int]]) -> None:
+        names: Dict[int, str] = {}
+        children: Dict[int, List[int]] = defaultdict(list)
+        roots: List[int] = []
+        for category_id, name, parent_id in categories:
+            names[category_id] = name
+            if parent_id is None:
+                roots.append(category_id)
+            else:
+                children[parent_id].append(category_id)
+        by_category: Dict[int, List[int]] = defaultdict(list)
+        for skill_id, category_id in skills:
+            by_category[category_id].append(skill_id)
+        self._names, self._children, self._roots, self._skills = names, dict(children), roots, dict(by_category)
+        self._loaded = True
+
+    def has_category(self, category_id: int) -> bool:
+        return category_id in self._names
+
+    def descendants(self, category_id: int) -> List[int]:
+        """The category and every category below it"""
+        found, stack = [], [category_id]
+        while stack:
+            node = stack.pop()
+            found.append(node)
+            stack.extend(self._children.get(node, ()))
+        return found
+
+    def expand(self, category_ids: Iterable[int]) -> Set[int]:
+        """Ids of skills anywhere under the given categories"""
+        skills: Set[int] = set()
+        for category_id in category_ids:
+            for node in self.descendants(category_id):
+                skills.update(self._skills.get(node, ()))
+        return skills
+
+    def tree(self) -> List[Dict[str, Any]]:
+        def build(node: int) -> Dict[str, Any]:
+            return {
+                "id": node,
+                "name": self._names[node],
+                "skill_ids": sorted(self._skills.get(node, ())),
+                "children": [build(child) for child in sorted(self._children.get(node, ()), key=self._names.__getitem__)],
+            }
+
+        return [build(root) for root in sorted(self._roots, key=self._names.__getitem__)]
+
+    async def load(self) -> int:
+        async with session_maker() as session:
+            repository = SkillTaxonomyRepository(session)
+            categories = await repository.get_categories()
+            skills = await repository.get_categorized_skills()
+        self.replace(categories, skills)
+        logger.info(f"Skill taxonomy loaded: {len(categories)} categories, {len(skills)} skills")
+        return len(categories)
+
+    async def publish_changed(self) -> None:
+        """Reload here and make every other worker reload"""
+        await self._reload()
+        await notify(SKILL_TAXONOMY_CHANNEL, "changed")
+
+    async def _reload(self) -> None:
+        try:
+            await self.load()
+        except Exception as e:
+            logger.error(f"Skill taxonomy reload failed: {str(e)}")
+
+    def _on_notification(self, payload: str) -> Awaitable[None]:
+        return self._reload()
+
+    def attach(self, listener: PgNotifyListener) -> None:
+        listener.subscribe(SKILL_TAXONOMY_CHANNEL, self._on_notification, on_reconnect=self._reload)
+
+    def start(self) -> None:
+        if self._task is None and self.reload_interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            await self._reload()
+
+
+skill_taxonomy = SkillTaxonomy(reload_interval=settings.SKILL_CATALOG_RELOAD_SECONDS)
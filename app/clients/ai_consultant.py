@@ -0,0 +1,95 @@
+"""
+Client of the external AI consultant, an OpenAI-compatible API (/embeddings, /chat/completions).
+
+Embedding requests from concurrent callers are merged into one /embeddings call by a MicroBatcher;
+answers of both endpoints are cached by request hash in the shared OutboundHttpClient.
+"""
+import asyncio
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+
+from app.clients.batching import MicroBatcher
+from app.clients.http import OutboundHttpClient
+from app.clients.http import http_client
+from app.common.config import settings
+from app.common.exceptions import ExternalServiceException
+
+Message = Dict[str, str]
+
+
+class AIConsultantClient:
+    def __init__(
+        self,
+        http: OutboundHttpClient,
+        base_url: str,
+        api_key: Optional[str] = None,
+        chat_model: str = settings.AI_CONSULTANT_CHAT_MODEL,
+        embedding_model: str = settings.AI_CONSULTANT_EMBEDDING_MODEL,
+        batch_size: int = settings.AI_CONSULTANT_BATCH_SIZE,
+        batch_delay: float = settings.AI_CONSULTANT_BATCH_DELAY_MS / 1000,
+        cache_ttl: float = settings.AI_CONSULTANT_CACHE_TTL_SECONDS,
+    ):
+        self.http = http
+        self.base_url = base_url.rstrip("/")
+        self.chat_model = chat_model
+        self.embedding_model = embedding_model
+        self.cache_ttl = cache_ttl
+        self.headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self._embeddings = MicroBatcher("ai_embeddings", self._embed_batch, batch_size, batch_delay)
+
+    async def embed(self, text: str) -> List[float]:
+        key = self.http.cache.key("EMBED", self.base_url, [self.embedding_model, text])
+        cached = self.http.cache.get(key)
+        if cached is not None:
+            return cached
+        vector = await self._embeddings.submit(text)
+        self.http.cache.put(key, vector, self.cache_ttl)
+        return vector
+
+    async def embed_many(self, texts: Sequence[str]) -> List[List[float]]:
+        return list(await asyncio.gather(*(self.embed(text) for text in texts)))
+
+    async def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        payload = await self.http.request_json(
+            "POST",
+            f"{self.base_url}/embeddings",
+            json_body={"model": self.embedding_model, "input": texts},
+            headers=self.headers,
+        )
+        try:
+            rows = sorted(payload["data"], key=lambda row: row["index"])
+            return [row["embedding"] for row in rows]
+        except (KeyError, TypeError) as e:
+            raise ExternalServiceException(f"Unexpected embeddings response: {str(e)}") from e
+
+    async def chat(self, messages: List[Message], fallback: Optional[Callable[[], Any]] = None) -> Optional[str]:
+        """Assistant answer, or fallback() when the consultant is unavailable"""
+        unavailable = object()
+        payload = await self.http.request_json(
+            "POST",
+            f"{self.base_url}/chat/completions",
+            json_body={"model": self.chat_model, "messages": messages},
+            headers=self.headers,
+            cache_ttl=self.cache_ttl,
+            fallback=(lambda: unavailable) if fallback is not None else None,
+        )
+        if payload is unavailable and fallback is not None:
+            return fallback()
+        try:
+            return payload["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError) as e:
+            raise ExternalServiceException(f"Unexpected chat response: {str(e)}") from e
+
+    async def close(self) -> None:
+        await self._embeddings.close()
+
+
+def create_ai_consultant_client(http: OutboundHttpClient = http_client) -> Optional[AIConsultantClient]:
+    """None when AI_CONSULTANT_URL is not configured"""
+    if not settings.AI_CONSULTANT_URL:
+        return None
+    return AIConsultantClient(http, settings.AI_CONSULTANT_URL, settings.AI_CONSULTANT_API_KEY)
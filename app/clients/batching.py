@@ -0,0 +1,76 @@
+import asyncio
+from typing import Awaitable
+from typing import Callable
+from typing import Generic
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import TypeVar
+
+from app.common.metrics import registry
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+BATCH_SIZE = registry.histogram(
+    "outbound_batch_size", "Items sent per batched outbound call", ("batcher",),
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Collects single-item calls made within max_delay of each other (or until max_size items) and
+    resolves them with one call of handler(items), which must return results in the same order.
+    A failed batch fails every caller in it.
+    """
+
+    def __init__(self, name: str, handler: Callable[[List[T]], Awaitable[Sequence[R]]],
+                 max_size: int, max_delay: float):
+        self.name = name
+        self.handler = handler
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self._pending: List[Tuple[T, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+
+    async def submit(self, item: T) -> R:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_delay, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[T, asyncio.Future]]) -> None:
+        BATCH_SIZE.observe(len(batch), batcher=self.name)
+        try:
+            results = await self.handler([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise ValueError(f"{self.name} returned {len(results)} results for {len(batch)} items")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results, strict=True):
+            if not future.done():
+                future.set_result(result)
+
+    async def close(self) -> None:
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
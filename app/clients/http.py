@@ -0,0 +1,298 @@
+"""
+Outbound HTTP for calls to external services (the AI consultant first of all).
+
+One aiohttp session per worker with a bounded connection pool, per-host limits and timeouts.
+On top of it every call goes through a per-host circuit breaker and, when asked, a small response
+cache keyed by a hash of the request. Latency, pool wait time and pool usage are exported through
+app.common.metrics.
+"""
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from app.common.config import settings
+from app.common.exceptions import CircuitOpenException
+from app.common.exceptions import ExternalServiceException
+from app.common.logging import logger
+from app.common.metrics import registry
+
+OUTBOUND_LATENCY = registry.histogram(
+    "outbound_request_duration_seconds", "Outbound HTTP request latency", ("host", "outcome"),
+)
+OUTBOUND_POOL_WAIT = registry.histogram(
+    "outbound_pool_wait_seconds", "Time spent waiting for a free pooled connection", ("host",),
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+OUTBOUND_IN_FLIGHT = registry.gauge("outbound_requests_in_flight", "Outbound requests being executed", ("host",))
+OUTBOUND_POOL_USAGE = registry.gauge(
+    "outbound_pool_usage_ratio", "Share of the connection pool limit currently acquired",
+)
+OUTBOUND_CACHE = registry.counter("outbound_cache_requests", "Outbound response cache lookups", ("result",))
+OUTBOUND_CIRCUIT = registry.counter(
+    "outbound_circuit_transitions", "Circuit breaker state changes", ("host", "state"),
+)
+OUTBOUND_FALLBACKS = registry.counter("outbound_fallbacks", "Calls answered by a fallback", ("host",))
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitBreaker:
+    """
+    Opens after failure_threshold consecutive failures, rejects calls for reset_timeout seconds,
+    then lets a single probe through; its result closes or reopens the circuit.
+    """
+
+    __slots__ = ("name", "failure_threshold", "reset_timeout", "state", "_failures", "_opened_at", "_probing")
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    def allow(self) -> bool:
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            self._transition(HALF_OPEN)
+        if self._probing:
+            return False
+        self._probing = True
+        return True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._probing = False
+        if self.state != CLOSED:
+            self._transition(CLOSED)
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._probing = False
+        if self.state == HALF_OPEN or self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+            if self.state != OPEN:
+                self._transition(OPEN)
+
+    def release(self) -> None:
+        """The call ended without an answer either way (cancelled), a half-open circuit may probe again"""
+        self._probing = False
+
+    def _transition(self, state: str) -> None:
+        logger.warning(f"Circuit for {self.name}: {self.state} -> {state}")
+        self.state = state
+        OUTBOUND_CIRCUIT.inc(host=self.name, state=state)
+
+
+class ResponseCache:
+    __slots__ = ("max_size", "_entries")
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    @staticmethod
+    def key(method: str, url: str, body: Any) -> str:
+        canonical = json.dumps([method.upper(), url, body], sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            OUTBOUND_CACHE.inc(result="miss")
+            return None
+        self._entries.move_to_end(key)
+        OUTBOUND_CACHE.inc(result="hit")
+        return entry[1]
+
+    def put(self, key: str, value: Any, ttl: float) -> None:
+        if self.max_size <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class OutboundHttpClient:
+    def __init__(
+        self,
+        limit: int = settings.OUTBOUND_HTTP_LIMIT,
+        limit_per_host: int = settings.OUTBOUND_HTTP_LIMIT_PER_HOST,
+        timeout: float = settings.OUTBOUND_HTTP_TIMEOUT_SECONDS,
+        connect_timeout: float = settings.OUTBOUND_HTTP_CONNECT_TIMEOUT_SECONDS,
+        failure_threshold: int = settings.OUTBOUND_CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = settings.OUTBOUND_CIRCUIT_RESET_SECONDS,
+        cache_size: int = settings.OUTBOUND_CACHE_SIZE,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = aiohttp.ClientTimeout(total=timeout, sock_connect=connect_timeout)
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.cache = ResponseCache(cache_size)
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            raise RuntimeError("OutboundHttpClient is not started")
+        return self._session
+
+    async def start(self) -> None:
+        if self._session is not None:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            ttl_dns_cache=300,
+            keepalive_timeout=30,
+        )
+        trace = aiohttp.TraceConfig()
+        # aiohttp 3.11 annotates its signals for aiosignal < 1.4, so mypy rejects any callback here
+        trace.on_request_start.append(self._on_request_start)  # type: ignore[arg-type]
+        trace.on_connection_queued_start.append(self._on_queued_start)  # type: ignore[arg-type]
+        trace.on_connection_queued_end.append(self._on_queued_end)  # type: ignore[arg-type]
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=self.timeout,
+            trace_configs=[trace],
+            raise_for_status=False,
+        )
+        OUTBOUND_POOL_USAGE.set_function(self.pool_usage)
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        OUTBOUND_POOL_USAGE.remove()
+
+    def pool_usage(self) -> float:
+        """Acquired connections over the pool limit, 1.0 means new requests queue"""
+        if self._session is None or self._session.closed or not self.limit:
+            return 0.0
+        connector = self._session.connector
+        # aiohttp has no public counter for acquired connections
+        return len(getattr(connector, "_acquired", ())) / self.limit
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = self._breakers[host] = CircuitBreaker(host, self.failure_threshold, self.reset_timeout)
+        return breaker
+
+    async def request_json(
+        self,
+        method: str,
+        url: str,
+        *,
+        json_body: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        cache_ttl: float = 0,
+        fallback: Optional[Callable[[], Any]] = None,
+    ) -> Any:
+        """
+        Send a request and decode the JSON answer.
+        Responses are cached for cache_ttl seconds when it is positive. When the circuit is open or the
+        call fails, fallback() is returned if given, otherwise ExternalServiceException is raised.
+        """
+        host = urlsplit(url).netloc
+        cache_key = None
+        if cache_ttl > 0:
+            cache_key = self.cache.key(method, url, json_body)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        breaker = self.breaker(host)
+        if not breaker.allow():
+            return self._fallback(host, fallback, CircuitOpenException(host))
+
+        started = time.perf_counter()
+        outcome = "error"
+        failure: Optional[ExternalServiceException] = None
+        rejected: Optional[ExternalServiceException] = None
+        OUTBOUND_IN_FLIGHT.inc(host=host)
+        try:
+            async with self.session.request(method, url, json=json_body, headers=headers) as response:
+                outcome = str(response.status)
+                if response.status >= 500 or response.status == 429:
+                    failure = ExternalServiceException(f"{host} answered {response.status}")
+                elif response.status >= 400:
+                    # the request itself is wrong, the service is healthy
+                    rejected = ExternalServiceException(f"{host} rejected the request: {response.status}")
+                else:
+                    payload = await response.json(content_type=None)
+                    outcome = "ok"
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            failure = ExternalServiceException(f"{host} did not answer in {self.timeout.total}s")
+        except (aiohttp.ClientError, ValueError) as e:
+            outcome = "error"
+            failure = ExternalServiceException(f"{host} request failed: {str(e)}")
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        except BaseException:
+            breaker.record_failure()
+            raise
+        finally:
+            OUTBOUND_IN_FLIGHT.dec(host=host)
+            OUTBOUND_LATENCY.observe(time.perf_counter() - started, host=host, outcome=outcome)
+
+        if failure is not None:
+            breaker.record_failure()
+            return self._fallback(host, fallback, failure)
+        breaker.record_success()
+        if rejected is not None:
+            raise rejected
+        if cache_key is not None:
+            self.cache.put(cache_key, payload, cache_ttl)
+        return payload
+
+    @staticmethod
+    def _fallback(host: str, fallback: Optional[Callable[[], Any]], error: Exception) -> Any:
+        if fallback is None:
+            raise error
+        if not isinstance(error, CircuitOpenException):
+            logger.warning(f"Using fallback for {host}: {error}")
+        OUTBOUND_FALLBACKS.inc(host=host)
+        return fallback()
+
+    @staticmethod
+    async def _on_request_start(session, context, params) -> None:
+        context.host = urlsplit(str(params.url)).netloc
+
+    @staticmethod
+    async def _on_queued_start(session, context, params) -> None:
+        context.queued_at = time.perf_counter()
+
+    @staticmethod
+    async def _on_queued_end(session, context, params) -> None:
+        queued_at = getattr(context, "queued_at", None)
+        if queued_at is not None:
+            OUTBOUND_POOL_WAIT.observe(time.perf_counter() - queued_at, host=getattr(context, "host", ""))
+
+
+http_client = OutboundHttpClient()
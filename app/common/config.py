@@ -1,4 +1,8 @@
 from typing import Annotated
+from typing import Dict
+from typing import List
+from typing import Literal
+from typing import Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings
@@ -13,15 +17,128 @@ class Settings(BaseSettings):
     )
 
     LOG_LEVEL: Annotated[str, Field(validation_alias="LOG_LEVEL")]
+    LOG_FORMAT: Annotated[Literal["text", "json"], Field(default="text", validation_alias="LOG_FORMAT")]
+    LOG_QUEUE_SIZE: Annotated[int, Field(default=10000, validation_alias="LOG_QUEUE_SIZE")]
+    LOG_BATCH_SIZE: Annotated[int, Field(default=512, validation_alias="LOG_BATCH_SIZE")]
+    LOG_SAMPLE_RATES: Annotated[Dict[str, float], Field(default_factory=dict, validation_alias="LOG_SAMPLE_RATES")]
+    DEBUG: Annotated[bool, Field(default=False, validation_alias="DEBUG")]
 
     POSTGRES_USER: Annotated[str, Field(validation_alias="POSTGRES_USER")]
     POSTGRES_PASSWORD: Annotated[str, Field(validation_alias="POSTGRES_PASSWORD")]
     POSTGRES_DB: Annotated[str, Field(validation_alias="POSTGRES_DB")]
     POSTGRES_HOST: Annotated[str, Field(validation_alias="POSTGRES_HOST")]
     POSTGRES_PORT: Annotated[int, Field(validation_alias="POSTGRES_PORT")]
+    DB_POOL_SIZE: Annotated[int, Field(default=5, validation_alias="DB_POOL_SIZE")]
+    DB_MAX_OVERFLOW: Annotated[int, Field(default=10, validation_alias="DB_MAX_OVERFLOW")]
+    DB_CONNECTION_BUDGET: Annotated[Optional[int], Field(default=None, validation_alias="DB_CONNECTION_BUDGET")]
+    DB_POOL_TIMEOUT: Annotated[float, Field(default=3.0, validation_alias="DB_POOL_TIMEOUT")]
+    DB_POOL_PRE_PING: Annotated[bool, Field(default=False, validation_alias="DB_POOL_PRE_PING")]
+    DB_POOL_RECYCLE: Annotated[int, Field(default=1800, validation_alias="DB_POOL_RECYCLE")]
+    DB_STATEMENT_CACHE_SIZE: Annotated[int, Field(default=100, validation_alias="DB_STATEMENT_CACHE_SIZE")]
+    DB_WARMUP: Annotated[bool, Field(default=True, validation_alias="DB_WARMUP")]
+    DB_REPLICA_URLS: Annotated[List[str], Field(default_factory=list, validation_alias="DB_REPLICA_URLS")]
+    DB_REPLICA_MAX_LAG_SECONDS: Annotated[float, Field(default=5.0, validation_alias="DB_REPLICA_MAX_LAG_SECONDS")]
+    DB_REPLICA_CHECK_SECONDS: Annotated[float, Field(default=2.0, validation_alias="DB_REPLICA_CHECK_SECONDS")]
+    DB_REPLICA_LSN_CHECK: Annotated[bool, Field(default=False, validation_alias="DB_REPLICA_LSN_CHECK")]
+
+    WEB_WORKERS: Annotated[int, Field(default=0, validation_alias="WEB_WORKERS")]
+    WEB_BIND: Annotated[str, Field(default="0.0.0.0:8000", validation_alias="WEB_BIND")]
+    WEB_TIMEOUT: Annotated[int, Field(default=60, validation_alias="WEB_TIMEOUT")]
+    WEB_GRACEFUL_TIMEOUT: Annotated[int, Field(default=30, validation_alias="WEB_GRACEFUL_TIMEOUT")]
+    WEB_KEEPALIVE: Annotated[int, Field(default=5, validation_alias="WEB_KEEPALIVE")]
+    WEB_MAX_REQUESTS: Annotated[int, Field(default=0, validation_alias="WEB_MAX_REQUESTS")]
 
     MAX_SKILLS_FOR_EMPLOYEE: Annotated[int, Field(validation_alias="MAX_SKILLS_FOR_EMPLOYEE")]
 
+    SKILL_GAP_REFRESH_INTERVAL_SECONDS: Annotated[
+        int, Field(default=60, validation_alias="SKILL_GAP_REFRESH_INTERVAL_SECONDS")
+    ]
+    SKILL_GAP_MAX_STALENESS_SECONDS: Annotated[
+        int, Field(default=3600, validation_alias="SKILL_GAP_MAX_STALENESS_SECONDS")
+    ]
+
+    SNAPSHOT_DIR: Annotated[str, Field(default="snapshots", validation_alias="SNAPSHOT_DIR")]
+    ANALYTICS_DATABASE_URL: Annotated[Optional[str], Field(default=None, validation_alias="ANALYTICS_DATABASE_URL")]
+    SHARED_MATRIX_DIR: Annotated[str, Field(default="shared_matrices", validation_alias="SHARED_MATRIX_DIR")]
+    SKILL_CATALOG_RELOAD_SECONDS: Annotated[
+        int, Field(default=300, validation_alias="SKILL_CATALOG_RELOAD_SECONDS")
+    ]
+    SKILL_DUPLICATE_THRESHOLD: Annotated[float, Field(default=0.75, validation_alias="SKILL_DUPLICATE_THRESHOLD")]
+    EMPLOYEE_CONTEXT_CACHE_TTL_SECONDS: Annotated[
+        int, Field(default=300, validation_alias="EMPLOYEE_CONTEXT_CACHE_TTL_SECONDS")
+    ]
+    EMPLOYEE_CONTEXT_CACHE_SIZE: Annotated[int, Field(default=10000, validation_alias="EMPLOYEE_CONTEXT_CACHE_SIZE")]
+    SINGLE_FLIGHT_TTL_SECONDS: Annotated[float, Field(default=1.0, validation_alias="SINGLE_FLIGHT_TTL_SECONDS")]
+    SINGLE_FLIGHT_CACHE_SIZE: Annotated[int, Field(default=5000, validation_alias="SINGLE_FLIGHT_CACHE_SIZE")]
+    SINGLE_FLIGHT_TRACKED_KEYS: Annotated[int, Field(default=1000, validation_alias="SINGLE_FLIGHT_TRACKED_KEYS")]
+    RESPONSE_CACHE_URL: Annotated[Optional[str], Field(default=None, validation_alias="RESPONSE_CACHE_URL")]
+    RESPONSE_CACHE_TTL_SECONDS: Annotated[float, Field(default=300.0, validation_alias="RESPONSE_CACHE_TTL_SECONDS")]
+    DEPARTMENT_STATS_CACHE_TTL_SECONDS: Annotated[
+        float, Field(default=15.0, validation_alias="DEPARTMENT_STATS_CACHE_TTL_SECONDS")
+    ]
+    RESPONSE_CACHE_BETA: Annotated[float, Field(default=1.0, validation_alias="RESPONSE_CACHE_BETA")]
+    RESPONSE_CACHE_LOCK_SECONDS: Annotated[float, Field(default=5.0, validation_alias="RESPONSE_CACHE_LOCK_SECONDS")]
+    RESPONSE_CACHE_COMPRESS_MIN_BYTES: Annotated[
+        int, Field(default=1024, validation_alias="RESPONSE_CACHE_COMPRESS_MIN_BYTES")
+    ]
+    RESPONSE_CACHE_TIMEOUT_MS: Annotated[int, Field(default=100, validation_alias="RESPONSE_CACHE_TIMEOUT_MS")]
+    RESPONSE_CACHE_RETRY_SECONDS: Annotated[float, Field(default=10.0, validation_alias="RESPONSE_CACHE_RETRY_SECONDS")]
+    RESPONSE_CACHE_FALLBACK_TTL_SECONDS: Annotated[
+        float, Field(default=5.0, validation_alias="RESPONSE_CACHE_FALLBACK_TTL_SECONDS")
+    ]
+    RESPONSE_CACHE_MEMORY_SIZE: Annotated[int, Field(default=5000, validation_alias="RESPONSE_CACHE_MEMORY_SIZE")]
+
+    AI_CONSULTANT_URL: Annotated[Optional[str], Field(default=None, validation_alias="AI_CONSULTANT_URL")]
+    AI_CONSULTANT_API_KEY: Annotated[Optional[str], Field(default=None, validation_alias="AI_CONSULTANT_API_KEY")]
+    AI_CONSULTANT_CHAT_MODEL: Annotated[str, Field(default="gpt-4o-mini", validation_alias="AI_CONSULTANT_CHAT_MODEL")]
+    AI_CONSULTANT_EMBEDDING_MODEL: Annotated[
+        str, Field(default="text-embedding-3-small", validation_alias="AI_CONSULTANT_EMBEDDING_MODEL")
+    ]
+    AI_CONSULTANT_BATCH_SIZE: Annotated[int, Field(default=64, validation_alias="AI_CONSULTANT_BATCH_SIZE")]
+    AI_CONSULTANT_BATCH_DELAY_MS: Annotated[int, Field(default=10, validation_alias="AI_CONSULTANT_BATCH_DELAY_MS")]
+    AI_CONSULTANT_CACHE_TTL_SECONDS: Annotated[
+        int, Field(default=3600, validation_alias="AI_CONSULTANT_CACHE_TTL_SECONDS")
+    ]
+    OUTBOUND_HTTP_LIMIT: Annotated[int, Field(default=100, validation_alias="OUTBOUND_HTTP_LIMIT")]
+    OUTBOUND_HTTP_LIMIT_PER_HOST: Annotated[int, Field(default=20, validation_alias="OUTBOUND_HTTP_LIMIT_PER_HOST")]
+    OUTBOUND_HTTP_TIMEOUT_SECONDS: Annotated[
+        float, Field(default=10.0, validation_alias="OUTBOUND_HTTP_TIMEOUT_SECONDS")
+    ]
+    OUTBOUND_HTTP_CONNECT_TIMEOUT_SECONDS: Annotated[
+        float, Field(default=2.0, validation_alias="OUTBOUND_HTTP_CONNECT_TIMEOUT_SECONDS")
+    ]
+    OUTBOUND_CIRCUIT_FAILURE_THRESHOLD: Annotated[
+        int, Field(default=5, validation_alias="OUTBOUND_CIRCUIT_FAILURE_THRESHOLD")
+    ]
+    OUTBOUND_CIRCUIT_RESET_SECONDS: Annotated[
+        float, Field(default=30.0, validation_alias="OUTBOUND_CIRCUIT_RESET_SECONDS")
+    ]
+    OUTBOUND_CACHE_SIZE: Annotated[int, Field(default=2048, validation_alias="OUTBOUND_CACHE_SIZE")]
+
+    EVENT_STREAM_FANOUT: Annotated[
+        Literal["postgres", "local"], Field(default="postgres", validation_alias="EVENT_STREAM_FANOUT")
+    ]
+    EVENT_STREAM_BUFFER_SIZE: Annotated[int, Field(default=100, validation_alias="EVENT_STREAM_BUFFER_SIZE")]
+    EVENT_STREAM_MAX_CONNECTIONS: Annotated[int, Field(default=1000, validation_alias="EVENT_STREAM_MAX_CONNECTIONS")]
+    EVENT_STREAM_HEARTBEAT_SECONDS: Annotated[
+        float, Field(default=15.0, validation_alias="EVENT_STREAM_HEARTBEAT_SECONDS")
+    ]
+    EVENT_BATCH_MAX_SIZE: Annotated[int, Field(default=10000, validation_alias="EVENT_BATCH_MAX_SIZE")]
+
+    SQL_SLOW_QUERY_MS: Annotated[float, Field(default=200.0, validation_alias="SQL_SLOW_QUERY_MS")]
+    SQL_SLOW_QUERY_SAMPLE_RATE: Annotated[float, Field(default=1.0, validation_alias="SQL_SLOW_QUERY_SAMPLE_RATE")]
+    SQL_N_PLUS_ONE_THRESHOLD: Annotated[int, Field(default=10, validation_alias="SQL_N_PLUS_ONE_THRESHOLD")]
+    SLOW_QUERY_BUFFER_SIZE: Annotated[int, Field(default=500, validation_alias="SLOW_QUERY_BUFFER_SIZE")]
+    SQL_EXPLAIN_SAMPLE_RATE: Annotated[float, Field(default=0.1, validation_alias="SQL_EXPLAIN_SAMPLE_RATE")]
+    SQL_EXPLAIN_MIN_INTERVAL_SECONDS: Annotated[
+        float, Field(default=60.0, validation_alias="SQL_EXPLAIN_MIN_INTERVAL_SECONDS")
+    ]
+    SQL_EXPLAIN_TIMEOUT_MS: Annotated[int, Field(default=5000, validation_alias="SQL_EXPLAIN_TIMEOUT_MS")]
+    ADMIN_API_KEY: Annotated[Optional[str], Field(default=None, validation_alias="ADMIN_API_KEY")]
+
+    METRICS_MULTIPROC_DIR: Annotated[Optional[str], Field(default=None, validation_alias="METRICS_MULTIPROC_DIR")]
+    METRICS_FLUSH_SECONDS: Annotated[float, Field(default=1.0, validation_alias="METRICS_FLUSH_SECONDS")]
+
     @property
     def database_url(self) -> str:
         user = self.POSTGRES_USER
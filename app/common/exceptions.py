@@ -1,4 +1,5 @@
 import re
+from typing import List
 from typing import Optional
 
 
@@ -64,6 +65,32 @@ class ValidationException(ServiceException):
     """Validation errors"""
 
 
+class IndexNotReadyException(ServiceException):
+    """A precomputed index has not been published yet"""
+
+
+class SimilarSkillException(ServiceException):
+    """A near-duplicate of the skill already exists"""
+
+    def __init__(self, name: str, similar: List[str]):
+        super().__init__(f'Skill "{name}" is too similar to existing skills: {", ".join(similar)}')
+
+
+class ExternalServiceException(ServiceException):
+    """An outbound call failed or the external service is unavailable"""
+
+
+class CircuitOpenException(ExternalServiceException):
+    """Calls to the host are suspended by the circuit breaker"""
+
+    def __init__(self, host: str):
+        super().__init__(f"Calls to {host} are suspended after repeated failures")
+
+
+class StreamLimitException(ServiceException):
+    """The worker already serves the maximum number of live event streams"""
+
+
 class SkillNotFoundException(Exception):
     """Raised when a skill is not found"""
     pass
@@ -0,0 +1,35 @@
+"""
+Fast path for read endpoints that return many rows.
+
+The regular path builds a Pydantic model per row in the service, then FastAPI validates the
+result again against response_model and serializes it through jsonable_encoder and json.dumps.
+Here the repository selects exactly the columns of the response schema (labelled as its fields),
+the rows are serialized once by pydantic-core and the endpoint returns the bytes, so FastAPI
+skips response_model handling. Use it only for rows the database already guarantees the shape
+of; response_model stays on the route for the OpenAPI schema.
+"""
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Sequence
+
+from pydantic import TypeAdapter
+from sqlalchemy.engine import Row
+from starlette.responses import Response
+
+_ROWS = TypeAdapter(List[Dict[str, Any]])
+
+
+def row_dicts(rows: Sequence[Row]) -> List[Dict[str, Any]]:
+    return [row._asdict() for row in rows]
+
+
+def dump_rows(rows: List[Dict[str, Any]]) -> bytes:
+    """JSON array of the rows; values are serialized by type (datetimes as ISO 8601, as pydantic does)"""
+    return _ROWS.dump_json(rows)
+
+
+class RawJSONResponse(Response):
+    """Response with a body that is already JSON"""
+
+    media_type = "application/json"
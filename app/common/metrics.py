@@ -0,0 +1,313 @@
+"""
+Minimal in-process metrics: counters, gauges and histograms rendered in the Prometheus text format.
+
+Metrics are only touched from the event loop thread, so updates are plain dict operations. Every
+worker keeps its own registry; snapshot() and merge_snapshots() let app.common.metrics_exporter add
+them up across worker processes.
+"""
+import math
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import TypeVar
+
+LabelValues = Tuple[str, ...]
+Sample = Tuple[str, Dict[str, str], float]
+
+M = TypeVar("M", bound="_Metric")
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: LabelValues) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key, strict=True))
+
+    def samples(self) -> Iterator[Sample]:
+        raise NotImplementedError
+
+    def snapshot(self) -> dict:
+        """JSON-serialisable definition and values, see merge_snapshots"""
+        return {
+            "name": self.name,
+            "type": self.type,
+            "documentation": self.documentation,
+            "labelnames": list(self.labelnames),
+            "values": [[list(key), value] for key, value in self._snapshot_values()],
+        }
+
+    def _snapshot_values(self) -> Iterable[Tuple[LabelValues, object]]:
+        raise NotImplementedError
+
+    def _merge(self, values: List[list], pid: int) -> None:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterator[Sample]:
+        for key, value in self._values.items():
+            yield f"{self.name}_total", self._labels(key), value
+
+    def _snapshot_values(self) -> Iterable[Tuple[LabelValues, object]]:
+        return self._values.items()
+
+    def _merge(self, values: List[list], pid: int) -> None:
+        for key, value in values:
+            key = tuple(key)
+            self._values[key] = self._values.get(key, 0.0) + value
+
+
+class Gauge(_Metric):
+    """multiprocess_mode: how values of several workers are combined, "sum", "max" or "all" (pid label)"""
+
+    type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 multiprocess_mode: str = "sum"):
+        super().__init__(name, documentation, labelnames)
+        if multiprocess_mode not in ("sum", "max", "all"):
+            raise ValueError(f"Unknown multiprocess mode {multiprocess_mode}")
+        self.multiprocess_mode = multiprocess_mode
+        self._values: Dict[LabelValues, float] = {}
+        self._functions: Dict[LabelValues, Callable[[], float]] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set_function(self, function: Callable[[], float], **labels: str) -> None:
+        """Read the value lazily at collection time"""
+        self._functions[self._key(labels)] = function
+
+    def remove(self, **labels: str) -> None:
+        key = self._key(labels)
+        self._values.pop(key, None)
+        self._functions.pop(key, None)
+
+    def value(self, **labels: str) -> float:
+        key = self._key(labels)
+        function = self._functions.get(key)
+        return function() if function is not None else self._values.get(key, 0.0)
+
+    def samples(self) -> Iterator[Sample]:
+        for key, value in self._values.items():
+            if key not in self._functions:
+                yield self.name, self._labels(key), value
+        for key, function in self._functions.items():
+            yield self.name, self._labels(key), function()
+
+    def snapshot(self) -> dict:
+        return {**super().snapshot(), "multiprocess_mode": self.multiprocess_mode}
+
+    def _snapshot_values(self) -> Iterable[Tuple[LabelValues, object]]:
+        for key, value in self._values.items():
+            if key not in self._functions:
+                yield key, value
+        for key, function in self._functions.items():
+            yield key, function()
+
+    def _merge(self, values: List[list], pid: int) -> None:
+        for key, value in values:
+            key = tuple(key)
+            if self.multiprocess_mode == "all":
+                self._values[(*key, str(pid))] = value
+            elif self.multiprocess_mode == "max":
+                self._values[key] = max(self._values.get(key, value), value)
+            else:
+                self._values[key] = self._values.get(key, 0.0) + value
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # per label set: bucket counts (non-cumulative, last one is +Inf), sum
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        entry = self._values.get(key)
+        if entry is None:
+            entry = self._values[key] = ([0] * (len(self.buckets) + 1), [0.0])
+        counts, total = entry
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+        total[0] += value
+
+    def count(self, **labels: str) -> int:
+        entry = self._values.get(self._key(labels))
+        return sum(entry[0]) if entry else 0
+
+    def samples(self) -> Iterator[Sample]:
+        for key, (counts, total) in self._values.items():
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts, strict=True):
+                cumulative += count
+                yield f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative
+            yield f"{self.name}_sum", labels, total[0]
+            yield f"{self.name}_count", labels, cumulative
+
+    def snapshot(self) -> dict:
+        return {**super().snapshot(), "buckets": list(self.buckets)}
+
+    def _snapshot_values(self) -> Iterable[Tuple[LabelValues, object]]:
+        for key, (counts, total) in self._values.items():
+            yield key, [counts, total[0]]
+
+    def _merge(self, values: List[list], pid: int) -> None:
+        for key, (counts, total) in values:
+            key = tuple(key)
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            for i, count in enumerate(counts):
+                entry[0][i] += count
+            entry[1][0] += total
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: M) -> M:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            if not isinstance(existing, type(metric)) or existing.labelnames != metric.labelnames:
+                raise ValueError(f"Metric {metric.name} is already registered with another definition")
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+              multiprocess_mode: str = "sum") -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames, multiprocess_mode))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def collect(self) -> Iterable[_Metric]:
+        return list(self._metrics.values())
+
+    def snapshot(self) -> List[dict]:
+        return [metric.snapshot() for metric in self.collect()]
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self.collect():
+            lines.append(f"# HELP {metric.name} {_escape_help(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def merge_snapshots(snapshots: Iterable[Tuple[int, bool, List[dict]]]) -> Registry:
+    """
+    Registry with the (pid, alive, snapshot) of several workers added up: counters and histograms
+    are summed (also of exited workers, their counts stay part of the totals), gauges of live
+    workers are combined according to their multiprocess_mode.
+    """
+    merged = Registry()
+    for pid, alive, metrics in snapshots:
+        for data in metrics:
+            if data["type"] == "gauge" and not alive:
+                continue
+            metric = merged.get(data["name"])
+            if metric is None:
+                metric = merged.register(_from_snapshot(data))
+            elif metric.type != data["type"] or getattr(metric, "buckets", None) not in (
+                None, tuple(data.get("buckets", ())),
+            ):
+                # a worker of another code version, its values cannot be combined
+                continue
+            metric._merge(data["values"], pid)
+    return merged
+
+
+def _from_snapshot(data: dict) -> _Metric:
+    name, documentation, labelnames = data["name"], data["documentation"], data["labelnames"]
+    if data["type"] == "counter":
+        return Counter(name, documentation, labelnames)
+    if data["type"] == "histogram":
+        return Histogram(name, documentation, labelnames, data["buckets"])
+    mode = data.get("multiprocess_mode", "sum")
+    return Gauge(name, documentation, [*labelnames, "pid"] if mode == "all" else labelnames, mode)
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{name}="{_escape_label(value)}"' for name, value in labels.items())
+    return "{" + pairs + "}"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+registry = Registry()
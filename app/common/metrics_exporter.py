@@ -0,0 +1,118 @@
+"""
+Exposition of metrics for GET /metrics, across uvicorn workers.
+
+Without METRICS_MULTIPROC_DIR the worker answering the scrape renders its own registry. With it,
+every worker writes a snapshot of its registry to <dir>/<pid>.json every METRICS_FLUSH_SECONDS
+(write to a temporary file, then rename, so readers never see a partial file) and the scrape
+renders all snapshots added up. The directory has to be emptied before the server starts.
+
+The same background task measures event loop lag: how late a sleep of the flush interval wakes up.
+"""
+import asyncio
+import json
+import os
+import time
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from app.common.config import settings
+from app.common.logging import logger
+from app.common.metrics import Registry
+from app.common.metrics import merge_snapshots
+from app.common.metrics import registry
+
+LOOP_LAG = registry.gauge(
+    "event_loop_lag_seconds", "Latest event loop lag (delay of a timer callback)", multiprocess_mode="max"
+)
+LOOP_LAG_HISTOGRAM = registry.histogram(
+    "event_loop_lag_observed_seconds",
+    "Event loop lag samples",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class MultiprocessStore:
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.path = os.path.join(directory, f"{os.getpid()}.json")
+
+    def write(self, source: Registry) -> None:
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w") as file:
+            json.dump(source.snapshot(), file, separators=(",", ":"))
+        os.replace(temporary, self.path)
+
+    def read_all(self) -> List[Tuple[int, bool, List[dict]]]:
+        snapshots = []
+        for name in os.listdir(self.directory):
+            pid, extension = os.path.splitext(name)
+            if extension != ".json" or not pid.isdigit():
+                continue
+            try:
+                with open(os.path.join(self.directory, name)) as file:
+                    snapshots.append((int(pid), _alive(int(pid)), json.load(file)))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping metrics snapshot {name}: {str(e)}")
+        return snapshots
+
+
+class MetricsExporter:
+    def __init__(self, source: Registry, directory: Optional[str], interval: float):
+        self.source = source
+        self.store = MultiprocessStore(directory) if directory else None
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self.store is not None:
+            os.makedirs(self.store.directory, exist_ok=True)
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._flush()
+
+    def render(self) -> str:
+        if self.store is None:
+            return self.source.render()
+        # the scraped worker's own numbers are current, the others' at most one interval old
+        self._flush()
+        return merge_snapshots(self.store.read_all()).render()
+
+    async def _run(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - started - self.interval)
+            LOOP_LAG.set(lag)
+            LOOP_LAG_HISTOGRAM.observe(lag)
+            self._flush()
+
+    def _flush(self) -> None:
+        if self.store is None:
+            return
+        try:
+            self.store.write(self.source)
+        except OSError as e:
+            logger.warning(f"Failed to write metrics snapshot: {str(e)}")
+
+
+metrics_exporter = MetricsExporter(registry, settings.METRICS_MULTIPROC_DIR, settings.METRICS_FLUSH_SECONDS)
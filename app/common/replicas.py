@@ -0,0 +1,222 @@
+"""
+Read replicas of the primary database.
+
+A background task checks every replica each DB_REPLICA_CHECK_SECONDS: whether it answers, how far
+its replay is behind (lag in seconds, 0 while it has replayed everything it received) and which
+WAL position it has replayed. choose() returns the engine of a healthy replica with at most
+DB_REPLICA_MAX_LAG_SECONDS of lag, in turn, or None to use the primary.
+
+With DB_REPLICA_LSN_CHECK, reads follow the WAL position of the client's last write.
+ReplicaConsistencyMiddleware opens track_read_position() for every request with the position the
+client sent back (cookie or X-DB-Min-LSN header). note_write() records the primary's position after
+a request that wrote, and the middleware returns it to the client. Replicas that have not replayed
+up to the client's position are skipped for that client only, so it sees its own writes through
+any worker or pod, and other clients keep reading from the replicas.
+
+Reads inside on_primary() never use a replica: results stored in a cache shared with other clients
+(app.cache.response_cache fills) must not be older than the invalidation that preceded them.
+"""
+import asyncio
+import itertools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+from typing import List
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.common.config import settings
+from app.common.logging import logger
+from app.common.metrics import registry
+from app.common.sql_stats import instrument_engine
+
+REPLICA_HEALTHY = registry.gauge("db_replica_healthy", "1 if the replica is used for reads", ("replica",))
+REPLICA_LAG = registry.gauge("db_replica_lag_seconds", "Replay lag of the replica at the last check", ("replica",))
+REPLICA_READS = registry.counter("db_replica_reads", "Statements routed to the replica", ("replica",))
+
+HEALTH_QUERY = text(
+    "SELECT pg_is_in_recovery(), pg_last_wal_replay_lsn()::text, "
+    "CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE coalesce(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+def parse_lsn(value: Optional[str]) -> Optional[int]:
+    """'16/B374D848' -> position in bytes"""
+    if not value:
+        return None
+    high, low = value.split("/")
+    return (int(high, 16) << 32) + int(low, 16)
+
+
+def format_lsn(lsn: int) -> str:
+    return f"{lsn >> 32:X}/{lsn & 0xFFFFFFFF:X}"
+
+
+class ReadPosition:
+    """WAL position the reads of a request must see, and the one its writes reached"""
+
+    __slots__ = ("required", "written")
+
+    def __init__(self, required: Optional[int]) -> None:
+        self.required = required
+        self.written: Optional[int] = None
+
+
+_position: ContextVar[Optional[ReadPosition]] = ContextVar("replica_read_position", default=None)
+_primary_only: ContextVar[bool] = ContextVar("replica_primary_only", default=False)
+
+
+@contextmanager
+def track_read_position(required: Optional[int]) -> Iterator[ReadPosition]:
+    """Reads in this context (request) skip replicas behind required"""
+    position = ReadPosition(required)
+    token = _position.set(position)
+    try:
+        yield position
+    finally:
+        _position.reset(token)
+
+
+@contextmanager
+def on_primary() -> Iterator[None]:
+    """Reads in this context go to the primary"""
+    token = _primary_only.set(True)
+    try:
+        yield
+    finally:
+        _primary_only.reset(token)
+
+
+def reads_own_writes() -> bool:
+    """The request carries the write position of its client, replicas behind it are skipped"""
+    position = _position.get()
+    return position is not None and bool(position.required)
+
+
+class Replica:
+    __slots__ = ("name", "engine", "healthy", "lag", "replayed_lsn")
+
+    def __init__(self, name: str, engine: AsyncEngine):
+        self.name = name
+        self.engine = engine
+        self.healthy = False
+        self.lag = 0.0
+        self.replayed_lsn: Optional[int] = None
+
+
+class ReplicaSet:
+    def __init__(self, urls: List[str], max_lag: float, check_interval: float, lsn_check: bool):
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.lsn_check = lsn_check
+        self.replicas: List[Replica] = []
+        for url in urls:
+            parsed = make_url(url)
+            engine = create_async_engine(
+                url,
+                pool_size=settings.DB_POOL_SIZE,
+                max_overflow=settings.DB_MAX_OVERFLOW,
+                pool_timeout=settings.DB_POOL_TIMEOUT,
+                pool_pre_ping=settings.DB_POOL_PRE_PING,
+                pool_recycle=settings.DB_POOL_RECYCLE,
+                connect_args={"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE},
+            )
+            instrument_engine(engine.sync_engine, pool_metrics=False)
+            self.replicas.append(Replica(f"{parsed.host}:{parsed.port or 5432}/{parsed.database}", engine))
+        self._turn = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def choose(self) -> Optional[Replica]:
+        if _primary_only.get():
+            return None
+        candidates = [
+            replica for replica in self.replicas
+            if replica.healthy and replica.lag <= self.max_lag and self._fresh(replica)
+        ]
+        if not candidates:
+            return None
+        replica = candidates[next(self._turn) % len(candidates)]
+        REPLICA_READS.inc(replica=replica.name)
+        return replica
+
+    @property
+    def position_ttl(self) -> int:
+        """Seconds a client keeps its write position: longer than a replica may lag before it is skipped"""
+        return int(self.max_lag + self.check_interval) + 1
+
+    def note_write(self, lsn: Optional[int]) -> None:
+        position = _position.get()
+        if lsn is None or position is None:
+            return
+        position.written = max(position.written or 0, lsn)
+        # later sessions of the same request read their writes too
+        position.required = max(position.required or 0, lsn)
+
+    def _fresh(self, replica: Replica) -> bool:
+        position = _position.get()
+        if not self.lsn_check or position is None or not position.required:
+            return True
+        return replica.replayed_lsn is not None and replica.replayed_lsn >= position.required
+
+    async def start(self) -> None:
+        if self.enabled and self._task is None:
+            await self.check_all()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    async def check_all(self) -> None:
+        await asyncio.gather(*(self._check(replica) for replica in self.replicas))
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            await self.check_all()
+
+    async def _check(self, replica: Replica) -> None:
+        was_healthy = replica.healthy
+        try:
+            async with asyncio.timeout(max(self.check_interval, 1.0)):
+                async with replica.engine.connect() as connection:
+                    in_recovery, replayed, lag = (await connection.execute(HEALTH_QUERY)).one()
+            # a server that is not a standby (a second local instance) has no replay position
+            replica.replayed_lsn = parse_lsn(replayed) if in_recovery else None
+            replica.lag = float(lag)
+            replica.healthy = True
+        except Exception as e:
+            replica.healthy = False
+            if was_healthy:
+                logger.warning(f"Replica {replica.name} is unavailable, reads go to the primary: {str(e)}")
+        else:
+            if not was_healthy:
+                logger.info(f"Replica {replica.name} is available, lag {replica.lag:.1f}s")
+        REPLICA_HEALTHY.set(1 if replica.healthy and replica.lag <= self.max_lag else 0, replica=replica.name)
+        REPLICA_LAG.set(replica.lag, replica=replica.name)
+
+
+replica_set = ReplicaSet(
+    settings.DB_REPLICA_URLS,
+    settings.DB_REPLICA_MAX_LAG_SECONDS,
+    settings.DB_REPLICA_CHECK_SECONDS,
+    settings.DB_REPLICA_LSN_CHECK,
+)
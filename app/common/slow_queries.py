@@ -0,0 +1,208 @@
+"""
+Capture of slow SQL statements with sampled execution plans.
+
+Statements slower than SQL_SLOW_QUERY_MS are kept in a ring buffer of SLOW_QUERY_BUFFER_SIZE entries.
+Bound parameters are not stored, only their types (and lengths of strings and arrays). A share of
+SQL_EXPLAIN_SAMPLE_RATE captures, at most one per fingerprint every SQL_EXPLAIN_MIN_INTERVAL_SECONDS,
+is re-run in the background under EXPLAIN on a separate connection, in a read-only transaction
+with SQL_EXPLAIN_TIMEOUT_MS statement timeout. Reads get EXPLAIN (ANALYZE, BUFFERS); writes (and
+reads PostgreSQL refuses in a read-only transaction, such as SELECT ... FOR UPDATE) only get the
+estimated plan, analyzing them would apply the write.
+
+A fingerprint identifies the shape of a statement: placeholders, literals and IN lists are
+replaced, so captures of one repository query are grouped together.
+"""
+import asyncio
+import contextvars
+import hashlib
+import json
+import random
+import re
+import time
+from collections import deque
+from datetime import datetime
+from datetime import timezone
+from typing import Any
+from typing import Deque
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Set
+
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.common.config import settings
+from app.common.logging import logger
+from app.common.metrics import registry
+
+EXPLAINS = registry.counter("db_slow_query_explains", "Sampled EXPLAIN runs by result (ok, failed)", ("result",))
+
+_PLACEHOLDER = re.compile(r"\$\d+(::[\w ]+(\[\])?)?")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN \((\?, )*\?\)", re.IGNORECASE)
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+_READS = ("SELECT", "WITH")
+# SQLSTATE read_only_sql_transaction
+_READ_ONLY_VIOLATION = "25006"
+
+# set inside the EXPLAIN task, its own statements are not captured
+_explaining: contextvars.ContextVar[bool] = contextvars.ContextVar("explaining_slow_query", default=False)
+
+
+def normalize(statement: str) -> str:
+    text = " ".join(statement.split())
+    text = _PLACEHOLDER.sub("?", text)
+    text = _STRING.sub("?", text)
+    text = _NUMBER.sub("?", text)
+    return _IN_LIST.sub("IN (...)", text)
+
+
+def fingerprint(statement: str) -> str:
+    return hashlib.sha1(normalize(statement).encode()).hexdigest()[:16]
+
+
+def redact(parameters: Any) -> List[str]:
+    """Types of the bound parameters, never their values"""
+    if isinstance(parameters, dict):
+        return [f"{name}: {_describe(value)}" for name, value in parameters.items()]
+    if isinstance(parameters, (list, tuple)):
+        return [_describe(value) for value in parameters]
+    return [] if parameters is None else [_describe(parameters)]
+
+
+def _describe(value: Any) -> str:
+    if value is None:
+        return "null"
+    name = type(value).__name__
+    if isinstance(value, (str, bytes, list, tuple)):
+        return f"{name}[{len(value)}]"
+    return name
+
+
+class SlowQuery:
+    __slots__ = ("fingerprint", "statement", "parameters", "duration_ms", "captured_at", "executemany", "plan")
+
+    def __init__(self, statement: str, parameters: List[str], duration_ms: float, executemany: bool):
+        self.fingerprint = fingerprint(statement)
+        self.statement = statement
+        self.parameters = parameters
+        self.duration_ms = duration_ms
+        self.captured_at = datetime.now(timezone.utc)
+        self.executemany = executemany
+        # filled by the EXPLAIN task: {"analyzed": bool, "plan": ...} or {"error": str}
+        self.plan: Optional[Dict[str, Any]] = None
+
+
+class SlowQueryLog:
+    def __init__(self, size: int, explain_sample_rate: float, explain_min_interval: float, explain_timeout_ms: int):
+        self.explain_sample_rate = explain_sample_rate
+        self.explain_min_interval = explain_min_interval
+        self.explain_timeout_ms = explain_timeout_ms
+        self._entries: Deque[SlowQuery] = deque(maxlen=size)
+        self._last_explained: Dict[str, float] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._engine: Optional[AsyncEngine] = None
+
+    def attach(self, engine: AsyncEngine) -> None:
+        """Engine the sampled EXPLAINs run on; without one plans are not captured"""
+        self._engine = engine
+
+    def capture(self, statement: str, parameters: Any, duration: float, executemany: bool) -> None:
+        if _explaining.get():
+            return
+        entry = SlowQuery(statement, redact(parameters), duration * 1000, executemany)
+        self._entries.append(entry)
+        if self._should_explain(entry):
+            self._explain_later(entry, parameters)
+
+    @property
+    def size(self) -> int:
+        return self._entries.maxlen or 0
+
+    def entries(self) -> List[SlowQuery]:
+        return list(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._last_explained.clear()
+
+    async def stop(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _should_explain(self, entry: SlowQuery) -> bool:
+        if self._engine is None or entry.executemany or self._tasks:
+            return False
+        if not entry.statement.lstrip().upper().startswith(_EXPLAINABLE):
+            return False
+        now = time.monotonic()
+        last = self._last_explained.get(entry.fingerprint)
+        if last is not None and now - last < self.explain_min_interval:
+            return False
+        if random.random() >= self.explain_sample_rate:
+            return False
+        if len(self._last_explained) >= self.size:
+            self._last_explained.clear()
+        self._last_explained[entry.fingerprint] = now
+        return True
+
+    def _explain_later(self, entry: SlowQuery, parameters: Any) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # a statement outside the event loop, e.g. from a migration
+            return
+        # a fresh context: the plan's statements must not count towards the request being handled
+        task = loop.create_task(self._explain(entry, parameters), context=contextvars.Context())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _explain(self, entry: SlowQuery, parameters: Any) -> None:
+        _explaining.set(True)
+        analyze = entry.statement.lstrip().upper().startswith(_READS)
+        try:
+            try:
+                plan = await self._run_explain(entry.statement, parameters, analyze)
+            except DBAPIError as e:
+                if not analyze or getattr(e.orig, "sqlstate", None) != _READ_ONLY_VIOLATION:
+                    raise
+                analyze = False
+                plan = await self._run_explain(entry.statement, parameters, analyze)
+            entry.plan = {"analyzed": analyze, "plan": plan}
+            EXPLAINS.inc(result="ok")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            entry.plan = {"error": str(e)}
+            EXPLAINS.inc(result="failed")
+            logger.warning(f"Failed to explain slow query {entry.fingerprint}: {str(e)}")
+
+    async def _run_explain(self, statement: str, parameters: Any, analyze: bool) -> Any:
+        if self._engine is None:
+            return None
+        options = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+        async with self._engine.connect() as connection:
+            connection = await connection.execution_options(postgresql_readonly=True)
+            await connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(self.explain_timeout_ms)}")
+            result = await connection.exec_driver_sql(f"EXPLAIN ({options}) {statement}", _positional(parameters))
+            plan = result.scalar_one()
+            # leaving the block rolls the read-only transaction back
+        return json.loads(plan) if isinstance(plan, str) else plan
+
+
+def _positional(parameters: Any) -> Sequence[Any]:
+    if parameters is None:
+        return ()
+    return tuple(parameters) if isinstance(parameters, (list, tuple)) else parameters
+
+
+slow_query_log = SlowQueryLog(
+    settings.SLOW_QUERY_BUFFER_SIZE,
+    settings.SQL_EXPLAIN_SAMPLE_RATE,
+    settings.SQL_EXPLAIN_MIN_INTERVAL_SECONDS,
+    settings.SQL_EXPLAIN_TIMEOUT_MS,
+)
@@ -0,0 +1,137 @@
+"""
+SQL statement statistics from SQLAlchemy engine events.
+
+Every statement is timed into the db_statement_duration_seconds histogram. Statements slower than
+SQL_SLOW_QUERY_MS are logged (a SQL_SLOW_QUERY_SAMPLE_RATE share of them), which replaces the
+engine's echo, and captured by app.common.slow_queries. Inside track_sql() (SqlStatsMiddleware opens one per request) statements are also
+counted per scope, by statement text: SQLAlchemy renders bind placeholders, so the same text
+repeated many times in one request is the shape of an N+1 loop. Pool usage and checkout wait time
+are exported as db_pool_* metrics.
+"""
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.common.config import settings
+from app.common.logging import logger
+from app.common.metrics import registry
+from app.common.slow_queries import slow_query_log
+
+STATEMENT_DURATION = registry.histogram(
+    "db_statement_duration_seconds", "Duration of SQL statements, measured around cursor execution"
+)
+SLOW_STATEMENTS = registry.counter("db_slow_statements", "SQL statements slower than SQL_SLOW_QUERY_MS")
+POOL_WAIT = registry.histogram(
+    "db_pool_wait_seconds",
+    "Time to get a connection from the pool, including opening a new one",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0),
+)
+POOL_CHECKED_OUT = registry.gauge("db_pool_checked_out", "Connections in use")
+POOL_CHECKED_IN = registry.gauge("db_pool_checked_in", "Idle connections in the pool")
+POOL_OVERFLOW = registry.gauge("db_pool_overflow", "Connections open beyond pool_size (negative while below it)")
+POOL_SIZE = registry.gauge("db_pool_size", "Configured pool_size")
+
+_START_TIMES = "sql_stats_start_times"
+
+
+class SqlStats:
+    __slots__ = ("count", "duration", "statements", "replica_reads")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Dict[str, int] = {}
+        self.replica_reads = 0
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.statements[statement] = self.statements.get(statement, 0) + 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statement shapes executed at least threshold times, most repeated first"""
+        found = [(statement, count) for statement, count in self.statements.items() if count >= threshold]
+        return sorted(found, key=lambda item: item[1], reverse=True)
+
+
+_current: ContextVar[Optional[SqlStats]] = ContextVar("sql_stats", default=None)
+
+
+@contextmanager
+def track_sql() -> Iterator[SqlStats]:
+    """Collect statistics of the statements executed in this context (task, request)"""
+    stats = SqlStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def record_replica_read() -> None:
+    stats = _current.get()
+    if stats is not None:
+        stats.replica_reads += 1
+
+
+def compact(statement: str, limit: int = 500) -> str:
+    text = " ".join(statement.split())
+    return text if len(text) <= limit else f"{text[:limit]}..."
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault(_START_TIMES, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    duration = time.perf_counter() - conn.info[_START_TIMES].pop()
+    STATEMENT_DURATION.observe(duration)
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, duration)
+    if duration * 1000 >= settings.SQL_SLOW_QUERY_MS:
+        SLOW_STATEMENTS.inc()
+        slow_query_log.capture(statement, parameters, duration, executemany)
+        if random.random() < settings.SQL_SLOW_QUERY_SAMPLE_RATE:
+            logger.warning(f"Slow query {duration * 1000:.0f} ms: {compact(statement)}")
+
+
+def _handle_error(context) -> None:
+    # after_cursor_execute is not called for a failed statement
+    connection = context.connection
+    if connection is not None and connection.info.get(_START_TIMES):
+        connection.info[_START_TIMES].pop()
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """The default async pool, timing every connection checkout into db_pool_wait_seconds"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_WAIT.observe(time.perf_counter() - started)
+
+
+def instrument_engine(engine: Engine, pool_metrics: bool = True) -> None:
+    """pool_metrics: export the db_pool_* gauges of this engine's pool (the primary's)"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+    pool = engine.pool
+    if pool_metrics and isinstance(pool, AsyncAdaptedQueuePool):
+        POOL_CHECKED_OUT.set_function(pool.checkedout)
+        POOL_CHECKED_IN.set_function(pool.checkedin)
+        POOL_OVERFLOW.set_function(pool.overflow)
+        POOL_SIZE.set_function(pool.size)
@@ -1,32 +1,160 @@
+import functools
 from typing import AsyncGenerator
+from typing import Optional
 
+from fastapi import HTTPException
+from sqlalchemy import String
+from sqlalchemy import event
+from sqlalchemy import func
+from sqlalchemy import select
 from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
 
 from app.common.config import settings
+from app.common.logging import get_logger
 from app.common.logging import logger
+from app.common.metrics import registry
+from app.common.replicas import parse_lsn
+from app.common.replicas import replica_set
+from app.common.slow_queries import slow_query_log
+from app.common.sql_stats import InstrumentedAsyncPool
+from app.common.sql_stats import instrument_engine
+from app.common.sql_stats import record_replica_read
 
 engine = create_async_engine(
     settings.database_url,
-    echo=True,
+    poolclass=InstrumentedAsyncPool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    # asyncpg prepared statements kept per connection, 0 behind a transaction-mode pgbouncer
+    connect_args={"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE},
 )
+instrument_engine(engine.sync_engine)
+slow_query_log.attach(engine)
 
 session_maker = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
 
+# session.info keys of RoutingSession
+READ_REPLICA = "read_replica"
+WROTE = "wrote"
+USED_REPLICA = "used_replica"
+
+
+class RoutingSession(Session):
+    """
+    Sends the SELECTs of replica_read repository methods to a read replica, everything else to the
+    primary. Once the session has written (a flush or a DML statement), all its reads go to the
+    primary too: the request reads its own writes.
+
+    Replica reads may be up to DB_REPLICA_MAX_LAG_SECONDS stale (unless the client's write position
+    excludes the replica), so only reads whose result goes straight to the client, or into the
+    single-flight micro-cache, are replica_read. Reads that fill a longer-lived cache (employee
+    context, response cache fills under on_primary()) use the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._flushing or not isinstance(clause, Select):
+            self.info[WROTE] = True
+        elif (
+            self.info.get(READ_REPLICA)
+            and not self.info.get(WROTE)
+            and clause._for_update_arg is None
+        ):
+            replica = replica_set.choose()
+            if replica is not None:
+                self.info[USED_REPLICA] = True
+                record_replica_read()
+                return replica.engine.sync_engine
+        return super().get_bind(mapper, clause=clause, **kw)
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _refresh_replica_loads(orm_execute_state) -> None:
+    # objects loaded from a replica earlier in the session are overwritten by reads from the primary
+    info = orm_execute_state.session.info
+    if orm_execute_state.is_select and info.get(WROTE) and info.get(USED_REPLICA):
+        orm_execute_state.update_execution_options(populate_existing=True)
+
+
+def replica_read(method):
+    """Repository method whose SELECTs may be served by a replica (when the session has not written)"""
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        info = self._session.sync_session.info
+        previous = info.get(READ_REPLICA)
+        info[READ_REPLICA] = True
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            info[READ_REPLICA] = previous
+
+    return wrapper
+
+
+# request sessions; jobs keep using session_maker, only the primary
+routing_session_maker = async_sessionmaker(
+    bind=engine, expire_on_commit=False, class_=AsyncSession, sync_session_class=RoutingSession
+)
+
+# one or two records per request, sampled with LOG_SAMPLE_RATES["db.session"]
+session_logger = get_logger("db.session")
+
+POOL_TIMEOUTS = registry.counter(
+    "db_pool_timeouts", "Requests answered with 503 because no connection was free within DB_POOL_TIMEOUT"
+)
+
+
+def pool_timeout_in(exc: Optional[BaseException]) -> Optional[PoolTimeoutError]:
+    """The pool checkout timeout behind exc; repositories and routers wrap it, with from e or from None"""
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        if isinstance(exc, PoolTimeoutError):
+            return exc
+        seen.add(id(exc))
+        exc = exc.__cause__ or exc.__context__
+    return None
+
+
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     """Dependency for async database session"""
-    async with session_maker() as session:
+    async with routing_session_maker() as session:
         try:
-            logger.debug("Database session created")
+            session_logger.debug("Database session created")
             yield session
+            if replica_set.lsn_check and session.sync_session.info.get(WROTE):
+                await _note_write_position(session)
         except Exception as exc:
-            logger.error(f"Database session error: {exc}", exc_info=True)
+            if pool_timeout_in(exc) is not None:
+                # the pool is exhausted: shed load instead of queueing the next requests behind this one
+                POOL_TIMEOUTS.inc()
+                session_logger.warning("No database connection free within %ss, answering 503", settings.DB_POOL_TIMEOUT)
+                raise HTTPException(
+                    status_code=503,
+                    detail="Database is overloaded, retry later",
+                    headers={"Retry-After": "1"},
+                ) from exc
+            session_logger.error("Database session error: %s", exc, exc_info=True)
             raise exc
         finally:
             await session.close()
-            logger.debug("Database session closed")
+            session_logger.debug("Database session closed")
+
+async def _note_write_position(session: AsyncSession) -> None:
+    try:
+        position = await session.scalar(select(func.pg_current_wal_lsn().cast(String)))
+        replica_set.note_write(parse_lsn(position))
+    except Exception as exc:
+        session_logger.warning("Failed to read the WAL position after a write: %s", exc)
+
 
 async def initialize_db() -> None:
     """Initialize database connection"""
@@ -42,6 +170,7 @@ async def shutdown_db() -> None:
     """Shutdown database connection"""
     try:
         await engine.dispose()
+        await replica_set.dispose()
         logger.info("Database connection closed successfully")
     except Exception as exc:
         logger.error(f"Error during database shutdown: {exc}", exc_info=True)
@@ -1,19 +1,46 @@
+from typing import Optional
+
 from aiohttp import ClientSession
 from fastapi import Depends
+from fastapi import Header
+from fastapi import HTTPException
 from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache.single_flight import single_flight
+from app.clients.ai_consultant import AIConsultantClient
+from app.common.config import settings
+from app.common.slow_queries import slow_query_log
 from app.database import get_async_session
 from app.events.event_handler_factory import EventHandlerFactory
+from app.repositories.analytics_repository import AnalyticsRepository
+from app.repositories.department_stats_repository import DepartmentStatsRepository
+from app.repositories.employee_context_repository import EmployeeContextRepository
 from app.repositories.employee_repository import EmployeeRepository
 from app.repositories.employee_skill_repository import EmployeeSkillRepository
 from app.repositories.quest_repository import QuestRepository
+from app.repositories.roadmap_repository import RoadmapRepository
+from app.repositories.skill_recommendation_repository import (
+    SkillRecommendationRepository,
+)
 from app.repositories.skill_repository import SkillRepository
+from app.repositories.skill_taxonomy_repository import SkillTaxonomyRepository
+from app.services.ai_consultant_service import AIConsultantService
+from app.services.analytics_service import AnalyticsService
+from app.services.department_stats_service import DepartmentStatsService
+from app.services.employee_context_service import EmployeeContextService
 from app.services.employee_service import EmployeeService
 from app.services.employee_skill_service import EmployeeSkillService
+from app.services.event_batch_service import EventBatchService
 from app.services.event_dispatcher_service import EventDispatcherService
 from app.services.quest_service import QuestService
+from app.services.roadmap_service import RoadmapService
+from app.services.similar_employee_service import SimilarEmployeeService
+from app.services.single_flight_service import SingleFlightService
+from app.services.skill_recommendation_service import SkillRecommendationService
 from app.services.skill_service import SkillService
+from app.services.skill_taxonomy_service import SkillTaxonomyService
+from app.services.slow_query_service import SlowQueryService
 
 
 async def get_aiohttp_session(request: Request) -> ClientSession:
@@ -28,6 +55,10 @@ async def get_aiohttp_session(request: Request) -> ClientSession:
     """
     return request.app.state.aiohttp_session
 
+async def get_ai_consultant_client(request: Request) -> Optional[AIConsultantClient]:
+    """The worker's AI consultant client, None when AI_CONSULTANT_URL is not set"""
+    return request.app.state.ai_consultant
+
 async def get_skill_repository(
     session: AsyncSession = Depends(get_async_session)
 ) -> SkillRepository:
@@ -56,23 +87,101 @@ async def get_employee_skill_repository(
 async def get_quest_repository(session: AsyncSession = Depends(get_async_session)) -> QuestRepository:
     return QuestRepository(session)
 
+async def get_department_stats_repository(
+    session: AsyncSession = Depends(get_async_session)
+) -> DepartmentStatsRepository:
+    return DepartmentStatsRepository(session)
+
+async def get_department_stats_service(
+    repository: DepartmentStatsRepository = Depends(get_department_stats_repository)
+) -> DepartmentStatsService:
+    return DepartmentStatsService(repository)
+
 async def get_quest_service(
-    repository: QuestRepository = Depends(get_quest_repository)
+    repository: QuestRepository = Depends(get_quest_repository),
+    department_stats_service: DepartmentStatsService = Depends(get_department_stats_service),
 ) -> QuestService:
-    return QuestService(repository)
+    return QuestService(repository, department_stats_service)
+
+async def get_roadmap_repository(session: AsyncSession = Depends(get_async_session)) -> RoadmapRepository:
+    return RoadmapRepository(session)
+
+async def get_roadmap_service(
+    repository: RoadmapRepository = Depends(get_roadmap_repository)
+) -> RoadmapService:
+    return RoadmapService(repository)
+
+async def get_event_batch_service(
+    repository: QuestRepository = Depends(get_quest_repository),
+    department_stats_service: DepartmentStatsService = Depends(get_department_stats_service),
+    roadmap_service: RoadmapService = Depends(get_roadmap_service),
+) -> EventBatchService:
+    return EventBatchService(repository, department_stats_service, roadmap_service)
+
+async def get_analytics_repository(session: AsyncSession = Depends(get_async_session)) -> AnalyticsRepository:
+    return AnalyticsRepository(session)
+
+async def get_analytics_service(
+    repository: AnalyticsRepository = Depends(get_analytics_repository)
+) -> AnalyticsService:
+    return AnalyticsService(repository)
+
+async def get_skill_recommendation_repository(
+    session: AsyncSession = Depends(get_async_session)
+) -> SkillRecommendationRepository:
+    return SkillRecommendationRepository(session)
+
+async def get_skill_recommendation_service(
+    repository: SkillRecommendationRepository = Depends(get_skill_recommendation_repository)
+) -> SkillRecommendationService:
+    return SkillRecommendationService(repository)
+
+async def get_skill_taxonomy_repository(
+    session: AsyncSession = Depends(get_async_session)
+) -> SkillTaxonomyRepository:
+    return SkillTaxonomyRepository(session)
+
+async def get_skill_taxonomy_service(
+    repository: SkillTaxonomyRepository = Depends(get_skill_taxonomy_repository)
+) -> SkillTaxonomyService:
+    return SkillTaxonomyService(repository)
+
+async def get_employee_context_repository(
+    session: AsyncSession = Depends(get_async_session)
+) -> EmployeeContextRepository:
+    return EmployeeContextRepository(session)
+
+async def get_employee_context_service(
+    repository: EmployeeContextRepository = Depends(get_employee_context_repository)
+) -> EmployeeContextService:
+    return EmployeeContextService(repository)
+
+async def get_ai_consultant_service(
+    context_service: EmployeeContextService = Depends(get_employee_context_service),
+    client: Optional[AIConsultantClient] = Depends(get_ai_consultant_client),
+) -> AIConsultantService:
+    return AIConsultantService(context_service, client)
+
+async def get_similar_employee_service(
+    repository: EmployeeRepository = Depends(get_employee_repository)
+) -> SimilarEmployeeService:
+    return SimilarEmployeeService(repository)
 
 def get_employee_service(
-    repository: EmployeeRepository = Depends(get_employee_repository), quest_service: QuestService = Depends(get_quest_service)
+    repository: EmployeeRepository = Depends(get_employee_repository),
+    quest_service: QuestService = Depends(get_quest_service),
+    department_stats_service: DepartmentStatsService = Depends(get_department_stats_service),
 ) -> EmployeeService:
     """Dependency for EmployeeService"""
-    return EmployeeService(repository, quest_service)
+    return EmployeeService(repository, quest_service, department_stats_service)
 
 
 async def get_event_handler_factory(
     quest_service: QuestService = Depends(get_quest_service),
-    employee_service: EmployeeService = Depends(get_employee_service)
+    employee_service: EmployeeService = Depends(get_employee_service),
+    roadmap_service: RoadmapService = Depends(get_roadmap_service),
 ) -> EventHandlerFactory:
-    factory = EventHandlerFactory(quest_service, employee_service)
+    factory = EventHandlerFactory(quest_service, employee_service, roadmap_service)
     return factory
 
 
@@ -86,3 +195,20 @@ async def get_employee_skill_service(
     employee_service: EmployeeService = Depends(get_employee_service),
 ) -> EmployeeSkillService:
     return EmployeeSkillService(repository, event_dispatcher_service, employee_service)
+
+
+async def require_admin(x_admin_key: Optional[str] = Header(None)) -> None:
+    """ADMIN_API_KEY in the X-Admin-Key header; without a configured key only in DEBUG mode"""
+    if settings.ADMIN_API_KEY:
+        if x_admin_key != settings.ADMIN_API_KEY:
+            raise HTTPException(status_code=403, detail="Invalid admin key")
+    elif not settings.DEBUG:
+        raise HTTPException(status_code=403, detail="Admin API is disabled, set ADMIN_API_KEY")
+
+
+def get_slow_query_service() -> SlowQueryService:
+    return SlowQueryService(slow_query_log)
+
+
+def get_single_flight_service() -> SingleFlightService:
+    return SingleFlightService(single_flight)
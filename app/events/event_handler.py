@@ -3,9 +3,11 @@ from abc import abstractmethod
 from typing import Protocol
 
 from app.common.logging import logger
+from app.jobs.skill_gap_refresh import skill_gap_refresher
 from app.schemas import QuestEventSchema
 from app.services.employee_service import EmployeeService
 from app.services.quest_service import QuestService
+from app.services.roadmap_service import RoadmapService
 
 
 class EventHandler(Protocol):
@@ -20,36 +22,59 @@ class QuestEventHandler(ABC):
 
 
 class SkillAddedHandler(QuestEventHandler):
-    def __init__(self, quest_service: QuestService):
+    def __init__(self, quest_service: QuestService, roadmap_service: RoadmapService):
         self.quest_service = quest_service
+        self.roadmap_service = roadmap_service
 
     async def handle(self, event: QuestEventSchema) -> None:
         if event.action_type == "skill_add":
             await self.quest_service.handle_quest_event(event)
+            await self.roadmap_service.recalculate_for_employees([event.employee_id])
+            skill_gap_refresher.mark_dirty()
+
+
+class SkillChangedHandler(QuestEventHandler):
+    """Skill level changed or skill removed: only roadmap skill coverage is affected"""
+
+    def __init__(self, roadmap_service: RoadmapService):
+        self.roadmap_service = roadmap_service
+
+    async def handle(self, event: QuestEventSchema) -> None:
+        if event.action_type in ("skill_update", "skill_remove"):
+            await self.roadmap_service.recalculate_for_employees([event.employee_id])
+            skill_gap_refresher.mark_dirty()
 
 
 class ProfileUpdatedHandler(QuestEventHandler):
-    def __init__(self, quest_service: QuestService, employee_service: EmployeeService):
+    def __init__(
+        self, quest_service: QuestService, employee_service: EmployeeService, roadmap_service: RoadmapService
+    ):
         self.quest_service = quest_service
         self.employee_service = employee_service
+        self.roadmap_service = roadmap_service
 
     async def handle(self, event: QuestEventSchema) -> None:
         if event.action_type == "profile_completion":
             completion = await self.employee_service.calculate_completion(event.employee_id)
-            await self.quest_service.handle_quest_event(QuestEventSchema(
+            updated_quests = await self.quest_service.handle_quest_event(QuestEventSchema(
                 employee_id=event.employee_id,
                 action_type="profile_completion",
                 count=completion.completion_percentage
             ))
+            if any(quest.is_completed for quest in updated_quests):
+                await self.roadmap_service.recalculate_for_employees([event.employee_id])
 
 
 class ProjectCompletedHandler(QuestEventHandler):
-    def __init__(self, quest_service: QuestService):
+    def __init__(self, quest_service: QuestService, roadmap_service: RoadmapService):
         self.quest_service = quest_service
+        self.roadmap_service = roadmap_service
 
     async def handle(self, event: QuestEventSchema) -> None:
         if event.action_type == "complete_project":
-            await self.quest_service.handle_quest_event(event)
+            updated_quests = await self.quest_service.handle_quest_event(event)
+            if any(quest.is_completed for quest in updated_quests):
+                await self.roadmap_service.recalculate_for_employees([event.employee_id])
 
 class FallbackHandler(QuestEventHandler):
     async def handle(self, event: QuestEventSchema) -> None:
@@ -2,14 +2,19 @@ from app.events.event_handler import ProfileUpdatedHandler
 from app.events.event_handler import ProjectCompletedHandler
 from app.events.event_handler import QuestEventHandler
 from app.events.event_handler import SkillAddedHandler
+from app.events.event_handler import SkillChangedHandler
 from app.services.employee_service import EmployeeService
 from app.services.quest_service import QuestService
+from app.services.roadmap_service import RoadmapService
 
 
 class EventHandlerFactory:
-    def __init__(self, quest_service: QuestService, employee_service: EmployeeService):
+    def __init__(
+        self, quest_service: QuestService, employee_service: EmployeeService, roadmap_service: RoadmapService
+    ):
         self.quest_service = quest_service
         self.employee_service = employee_service
+        self.roadmap_service = roadmap_service
         self._handlers: dict[str, QuestEventHandler] = {}
         self.create_default_handlers()
 
@@ -24,7 +29,11 @@ class EventHandlerFactory:
         return handler
 
     def create_default_handlers(self) -> None:
-        self.register_handler("skill_add", SkillAddedHandler(self.quest_service))
-        self.register_handler("profile_completion", ProfileUpdatedHandler(self.quest_service, self.employee_service))
-        self.register_handler("complete_project", ProjectCompletedHandler(self.quest_service))
-        self.register_handler("profile_update", ProfileUpdatedHandler(self.quest_service, self.employee_service))
+        profile_handler = ProfileUpdatedHandler(self.quest_service, self.employee_service, self.roadmap_service)
+        skill_changed_handler = SkillChangedHandler(self.roadmap_service)
+        self.register_handler("skill_add", SkillAddedHandler(self.quest_service, self.roadmap_service))
+        self.register_handler("skill_update", skill_changed_handler)
+        self.register_handler("skill_remove", skill_changed_handler)
+        self.register_handler("profile_completion", profile_handler)
+        self.register_handler("complete_project", ProjectCompletedHandler(self.quest_service, self.roadmap_service))
+        self.register_handler("profile_update", profile_handler)
@@ -0,0 +1,194 @@
+"""
+Live per-employee events (quest progress, completions, XP, level-ups) for streaming clients.
+
+Publishers send events of one or many employees on the employee_events NOTIFY channel
+({"batch": [[employee_id, [[type, data], ...]], ...]}), every worker delivers them to its local
+subscribers of those employees. With EVENT_STREAM_FANOUT=local events are delivered in-process
+only, which is enough for a single worker.
+
+Every subscriber has a bounded buffer. A client that does not keep up does not slow anybody down:
+its buffer is dropped and it receives a single "resync" event telling it to reload the state.
+"""
+import asyncio
+import itertools
+import json
+from collections import defaultdict
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+from app.common.config import settings
+from app.common.exceptions import StreamLimitException
+from app.common.logging import logger
+from app.common.metrics import registry
+from app.events.pg_notify import MAX_PAYLOAD_BYTES
+from app.events.pg_notify import PgNotifyListener
+from app.events.pg_notify import notify
+
+EMPLOYEE_EVENTS_CHANNEL = "employee_events"
+RESYNC = "resync"
+
+Event = Tuple[int, str, Dict[str, Any]]
+
+_PAYLOAD_HEAD = b'{"batch":['
+_PAYLOAD_TAIL = b"]}"
+
+LIVE_SUBSCRIBERS = registry.gauge("live_event_subscribers", "Open live event streams in this worker")
+LIVE_EVENTS = registry.counter("live_events_delivered", "Live events put into subscriber buffers", ("type",))
+LIVE_OVERFLOWS = registry.counter("live_event_overflows", "Subscriber buffers dropped because the client lagged")
+
+
+def _encode_entry(employee_id: int, events: List[Tuple[str, Dict[str, Any]]]) -> bytes:
+    return json.dumps([employee_id, events], separators=(",", ":"), default=str).encode()
+
+
+class Subscription:
+    __slots__ = ("employee_id", "_queue", "_overflowed")
+
+    def __init__(self, employee_id: int, buffer_size: int):
+        self.employee_id = employee_id
+        self._queue: "asyncio.Queue[Event]" = asyncio.Queue(maxsize=buffer_size)
+        self._overflowed = False
+
+    def offer(self, event: Event) -> None:
+        if self._overflowed:
+            return
+        try:
+            self._queue.put_nowait(event)
+            LIVE_EVENTS.inc(type=event[1])
+        except asyncio.QueueFull:
+            # newer events would be misleading without the ones dropped, ask the client to reload instead
+            self._overflowed = True
+            LIVE_OVERFLOWS.inc()
+            while not self._queue.empty():
+                self._queue.get_nowait()
+
+    async def next(self, timeout: float) -> Optional[Event]:
+        """Next event, a resync marker after an overflow, or None on timeout"""
+        if self._overflowed and self._queue.empty():
+            self._overflowed = False
+            return 0, RESYNC, {}
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class LiveEventBroker:
+    def __init__(self, fanout: str, buffer_size: int, max_subscribers: int):
+        self.fanout = fanout
+        self.buffer_size = buffer_size
+        self.max_subscribers = max_subscribers
+        self._subscribers: Dict[int, Set[Subscription]] = defaultdict(set)
+        self._count = 0
+        self._ids = itertools.count(1)
+        LIVE_SUBSCRIBERS.set_function(lambda: self._count)
+
+    def has_capacity(self) -> bool:
+        return self._count < self.max_subscribers
+
+    def subscribe(self, employee_id: int) -> Subscription:
+        if not self.has_capacity():
+            raise StreamLimitException("Too many open event streams, try again later")
+        subscription = Subscription(employee_id, self.buffer_size)
+        self._subscribers[employee_id].add(subscription)
+        self._count += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._subscribers.get(subscription.employee_id)
+        if subscribers is None or subscription not in subscribers:
+            return
+        subscribers.discard(subscription)
+        self._count -= 1
+        if not subscribers:
+            del self._subscribers[subscription.employee_id]
+
+    async def publish(self, employee_id: int, events: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """Send (type, data) events of one employee to every worker. Best effort."""
+        await self.publish_many({employee_id: events})
+
+    async def publish_many(self, events: Dict[int, List[Tuple[str, Dict[str, Any]]]]) -> None:
+        """Same as publish for many employees, packed into as few notifications as fit"""
+        events = {employee_id: items for employee_id, items in events.items() if items}
+        if not events:
+            return
+        if self.fanout == "local":
+            for employee_id, items in events.items():
+                self._deliver(employee_id, items)
+            return
+        packed: List[Tuple[int, List[Tuple[str, Dict[str, Any]]], bytes]] = []
+        size = len(_PAYLOAD_HEAD) + len(_PAYLOAD_TAIL)
+        for entry in self._entries(events):
+            if packed and size + len(entry[2]) + 1 > MAX_PAYLOAD_BYTES:
+                await self._notify(packed)
+                packed, size = [], len(_PAYLOAD_HEAD) + len(_PAYLOAD_TAIL)
+            packed.append(entry)
+            size += len(entry[2]) + 1
+        await self._notify(packed)
+
+    def _entries(self, events: Dict[int, List[Tuple[str, Dict[str, Any]]]]):
+        """(employee_id, events, encoded entry) chunks that fit a notification on their own"""
+        limit = MAX_PAYLOAD_BYTES - len(_PAYLOAD_HEAD) - len(_PAYLOAD_TAIL)
+        for employee_id, items in events.items():
+            entry = _encode_entry(employee_id, items)
+            if len(entry) <= limit:
+                yield employee_id, items, entry
+                continue
+            for item in items:
+                entry = _encode_entry(employee_id, [item])
+                if len(entry) <= limit:
+                    yield employee_id, [item], entry
+                else:
+                    logger.warning(f"Live event {item[0]} is too large to fan out, delivered locally only")
+                    self._deliver(employee_id, [item])
+
+    async def _notify(self, packed: List[Tuple[int, List[Tuple[str, Dict[str, Any]]], bytes]]) -> None:
+        if not packed:
+            return
+        payload = _PAYLOAD_HEAD + b",".join(entry for _, _, entry in packed) + _PAYLOAD_TAIL
+        if not await notify(EMPLOYEE_EVENTS_CHANNEL, payload.decode()):
+            # other workers miss it, local subscribers should not
+            for employee_id, items, _ in packed:
+                self._deliver(employee_id, items)
+
+    def _deliver(self, employee_id: int, events: List[Tuple[str, Dict[str, Any]]]) -> None:
+        subscribers = self._subscribers.get(employee_id)
+        if not subscribers:
+            return
+        for event_type, data in events:
+            event = (next(self._ids), event_type, data)
+            for subscription in subscribers:
+                subscription.offer(event)
+
+    def _on_notification(self, payload: str) -> None:
+        try:
+            batch = [
+                (int(employee_id), [(str(event_type), data) for event_type, data in events])
+                for employee_id, events in json.loads(payload)["batch"]
+            ]
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring malformed employee event notification: {str(e)}")
+            return
+        for employee_id, events in batch:
+            self._deliver(employee_id, events)
+
+    def _on_reconnect(self) -> None:
+        # events published while the listener was down are lost
+        for subscribers in self._subscribers.values():
+            for subscription in subscribers:
+                subscription.offer((0, RESYNC, {}))
+
+    def attach(self, listener: PgNotifyListener) -> None:
+        if self.fanout != "local":
+            listener.subscribe(EMPLOYEE_EVENTS_CHANNEL, self._on_notification, on_reconnect=self._on_reconnect)
+
+
+live_events = LiveEventBroker(
+    fanout=settings.EVENT_STREAM_FANOUT,
+    buffer_size=settings.EVENT_STREAM_BUFFER_SIZE,
+    max_subscribers=settings.EVENT_STREAM_MAX_CONNECTIONS,
+)
@@ -0,0 +1,132 @@
+"""
+Cross-worker notifications over PostgreSQL LISTEN/NOTIFY.
+
+Every worker keeps one dedicated asyncpg connection (outside the SQLAlchemy pool) that LISTENs on
+the subscribed channels. Notifications sent while that connection is down are lost, so subscribers
+register an on_reconnect callback to resynchronise their state.
+"""
+import asyncio
+import inspect
+from collections import defaultdict
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Union
+
+import asyncpg
+from sqlalchemy import func
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+
+from app.common.config import settings
+from app.common.logging import logger
+from app.database import engine
+
+Callback = Callable[[str], Union[Awaitable[None], None]]
+ReconnectCallback = Callable[[], Union[Awaitable[None], None]]
+
+# asyncpg rejects NOTIFY payloads of 8000 bytes and more
+MAX_PAYLOAD_BYTES = 7900
+
+
+def _asyncpg_dsn() -> str:
+    return make_url(settings.database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+async def notify(channel: str, payload: str) -> bool:
+    """Send a notification to every worker (this one included). Best effort, returns False on failure."""
+    if len(payload.encode()) > MAX_PAYLOAD_BYTES:
+        raise ValueError(f"Notification payload for {channel} is too large")
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(select(func.pg_notify(channel, payload)))
+        return True
+    except Exception as e:
+        logger.warning(f"Failed to notify {channel}: {str(e)}")
+        return False
+
+
+class PgNotifyListener:
+    def __init__(self, reconnect_delay: float = 2.0, ping_interval: float = 30.0):
+        self.reconnect_delay = reconnect_delay
+        self.ping_interval = ping_interval
+        self._callbacks: Dict[str, List[Callback]] = defaultdict(list)
+        self._reconnect_callbacks: List[ReconnectCallback] = []
+        self._task: Optional[asyncio.Task] = None
+        self._background: set = set()
+
+    def subscribe(self, channel: str, callback: Callback,
+                  on_reconnect: Optional[ReconnectCallback] = None) -> None:
+        """Register before start(); callbacks may be sync or async"""
+        self._callbacks[channel].append(callback)
+        if on_reconnect is not None:
+            self._reconnect_callbacks.append(on_reconnect)
+
+    def start(self) -> None:
+        if self._task is None and self._callbacks:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _spawn(self, result) -> None:
+        if inspect.isawaitable(result):
+            task = asyncio.ensure_future(result)
+            self._background.add(task)
+            task.add_done_callback(self._finish)
+
+    def _finish(self, task: asyncio.Task) -> None:
+        self._background.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Notification callback failed: {task.exception()}")
+
+    def _dispatch(self, connection, pid: int, channel: str, payload: str) -> None:
+        for callback in self._callbacks.get(channel, ()):
+            try:
+                self._spawn(callback(payload))
+            except Exception as e:
+                logger.error(f"Notification callback for {channel} failed: {str(e)}")
+
+    async def _run(self) -> None:
+        connected_before = False
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(_asyncpg_dsn())
+                closed = asyncio.Event()
+                connection.add_termination_listener(lambda _, event=closed: event.set())
+                for channel in self._callbacks:
+                    await connection.add_listener(channel, self._dispatch)
+                logger.info(f"Listening on {', '.join(self._callbacks)}")
+
+                if connected_before:
+                    for callback in self._reconnect_callbacks:
+                        self._spawn(callback())
+
+                while not closed.is_set():
+                    try:
+                        await asyncio.wait_for(closed.wait(), timeout=self.ping_interval)
+                    except asyncio.TimeoutError:
+                        await connection.execute("SELECT 1")
+                logger.warning("Notification listener connection closed")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Notification listener failed: {str(e)}")
+            finally:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            # anything published until we are back is missed, subscribers resync on reconnect
+            connected_before = True
+            await asyncio.sleep(self.reconnect_delay)
+
+
+pg_listener = PgNotifyListener()
@@ -0,0 +1,223 @@
+"""
+Columnar snapshot export of analytics tables to partitioned Parquet.
+
+Each run writes <SNAPSHOT_DIR>/<table>/snapshot=<UTC timestamp>/part-00000.parquet.
+
+employees are exported incrementally: rows with updated_at at or after the watermark minus
+WATERMARK_OVERLAP, so rows committed late with an earlier now() are not skipped; a partition may
+repeat rows of the previous one. Watermarks live in <SNAPSHOT_DIR>/_watermarks.json.
+The other tables are updated in place, deleted and reinserted with new ids (quest XP and
+leaderboard entries are rebuilt) and have no change column, so each run exports them in full and
+replaces their previous partition. Point ANALYTICS_DATABASE_URL at a replica to keep the export
+off the primary.
+
+Usage:
+    python -m app.jobs.analytics_snapshot              # incremental
+    python -m app.jobs.analytics_snapshot --full       # ignore watermarks
+    python -m app.jobs.analytics_snapshot --tables employees employee_skills
+
+Readers open the output with read_snapshot(), which memory-maps the Parquet files.
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+from dataclasses import dataclass
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import TIMESTAMP
+from sqlalchemy import BigInteger
+from sqlalchemy import Boolean
+from sqlalchemy import Float
+from sqlalchemy import Integer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.common.config import settings
+from app.common.logging import logger
+from app.models import Base
+from app.models import Employee
+from app.models import EmployeeQuest
+from app.models import EmployeeSkill
+from app.models import ExperiencePoints
+from app.models import LeaderboardEntry
+
+WATERMARKS_FILE = "_watermarks.json"
+BATCH_SIZE = 50_000
+# longer than any transaction that updates employees, so a late commit is still picked up
+WATERMARK_OVERLAP = timedelta(minutes=10)
+
+
+@dataclass(frozen=True)
+class SnapshotTable:
+    model: type[Base]
+    # indexed updated_at column for an incremental export, None for a full one
+    watermark: Optional[str] = None
+
+
+SNAPSHOT_TABLES: Dict[str, SnapshotTable] = {
+    "employees": SnapshotTable(Employee, "updated_at"),
+    "employee_skills": SnapshotTable(EmployeeSkill),
+    "employee_quests": SnapshotTable(EmployeeQuest),
+    "experience_points": SnapshotTable(ExperiencePoints),
+    "leaderboard_entries": SnapshotTable(LeaderboardEntry),
+}
+
+
+def _arrow_type(column) -> pa.DataType:
+    if isinstance(column.type, BigInteger):
+        return pa.int64()
+    if isinstance(column.type, Integer):
+        return pa.int32()
+    if isinstance(column.type, Float):
+        return pa.float64()
+    if isinstance(column.type, Boolean):
+        return pa.bool_()
+    if isinstance(column.type, TIMESTAMP):
+        return pa.timestamp("us")
+    return pa.string()
+
+
+def _arrow_schema(model: type[Base]) -> pa.Schema:
+    return pa.schema([pa.field(column.name, _arrow_type(column)) for column in model.__table__.columns])
+
+
+def _load_watermarks(root: str) -> Dict[str, Any]:
+    path = os.path.join(root, WATERMARKS_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_watermarks(root: str, watermarks: Dict[str, Any]) -> None:
+    path = os.path.join(root, WATERMARKS_FILE)
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(watermarks, f, indent=2, sort_keys=True)
+    os.replace(f"{path}.tmp", path)
+
+
+def _decode_watermark(value: Any) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value is not None else None
+
+
+def _encode_watermark(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _drop_other_partitions(root: str, name: str, partition: str) -> None:
+    table_dir = os.path.join(root, name)
+    for entry in os.listdir(table_dir):
+        if entry.startswith("snapshot=") and entry != f"snapshot={partition}":
+            shutil.rmtree(os.path.join(table_dir, entry), ignore_errors=True)
+
+
+async def export_table(conn, name: str, spec: SnapshotTable, root: str, partition: str,
+                       watermark: Optional[datetime]) -> tuple[int, Optional[datetime]]:
+    """
+    Stream the rows into one Parquet file, one row group per batch: for an incremental table the
+    rows changed since the watermark (with the overlap), otherwise all of them
+    """
+    table = spec.model.__table__
+    if spec.watermark is not None:
+        watermark_column = table.c[spec.watermark]
+        query = select(table).order_by(watermark_column)
+        if watermark is not None:
+            query = query.where(watermark_column >= watermark - WATERMARK_OVERLAP)
+    else:
+        query = select(table).order_by(*table.primary_key)
+
+    schema = _arrow_schema(spec.model)
+    target_dir = os.path.join(root, name, f"snapshot={partition}")
+    target = os.path.join(target_dir, "part-00000.parquet")
+    rows_written = 0
+    writer: Optional[pq.ParquetWriter] = None
+
+    result = await conn.stream(query.execution_options(yield_per=BATCH_SIZE))
+    try:
+        async for rows in result.partitions(BATCH_SIZE):
+            if writer is None:
+                os.makedirs(target_dir, exist_ok=True)
+                writer = pq.ParquetWriter(f"{target}.tmp", schema, compression="zstd")
+            columns = {field.name: [row._mapping[field.name] for row in rows] for field in schema}
+            writer.write_batch(pa.RecordBatch.from_pydict(columns, schema=schema))
+            rows_written += len(rows)
+            if spec.watermark is not None:
+                watermark = rows[-1]._mapping[spec.watermark]
+        if writer is None and spec.watermark is None:
+            # an empty table still replaces the previous full snapshot
+            os.makedirs(target_dir, exist_ok=True)
+            writer = pq.ParquetWriter(f"{target}.tmp", schema, compression="zstd")
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if writer is not None:
+        os.replace(f"{target}.tmp", target)
+    if spec.watermark is None:
+        _drop_other_partitions(root, name, partition)
+    return rows_written, watermark
+
+
+async def create_snapshot(root: Optional[str] = None, tables: Optional[Iterable[str]] = None,
+                          full: bool = False, database_url: Optional[str] = None) -> Dict[str, int]:
+    root = root or settings.SNAPSHOT_DIR
+    os.makedirs(root, exist_ok=True)
+    watermarks = {} if full else _load_watermarks(root)
+    partition = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    engine = create_async_engine(
+        database_url or settings.ANALYTICS_DATABASE_URL or settings.database_url, poolclass=NullPool
+    )
+
+    exported: Dict[str, int] = {}
+    try:
+        async with engine.connect() as conn:
+            # one repeatable-read snapshot keeps the exported tables consistent with each other
+            await conn.execution_options(isolation_level="REPEATABLE READ")
+            for name in tables or SNAPSHOT_TABLES:
+                spec = SNAPSHOT_TABLES[name]
+                watermark = _decode_watermark(watermarks.get(name)) if spec.watermark else None
+                rows, new_watermark = await export_table(conn, name, spec, root, partition, watermark)
+                exported[name] = rows
+                if rows and spec.watermark is not None:
+                    watermarks[name] = _encode_watermark(new_watermark)
+                logger.info(f"Snapshot {name}: {rows} rows exported to partition {partition}")
+        _save_watermarks(root, watermarks)
+    finally:
+        await engine.dispose()
+    return exported
+
+
+def read_snapshot(table: str, root: Optional[str] = None) -> pa.Table:
+    """
+    Memory-map every partition of a table into one Arrow table.
+    Fully exported tables have a single partition. Incremental partitions (employees) may hold
+    several versions of a row, the newest one has the greatest updated_at.
+    """
+    return pq.read_table(
+        os.path.join(root or settings.SNAPSHOT_DIR, table), memory_map=True, partitioning="hive"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export analytics tables to Parquet")
+    parser.add_argument("--output", default=None, help="Snapshot directory (default SNAPSHOT_DIR)")
+    parser.add_argument("--tables", nargs="*", choices=sorted(SNAPSHOT_TABLES), default=None)
+    parser.add_argument("--full", action="store_true", help="Ignore the employees watermark and export everything")
+    parser.add_argument("--database-url", default=None, help="Source database (default ANALYTICS_DATABASE_URL)")
+    args = parser.parse_args()
+    asyncio.run(create_snapshot(args.output, args.tables, args.full, args.database_url))
+
+
+if __name__ == "__main__":
+    main()
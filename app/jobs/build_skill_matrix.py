@@ -0,0 +1,58 @@
+"""
+Builder for the shared employee x skill matrix.
+
+Usage:
+    python -m app.jobs.build_skill_matrix                  # build once
+    python -m app.jobs.build_skill_matrix --interval 300   # rebuild every 5 minutes
+    python -m app.jobs.build_skill_matrix --lsh            # also update the similar-employee LSH index
+
+Run a single builder per host: web workers only map the published file (SHARED_MATRIX_DIR).
+"""
+import argparse
+import asyncio
+
+from app.common.logging import logger
+from app.database import session_maker
+from app.database import shutdown_db
+from app.ml.employee_similarity import publish_lsh_index
+from app.ml.mmap_store import MappedBundle
+from app.ml.skill_matrix import SkillMatrix
+from app.ml.skill_matrix import publish_skill_matrix
+
+
+async def build_skill_matrix(lsh: bool = False) -> str:
+    async with session_maker() as session:
+        path = await publish_skill_matrix(session)
+        logger.info(f"Skill matrix published: {path}")
+    if lsh:
+        lsh_path, recomputed = publish_lsh_index(SkillMatrix(MappedBundle(path)))
+        logger.info(f"Employee LSH index published: {lsh_path}, {recomputed} signatures recomputed")
+    return path
+
+
+async def run(interval: float, lsh: bool) -> None:
+    try:
+        while True:
+            try:
+                await build_skill_matrix(lsh)
+            except Exception as e:
+                if not interval:
+                    raise
+                logger.error(f"Skill matrix build failed: {str(e)}")
+            if not interval:
+                return
+            await asyncio.sleep(interval)
+    finally:
+        await shutdown_db()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Publish the shared employee x skill matrix")
+    parser.add_argument("--interval", type=float, default=0, help="Rebuild period in seconds, 0 to build once")
+    parser.add_argument("--lsh", action="store_true", help="Also publish the approximate similar-employee index")
+    args = parser.parse_args()
+    asyncio.run(run(args.interval, args.lsh))
+
+
+if __name__ == "__main__":
+    main()
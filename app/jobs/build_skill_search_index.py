@@ -0,0 +1,50 @@
+"""
+Builder for the semantic skill search index used by GET /skills/v1/search and the
+near-duplicate check of POST /skills/v1/.
+
+Usage:
+    python -m app.jobs.build_skill_search_index                  # build once
+    python -m app.jobs.build_skill_search_index --interval 600   # rebuild every 10 minutes
+"""
+import argparse
+import asyncio
+
+from app.common.logging import logger
+from app.database import session_maker
+from app.database import shutdown_db
+from app.ml.skill_search import publish_skill_search_index
+from app.repositories.skill_repository import SkillRepository
+
+
+async def build_skill_search_index() -> str:
+    async with session_maker() as session:
+        skills = await SkillRepository(session).get_catalog()
+    path = publish_skill_search_index(skills)
+    logger.info(f"Skill search index published: {path}, {len(skills)} skills")
+    return path
+
+
+async def run(interval: float) -> None:
+    try:
+        while True:
+            try:
+                await build_skill_search_index()
+            except Exception as e:
+                if not interval:
+                    raise
+                logger.error(f"Skill search index build failed: {str(e)}")
+            if not interval:
+                return
+            await asyncio.sleep(interval)
+    finally:
+        await shutdown_db()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Publish the skill search index")
+    parser.add_argument("--interval", type=float, default=0, help="Rebuild period in seconds, 0 to build once")
+    asyncio.run(run(parser.parse_args().interval))
+
+
+if __name__ == "__main__":
+    main()
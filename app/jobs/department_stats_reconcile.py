@@ -0,0 +1,30 @@
+"""
+Nightly reconciliation of the department_stats read model against the source tables.
+
+Usage: python -m app.jobs.department_stats_reconcile
+"""
+import asyncio
+
+from app.common.logging import logger
+from app.database import session_maker
+from app.database import shutdown_db
+from app.repositories.department_stats_repository import DepartmentStatsRepository
+from app.services.department_stats_service import DepartmentStatsService
+
+
+async def reconcile_department_stats() -> int:
+    async with session_maker() as session:
+        reconciled = await DepartmentStatsService(DepartmentStatsRepository(session)).reconcile()
+        logger.info(f"Department stats reconciled for {reconciled} departments")
+        return reconciled
+
+
+async def main() -> None:
+    try:
+        await reconcile_department_stats()
+    finally:
+        await shutdown_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
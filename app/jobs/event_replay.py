@@ -0,0 +1,217 @@
+"""
+Rebuild employee_quests, quest XP (experience_points, employees.total_xp and level) and leaderboards
+from the domain_events log, using the current quest definitions.
+
+Every domain_events partition is replayed by a worker process in chunks of employees; each chunk is
+rewritten with a few bulk statements and moves the partition checkpoint in the same transaction,
+so an interrupted replay continues where it stopped. Department stats, roadmap progress and
+leaderboards are recomputed at the end.
+
+Usage:
+    python -m app.jobs.event_replay --from-scratch --workers 8   # full rebuild
+    python -m app.jobs.event_replay                              # continue from the checkpoints
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import queue
+import time
+from concurrent.futures import FIRST_EXCEPTION
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import wait
+from itertools import groupby
+from operator import attrgetter
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+from sqlalchemy.exc import DBAPIError
+
+from app.cache.employee_context import employee_context_cache
+from app.cache.response_cache import response_cache
+from app.common.exceptions import DatabaseException
+from app.common.logging import logger
+from app.database import session_maker
+from app.database import shutdown_db
+from app.repositories.department_stats_repository import DepartmentStatsRepository
+from app.repositories.domain_event_repository import DOMAIN_EVENT_PARTITIONS
+from app.repositories.domain_event_repository import QUEST_ASSIGNED
+from app.repositories.domain_event_repository import QUEST_PROGRESS_IMPORTED
+from app.repositories.domain_event_repository import DomainEventRepository
+from app.repositories.domain_event_repository import QuestDefinition
+from app.repositories.domain_event_repository import ReplayedQuest
+from app.repositories.domain_event_repository import ReplayedXp
+from app.repositories.domain_event_repository import StoredEvent
+from app.repositories.leaderboard_repository import LeaderboardRepository
+from app.repositories.quest_repository import QUEST_XP_ACTION
+from app.repositories.roadmap_repository import RoadmapRepository
+from app.services.department_stats_service import DepartmentStatsService
+from app.services.roadmap_service import RoadmapService
+
+SERIALIZATION_FAILURE = "40001"
+MAX_CHUNK_RETRIES = 5
+REPORT_INTERVAL_SECONDS = 5.0
+
+
+def replay_events(
+    events: List[StoredEvent], quests: Dict[int, QuestDefinition]
+) -> Tuple[List[ReplayedQuest], List[ReplayedXp]]:
+    """
+    Quest state and quest XP of employees from their events, ordered by (employee_id, id). Follows
+    QuestRepository.update_quest_progress: an event advances the not yet completed quests of its
+    action type assigned before it, capped at required_count; completion awards xp_reward.
+    Quests deleted since are dropped; events do not advance inactive quests, as in the live path
+    (the current is_active is used, deactivations are not recorded as events).
+    """
+    quest_rows: List[ReplayedQuest] = []
+    xp_rows: List[ReplayedXp] = []
+    for employee_id, employee_events in groupby(events, key=attrgetter("employee_id")):
+        # quest_id -> [current_count, is_completed, assigned_at, completed_at]
+        assigned: Dict[int, list] = {}
+        for event in employee_events:
+            if event.action_type == QUEST_ASSIGNED:
+                if event.quest_id in quests and event.quest_id not in assigned:
+                    assigned[event.quest_id] = [0, False, event.occurred_at, None]
+                continue
+            if event.action_type == QUEST_PROGRESS_IMPORTED:
+                targets = [event.quest_id] if event.quest_id in assigned else []
+            else:
+                targets = [
+                    quest_id for quest_id in assigned
+                    if quests[quest_id].action_type == event.action_type and quests[quest_id].is_active
+                ]
+            for quest_id in targets:
+                state, quest = assigned[quest_id], quests[quest_id]
+                if state[1]:
+                    continue
+                state[0] = min(state[0] + event.amount, quest.required_count)
+                if state[0] >= quest.required_count:
+                    state[1] = True
+                    state[3] = event.occurred_at
+                    if quest.xp_reward > 0:
+                        xp_rows.append(ReplayedXp(employee_id, quest.xp_reward, QUEST_XP_ACTION, event.occurred_at))
+        quest_rows.extend(
+            ReplayedQuest(employee_id, quest_id, count, completed, assigned_at, completed_at)
+            for quest_id, (count, completed, assigned_at, completed_at) in assigned.items()
+        )
+    return quest_rows, xp_rows
+
+
+def _is_serialization_failure(error: Exception) -> bool:
+    cause = error.__cause__
+    return isinstance(cause, DBAPIError) and getattr(cause.orig, "sqlstate", None) == SERIALIZATION_FAILURE
+
+
+async def _replay_partition(partition: int, after_employee_id: int, chunk_size: int, progress) -> Tuple[int, int]:
+    try:
+        async with session_maker() as session:
+            quests = await DomainEventRepository(session).get_quest_definitions()
+        employees = events = 0
+        while True:
+            for attempt in range(1, MAX_CHUNK_RETRIES + 1):
+                try:
+                    async with session_maker() as session:
+                        last, chunk_employees, chunk_events = await DomainEventRepository(session).replay_chunk(
+                            partition,
+                            after_employee_id,
+                            chunk_size,
+                            lambda chunk: replay_events(chunk, quests),
+                            QUEST_XP_ACTION,
+                        )
+                    break
+                except DatabaseException as e:
+                    # a live write touched the same employees, the chunk is read again
+                    if attempt == MAX_CHUNK_RETRIES or not _is_serialization_failure(e):
+                        raise
+                    await asyncio.sleep(0.05 * attempt)
+            if last is None:
+                return employees, events
+            after_employee_id = last
+            employees += chunk_employees
+            events += chunk_events
+            progress.put((partition, chunk_employees, chunk_events))
+    finally:
+        await shutdown_db()
+
+
+def replay_partition(partition: int, after_employee_id: int, chunk_size: int, progress) -> Tuple[int, int]:
+    """Worker process entry point"""
+    return asyncio.run(_replay_partition(partition, after_employee_id, chunk_size, progress))
+
+
+async def _prepare(from_scratch: bool) -> Dict[int, int]:
+    try:
+        async with session_maker() as session:
+            repository = DomainEventRepository(session)
+            if from_scratch:
+                await repository.reset_checkpoints()
+                return {}
+            return await repository.get_checkpoints()
+    finally:
+        await shutdown_db()
+
+
+async def _rebuild_derived() -> None:
+    try:
+        async with session_maker() as session:
+            await DepartmentStatsService(DepartmentStatsRepository(session)).reconcile()
+            await RoadmapService(RoadmapRepository(session)).recalculate_all()
+            entries = await LeaderboardRepository(session).rebuild_entries()
+            logger.info(f"Leaderboards rebuilt, {entries} entries")
+        await employee_context_cache.clear()
+    finally:
+        await response_cache.close()
+        await shutdown_db()
+
+
+def run_replay(from_scratch: bool, workers: int, chunk_size: int) -> None:
+    checkpoints = asyncio.run(_prepare(from_scratch))
+    started = last_report = time.monotonic()
+    employees = events = 0
+    # spawn: every worker opens its own connection pool instead of inheriting the parent's sockets
+    context = multiprocessing.get_context("spawn")
+    with context.Manager() as manager, ProcessPoolExecutor(workers, mp_context=context) as pool:
+        progress = manager.Queue()
+        futures = [
+            pool.submit(replay_partition, partition, checkpoints.get(partition, 0), chunk_size, progress)
+            for partition in range(DOMAIN_EVENT_PARTITIONS)
+        ]
+        while True:
+            done, pending = wait(futures, timeout=0.5, return_when=FIRST_EXCEPTION)
+            while True:
+                try:
+                    _, chunk_employees, chunk_events = progress.get_nowait()
+                except queue.Empty:
+                    break
+                employees += chunk_employees
+                events += chunk_events
+            if time.monotonic() - last_report >= REPORT_INTERVAL_SECONDS or not pending:
+                last_report = time.monotonic()
+                elapsed = last_report - started
+                logger.info(
+                    f"Replay: {len(futures) - len(pending)}/{len(futures)} partitions done, {employees} employees, "
+                    f"{events} events, {events / elapsed if elapsed else 0:.0f} events/s"
+                )
+            failures = [error for error in (future.exception() for future in done) if error is not None]
+            if failures:
+                for future in pending:
+                    future.cancel()
+                raise failures[0]
+            if not pending:
+                break
+    asyncio.run(_rebuild_derived())
+    logger.info(f"Replay finished in {time.monotonic() - started:.1f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild quest, XP and leaderboard state from domain_events")
+    parser.add_argument("--from-scratch", action="store_true", help="ignore checkpoints and replay everything")
+    parser.add_argument("--workers", type=int, default=min(os.cpu_count() or 1, DOMAIN_EVENT_PARTITIONS))
+    parser.add_argument("--chunk-size", type=int, default=500, help="employees rewritten per transaction")
+    args = parser.parse_args()
+    run_replay(args.from_scratch, args.workers, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
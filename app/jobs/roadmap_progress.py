@@ -0,0 +1,27 @@
+"""
+Full recalculation of EmployeeRoadmap.progress_percentage.
+
+Usage: python -m app.jobs.roadmap_progress
+"""
+import asyncio
+
+from app.database import session_maker
+from app.database import shutdown_db
+from app.repositories.roadmap_repository import RoadmapRepository
+from app.services.roadmap_service import RoadmapService
+
+
+async def recalculate_roadmap_progress() -> int:
+    async with session_maker() as session:
+        return await RoadmapService(RoadmapRepository(session)).recalculate_all()
+
+
+async def main() -> None:
+    try:
+        await recalculate_roadmap_progress()
+    finally:
+        await shutdown_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
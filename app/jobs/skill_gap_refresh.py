@@ -0,0 +1,81 @@
+"""
+Refresh of the skill_gap_matrix materialized view.
+
+Inside the web process SkillGapRefresher refreshes the view in the background once skill
+events mark it dirty (at most every SKILL_GAP_REFRESH_INTERVAL_SECONDS), and unconditionally
+every SKILL_GAP_MAX_STALENESS_SECONDS to pick up roadmap, project and department changes.
+
+One-off refresh: python -m app.jobs.skill_gap_refresh
+"""
+import asyncio
+import time
+from typing import Optional
+
+from app.common.config import settings
+from app.common.logging import logger
+from app.database import session_maker
+from app.database import shutdown_db
+from app.repositories.analytics_repository import AnalyticsRepository
+from app.services.analytics_service import AnalyticsService
+
+
+async def refresh_skill_gap_matrix() -> bool:
+    async with session_maker() as session:
+        return await AnalyticsService(AnalyticsRepository(session)).refresh_skill_gap_matrix()
+
+
+class SkillGapRefresher:
+    def __init__(self, interval: float, max_staleness: float):
+        self.interval = interval
+        self.max_staleness = max_staleness
+        self._dirty = False
+        self._last_refresh = time.monotonic()
+        self._task: Optional[asyncio.Task] = None
+
+    def mark_dirty(self) -> None:
+        self._dirty = True
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            stale = time.monotonic() - self._last_refresh >= self.max_staleness
+            if not (self._dirty or stale):
+                continue
+            self._dirty = False
+            try:
+                if await refresh_skill_gap_matrix():
+                    logger.debug("Skill gap matrix refreshed")
+                self._last_refresh = time.monotonic()
+            except Exception as e:
+                self._dirty = True
+                logger.error(f"Skill gap matrix refresh failed: {str(e)}")
+
+
+skill_gap_refresher = SkillGapRefresher(
+    interval=settings.SKILL_GAP_REFRESH_INTERVAL_SECONDS,
+    max_staleness=settings.SKILL_GAP_MAX_STALENESS_SECONDS,
+)
+
+
+async def main() -> None:
+    try:
+        await refresh_skill_gap_matrix()
+    finally:
+        await shutdown_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
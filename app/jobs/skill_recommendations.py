@@ -0,0 +1,78 @@
+"""
+Offline computation of skill neighbours for GET /employees/v1/{employee_id}/recommended-skills.
+
+Reads the shared employee x skill matrix when the builder has published one (falls back to a
+fresh load from employee_skills), computes top-N co-occurrence neighbours per skill and replaces
+the skill_neighbours table in one transaction.
+
+Usage:
+    python -m app.jobs.skill_recommendations
+    python -m app.jobs.skill_recommendations --top-n 30 --rank 32   # add latent SVD similarity
+"""
+import argparse
+import asyncio
+
+from scipy.sparse import csr_matrix
+
+from app.common.logging import logger
+from app.database import session_maker
+from app.database import shutdown_db
+from app.ml.skill_matrix import build_skill_matrix_arrays
+from app.ml.skill_matrix import get_skill_matrix
+from app.ml.skill_recommender import top_neighbours
+from app.repositories.skill_recommendation_repository import (
+    SkillRecommendationRepository,
+)
+
+DEFAULT_TOP_N = 20
+
+
+async def compute_skill_neighbours(top_n: int = DEFAULT_TOP_N, rank: int = 0) -> int:
+    async with session_maker() as session:
+        matrix = get_skill_matrix()
+        if matrix is not None:
+            holdings = matrix.to_scipy()
+            skill_ids = matrix.skill_ids
+        else:
+            arrays = await build_skill_matrix_arrays(session)
+            skill_ids = arrays["skill_ids"]
+            holdings = csr_matrix(
+                (arrays["data"], arrays["indices"], arrays["indptr"]),
+                shape=(len(arrays["employee_ids"]), len(skill_ids)),
+            )
+
+        sources, neighbours, scores = top_neighbours(holdings, top_n, rank=rank)
+        rows = []
+        previous, position = -1, 0
+        for source, neighbour, score in zip(sources.tolist(), neighbours.tolist(), scores.tolist(), strict=True):
+            position = position + 1 if source == previous else 1
+            previous = source
+            rows.append({
+                "skill_id": int(skill_ids[source]),
+                "neighbour_skill_id": int(skill_ids[neighbour]),
+                "score": score,
+                "rank": position,
+            })
+
+        saved = await SkillRecommendationRepository(session).replace_neighbours(rows)
+        logger.info(f"Skill neighbours recomputed: {saved} pairs for {len(skill_ids)} skills")
+        return saved
+
+
+async def run(top_n: int, rank: int) -> None:
+    try:
+        await compute_skill_neighbours(top_n, rank)
+    finally:
+        await shutdown_db()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recompute skill_neighbours for skill recommendations")
+    parser.add_argument("--top-n", type=int, default=DEFAULT_TOP_N, help="Neighbours kept per skill")
+    parser.add_argument("--rank", type=int, default=0, help="Truncated SVD rank, 0 to disable")
+    args = parser.parse_args()
+    asyncio.run(run(args.top_n, args.rank))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+Full rebuild of skill_category_closure from skill_categories.parent_id.
+
+Run after bulk imports or manual edits of the category tree; regular moves through the API keep
+the closure table up to date on their own.
+
+Usage: python -m app.jobs.skill_taxonomy_rebuild
+"""
+import asyncio
+
+from app.common.logging import logger
+from app.database import session_maker
+from app.database import shutdown_db
+from app.repositories.skill_taxonomy_repository import SkillTaxonomyRepository
+from app.services.skill_taxonomy_service import SkillTaxonomyService
+
+
+async def rebuild_skill_taxonomy() -> int:
+    async with session_maker() as session:
+        rows = await SkillTaxonomyService(SkillTaxonomyRepository(session)).rebuild_closure()
+        logger.info(f"Skill category closure rebuilt: {rows} rows")
+        return rows
+
+
+async def main() -> None:
+    try:
+        await rebuild_skill_taxonomy()
+    finally:
+        await shutdown_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,35 +1,90 @@
-import aiohttp
 from fastapi import FastAPI
 
+from app.cache.employee_context import employee_context_cache
+from app.cache.response_cache import response_cache
+from app.cache.skill_catalog import skill_catalog
+from app.cache.skill_taxonomy import skill_taxonomy
+from app.clients.ai_consultant import create_ai_consultant_client
+from app.clients.http import http_client
+from app.common.config import settings
 from app.common.logging import logger
+from app.common.metrics_exporter import metrics_exporter
+from app.common.replicas import replica_set
+from app.common.slow_queries import slow_query_log
+from app.database import engine
 from app.database import initialize_db
 from app.database import shutdown_db
+from app.events.live_events import live_events
+from app.events.pg_notify import pg_listener
+from app.jobs.skill_gap_refresh import skill_gap_refresher
+from app.lifecycle.db_warmup import warm_up_pool
 
 
 class AppLifecycle:
     def __init__(self, app: FastAPI):
         self.app = app
-        self.aiohttp_session = None
+        self.ai_consultant = None
 
     async def on_startup(self):
         logger.info("Starting up application...")
+        metrics_exporter.start()
         await initialize_db()
+        if settings.DB_WARMUP:
+            await warm_up_pool(engine, settings.DB_POOL_SIZE)
+        await replica_set.start()
+        await self._initialize_http_clients()
+        skill_gap_refresher.start()
+        await self._initialize_skill_catalog()
+        await self._initialize_skill_taxonomy()
+        employee_context_cache.attach(pg_listener)
+        live_events.attach(pg_listener)
+        pg_listener.start()
         logger.info(
             "Application startup complete. Ready to serve requests."
         )
 
     async def on_shutdown(self):
         logger.info("Shutting down application...")
+        await skill_gap_refresher.stop()
+        await pg_listener.stop()
+        await skill_catalog.stop()
+        await skill_taxonomy.stop()
+        await self._close_http_clients()
+        await response_cache.close()
+        await slow_query_log.stop()
+        await replica_set.stop()
         await shutdown_db()
+        await metrics_exporter.stop()
         logger.info("Application shutdown complete.")
 
-    async def _initialize_aiohttp(self):
-        self.aiohttp_session = aiohttp.ClientSession()
-        self.app.state.aiohttp_session = self.aiohttp_session
+    async def _initialize_skill_catalog(self):
+        skill_catalog.attach(pg_listener)
+        try:
+            await skill_catalog.load()
+        except Exception as e:
+            # requests fall back to the database until the periodic reload succeeds
+            logger.error(f"Failed to load skill catalog: {e}", exc_info=True)
+        skill_catalog.start()
+
+    async def _initialize_skill_taxonomy(self):
+        skill_taxonomy.attach(pg_listener)
+        try:
+            await skill_taxonomy.load()
+        except Exception as e:
+            # category expansion falls back to the closure table until the periodic reload succeeds
+            logger.error(f"Failed to load skill taxonomy: {e}", exc_info=True)
+        skill_taxonomy.start()
+
+    async def _initialize_http_clients(self):
+        await http_client.start()
+        self.app.state.aiohttp_session = http_client.session
+        self.ai_consultant = create_ai_consultant_client(http_client)
+        self.app.state.ai_consultant = self.ai_consultant
 
-    async def _close_aiohttp_session(self):
+    async def _close_http_clients(self):
         try:
-            if self.aiohttp_session and not self.aiohttp_session.closed:
-                await self.aiohttp_session.close()
+            if self.ai_consultant is not None:
+                await self.ai_consultant.close()
+            await http_client.close()
         except Exception as e:
-            logger.error(f"Error closing aiohttp session: {e}", exc_info=True)
+            logger.error(f"Error closing outbound HTTP client: {e}", exc_info=True)
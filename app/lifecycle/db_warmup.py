@@ -0,0 +1,59 @@
+"""
+Warm-up of the database pool at startup.
+
+pool_size connections are opened together and every one runs the hot read statements once, with
+an employee id that matches nothing. asyncpg keeps the prepared statement per connection (keyed by
+the SQL text, DB_STATEMENT_CACHE_SIZE of them) and SQLAlchemy caches the compiled SQL, so the first
+requests after a deploy skip both the parse/plan round trip and the compilation.
+"""
+import asyncio
+from typing import Awaitable
+from typing import Callable
+from typing import List
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.common.logging import logger
+from app.repositories.department_stats_repository import DepartmentStatsRepository
+from app.repositories.employee_context_repository import EmployeeContextRepository
+from app.repositories.employee_skill_repository import EmployeeSkillRepository
+from app.repositories.quest_repository import QuestRepository
+
+NO_EMPLOYEE = 0
+
+HOT_STATEMENTS: List[Callable[[AsyncSession], Awaitable[object]]] = [
+    lambda session: EmployeeContextRepository(session).get_context_json(NO_EMPLOYEE),
+    lambda session: QuestRepository(session).get_employee_quests(NO_EMPLOYEE),
+    lambda session: QuestRepository(session).get_all_quests(),
+    lambda session: EmployeeSkillRepository(session).get_employee_skills(NO_EMPLOYEE),
+    lambda session: DepartmentStatsRepository(session).get_all(),
+]
+
+
+async def _warm_connection(engine: AsyncEngine, ready: asyncio.Barrier) -> None:
+    try:
+        async with engine.connect() as connection:
+            # hold the connection until all are open, otherwise the pool hands out the same one again
+            await ready.wait()
+            async with AsyncSession(bind=connection) as session:
+                for statement in HOT_STATEMENTS:
+                    await statement(session)
+            await connection.rollback()
+    except BaseException:
+        # the other connections would wait for this one forever
+        await ready.abort()
+        raise
+
+
+async def warm_up_pool(engine: AsyncEngine, connections: int) -> None:
+    ready = asyncio.Barrier(connections)
+    results = await asyncio.gather(
+        *(_warm_connection(engine, ready) for _ in range(connections)), return_exceptions=True
+    )
+    failed = [result for result in results if isinstance(result, BaseException)]
+    if failed:
+        # not fatal, those connections prepare the statements on first use
+        logger.warning(f"Database warm-up failed on {len(failed)} of {connections} connections: {failed[0]}")
+    else:
+        logger.info(f"Database pool warmed up: {connections} connections, {len(HOT_STATEMENTS)} statements each")
@@ -1,11 +1,23 @@
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi import Response
 
+from app.common.config import settings
+from app.common.metrics_exporter import metrics_exporter
+from app.common.replicas import replica_set
 from app.lifecycle.app_lifecycle import AppLifecycle
+from app.middleware.replica_consistency import ReplicaConsistencyMiddleware
+from app.middleware.request_metrics import RequestMetricsMiddleware
+from app.middleware.sql_stats import SqlStatsMiddleware
+from app.routers.v1 import admin_router
+from app.routers.v1 import analytics_router
+from app.routers.v1 import department_router
 from app.routers.v1 import employee_router
 from app.routers.v1 import employee_skill_router
+from app.routers.v1 import event_router
 from app.routers.v1 import quest_router
+from app.routers.v1 import skill_category_router
 from app.routers.v1 import skill_router
 
 
@@ -26,13 +38,33 @@ def create_app() -> FastAPI:
         openapi_url="/openapi.json",
         lifespan=lifespan,
     )
+    application.add_middleware(ReplicaConsistencyMiddleware, replicas=replica_set)
+    application.add_middleware(
+        SqlStatsMiddleware,
+        debug_headers=settings.DEBUG,
+        n_plus_one_threshold=settings.SQL_N_PLUS_ONE_THRESHOLD,
+    )
+    # added last, so it is the outermost and times the other middleware too
+    application.add_middleware(RequestMetricsMiddleware)
 
     return application
 
 
 app = create_app()
 
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Prometheus text exposition, of all workers when METRICS_MULTIPROC_DIR is set"""
+    return Response(metrics_exporter.render(), media_type="text/plain; version=0.0.4")
+
+
 app.include_router(skill_router.router)
 app.include_router(employee_router.router)
 app.include_router(employee_skill_router.router)
 app.include_router(quest_router.router)
+app.include_router(analytics_router.router)
+app.include_router(department_router.router)
+app.include_router(skill_category_router.router)
+app.include_router(event_router.router)
+app.include_router(admin_router.router)
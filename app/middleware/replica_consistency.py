@@ -0,0 +1,62 @@
+from typing import Optional
+
+from starlette.datastructures import Headers
+from starlette.datastructures import MutableHeaders
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp
+from starlette.types import Message
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
+
+from app.common.replicas import ReplicaSet
+from app.common.replicas import format_lsn
+from app.common.replicas import parse_lsn
+from app.common.replicas import track_read_position
+
+POSITION_COOKIE = "db_lsn"
+POSITION_HEADER = "X-DB-Min-LSN"
+WRITE_POSITION_HEADER = "X-DB-Write-LSN"
+
+
+class ReplicaConsistencyMiddleware:
+    """
+    Read-your-writes across workers with DB_REPLICA_LSN_CHECK: the WAL position of a client's last
+    write travels with the client (db_lsn cookie, or X-DB-Write-LSN echoed as X-DB-Min-LSN) and
+    replicas behind it are skipped for that client's reads
+    """
+
+    def __init__(self, app: ASGIApp, replicas: ReplicaSet):
+        self.app = app
+        self.replicas = replicas
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not (self.replicas.enabled and self.replicas.lsn_check):
+            await self.app(scope, receive, send)
+            return
+
+        with track_read_position(self._required(Headers(scope=scope))) as position:
+            async def send_with_position(message: Message) -> None:
+                if message["type"] == "http.response.start" and position.written:
+                    value = format_lsn(position.written)
+                    headers = MutableHeaders(scope=message)
+                    headers[WRITE_POSITION_HEADER] = value
+                    headers.append(
+                        "Set-Cookie",
+                        f"{POSITION_COOKIE}={value}; Max-Age={self.replicas.position_ttl}; Path=/; HttpOnly; SameSite=Lax",
+                    )
+                await send(message)
+
+            await self.app(scope, receive, send_with_position)
+
+    @staticmethod
+    def _required(headers: Headers) -> Optional[int]:
+        values = [headers.get(POSITION_HEADER), cookie_parser(headers.get("cookie", "")).get(POSITION_COOKIE)]
+        positions = []
+        for value in values:
+            try:
+                positions.append(parse_lsn(value))
+            except ValueError:
+                # a malformed position is ignored, the client then reads like one that never wrote
+                continue
+        return max((position for position in positions if position is not None), default=None)
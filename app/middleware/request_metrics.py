@@ -0,0 +1,51 @@
+import time
+
+from starlette.types import ASGIApp
+from starlette.types import Message
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
+
+from app.common.metrics import registry
+
+REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds", "Time to handle a request, until the response has been sent", ("method", "route")
+)
+REQUESTS = registry.counter("http_requests", "Handled requests", ("method", "route", "status"))
+IN_PROGRESS = registry.gauge("http_requests_in_progress", "Requests being handled")
+
+
+def route_name(scope: Scope) -> str:
+    """Path template of the matched route, so that metrics are not labelled by ids"""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class RequestMetricsMiddleware:
+    """Latency histogram and status counter per route, a closure and two dict updates per request"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        IN_PROGRESS.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            IN_PROGRESS.dec()
+            route = route_name(scope)
+            REQUEST_DURATION.observe(time.perf_counter() - started, method=scope["method"], route=route)
+            REQUESTS.inc(method=scope["method"], route=route, status=str(status_code))
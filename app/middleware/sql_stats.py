@@ -0,0 +1,83 @@
+from typing import Set
+from typing import Tuple
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp
+from starlette.types import Message
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
+
+from app.common.logging import logger
+from app.common.metrics import registry
+from app.common.sql_stats import SqlStats
+from app.common.sql_stats import compact
+from app.common.sql_stats import track_sql
+from app.middleware.request_metrics import route_name
+
+REQUEST_STATEMENTS = registry.histogram(
+    "db_statements_per_request",
+    "SQL statements executed while handling a request",
+    ("route",),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250),
+)
+REQUEST_DB_TIME = registry.histogram(
+    "db_time_per_request_seconds", "Time spent in SQL statements while handling a request", ("route",)
+)
+N_PLUS_ONE = registry.counter(
+    "db_n_plus_one_requests", "Requests that repeated one statement shape at least SQL_N_PLUS_ONE_THRESHOLD times",
+    ("route",),
+)
+
+# each (route, statement) pattern is logged once per worker, the counter keeps counting
+_MAX_REPORTED = 1000
+
+
+class SqlStatsMiddleware:
+    """Counts and times SQL per request; with debug_headers adds X-DB-* headers to the response"""
+
+    def __init__(self, app: ASGIApp, debug_headers: bool = False, n_plus_one_threshold: int = 10):
+        self.app = app
+        self.debug_headers = debug_headers
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self._reported: Set[Tuple[str, str]] = set()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_sql() as stats:
+            async def send_with_headers(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers["X-DB-Queries"] = str(stats.count)
+                    headers["X-DB-Time-Ms"] = f"{stats.duration * 1000:.1f}"
+                    repeated = stats.repeated(2)
+                    headers["X-DB-Max-Repeats"] = str(repeated[0][1] if repeated else min(stats.count, 1))
+                    headers["X-DB-Replica-Reads"] = str(stats.replica_reads)
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_headers if self.debug_headers else send)
+            finally:
+                self._report(scope, stats)
+
+    def _report(self, scope: Scope, stats: SqlStats) -> None:
+        route = route_name(scope)
+        REQUEST_STATEMENTS.observe(stats.count, route=route)
+        if not stats.count:
+            return
+        REQUEST_DB_TIME.observe(stats.duration, route=route)
+        repeated = stats.repeated(self.n_plus_one_threshold)
+        if not repeated:
+            return
+        N_PLUS_ONE.inc(route=route)
+        statement, count = repeated[0]
+        key = (route, statement)
+        if key not in self._reported and len(self._reported) < _MAX_REPORTED:
+            self._reported.add(key)
+            logger.warning(
+                f"Possible N+1 in {scope['method']} {route}: {count} x {compact(statement, 300)} "
+                f"({stats.count} statements in the request)"
+            )
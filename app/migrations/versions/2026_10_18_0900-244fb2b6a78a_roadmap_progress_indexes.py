@@ -0,0 +1,31 @@
+"""Roadmap progress indexes
+
+Revision ID: 244fb2b6a78a
+Revises: 827e2f10be5c
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence
+from typing import Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '244fb2b6a78a'
+down_revision: Union[str, Sequence[str], None] = '827e2f10be5c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_employee_roadmaps_employee_id'), 'employee_roadmaps', ['employee_id'], unique=False)
+    op.create_index(op.f('ix_roadmap_quests_roadmap_id'), 'roadmap_quests', ['roadmap_id'], unique=False)
+    op.create_index(op.f('ix_roadmap_required_skills_roadmap_id'), 'roadmap_required_skills', ['roadmap_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_roadmap_required_skills_roadmap_id'), table_name='roadmap_required_skills')
+    op.drop_index(op.f('ix_roadmap_quests_roadmap_id'), table_name='roadmap_quests')
+    op.drop_index(op.f('ix_employee_roadmaps_employee_id'), table_name='employee_roadmaps')
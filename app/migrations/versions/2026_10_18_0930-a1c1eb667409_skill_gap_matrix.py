@@ -0,0 +1,104 @@
+"""Skill gap matrix materialized view
+
+Revision ID: a1c1eb667409
+Revises: 244fb2b6a78a
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from typing import Sequence
+from typing import Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1c1eb667409'
+down_revision: Union[str, Sequence[str], None] = '244fb2b6a78a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # grouping_level: 0 - department x skill, 1 - department, 2 - skill, 3 - organization total
+    op.execute("""
+        CREATE MATERIALIZED VIEW skill_gap_matrix AS
+        WITH staff AS (
+            SELECT id AS employee_id, COALESCE(department, 'unassigned') AS department
+            FROM employees
+        ),
+        requirements AS (
+            SELECT employee_id, skill_id, MAX(required_level) AS required_level
+            FROM (
+                SELECT er.employee_id, rrs.skill_id, rrs.required_level
+                FROM employee_roadmaps er
+                JOIN career_roadmaps cr ON cr.id = er.roadmap_id AND cr.is_active IS NOT FALSE
+                JOIN roadmap_required_skills rrs ON rrs.roadmap_id = er.roadmap_id
+                WHERE er.is_completed IS NOT TRUE
+                UNION ALL
+                SELECT pt.employee_id, prs.skill_id, COALESCE(prs.required_level, 1)
+                FROM project_teams pt
+                JOIN projects p ON p.id = pt.project_id AND p.status = 'active'
+                JOIN project_required_skills prs ON prs.project_id = pt.project_id
+            ) AS all_requirements
+            GROUP BY employee_id, skill_id
+        ),
+        cells AS (
+            SELECT
+                COALESCE(es.employee_id, rq.employee_id) AS employee_id,
+                COALESCE(es.skill_id, rq.skill_id) AS skill_id,
+                es.proficiency_level,
+                rq.required_level
+            FROM employee_skills es
+            FULL OUTER JOIN requirements rq
+                ON rq.employee_id = es.employee_id AND rq.skill_id = es.skill_id
+        ),
+        headcount AS (
+            SELECT department, COUNT(*) AS headcount
+            FROM staff
+            GROUP BY ROLLUP (department)
+        ),
+        aggregated AS (
+            SELECT
+                GROUPING(s.department, c.skill_id) AS grouping_level,
+                s.department,
+                c.skill_id,
+                COUNT(c.proficiency_level) AS holders,
+                AVG(c.proficiency_level)::float AS avg_proficiency,
+                COUNT(c.required_level) AS required_count,
+                COUNT(*) FILTER (
+                    WHERE c.required_level IS NOT NULL
+                    AND COALESCE(c.proficiency_level, 0) >= c.required_level
+                ) AS met_count,
+                AVG(c.required_level)::float AS avg_required_level
+            FROM cells c
+            JOIN staff s ON s.employee_id = c.employee_id
+            GROUP BY GROUPING SETS ((s.department, c.skill_id), (s.department), (c.skill_id), ())
+        )
+        SELECT
+            a.grouping_level,
+            COALESCE(a.department, '*') AS department_key,
+            COALESCE(a.skill_id, 0) AS skill_key,
+            a.department,
+            a.skill_id,
+            COALESCE(h.headcount, 0) AS headcount,
+            a.holders,
+            a.avg_proficiency,
+            a.required_count,
+            a.met_count,
+            a.met_count::float / NULLIF(a.required_count, 0) AS coverage,
+            a.avg_required_level,
+            now() AS refreshed_at
+        FROM aggregated a
+        LEFT JOIN headcount h ON h.department IS NOT DISTINCT FROM a.department
+        WITH DATA
+    """)
+    # REFRESH ... CONCURRENTLY requires a plain unique index covering all rows
+    op.execute("""
+        CREATE UNIQUE INDEX ux_skill_gap_matrix_key
+        ON skill_gap_matrix (grouping_level, department_key, skill_key)
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS skill_gap_matrix")
@@ -0,0 +1,39 @@
+"""Department stats read model
+
+Revision ID: 55a245127696
+Revises: a1c1eb667409
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '55a245127696'
+down_revision: Union[str, Sequence[str], None] = 'a1c1eb667409'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('department_stats',
+    sa.Column('department', sa.String(), nullable=False, comment="Department name ('unassigned' for employees without a department)"),
+    sa.Column('headcount', sa.Integer(), server_default='0', nullable=False, comment='Number of employees'),
+    sa.Column('rating_sum', sa.Float(), server_default='0', nullable=False, comment='Sum of employee ratings'),
+    sa.Column('total_xp_sum', sa.BigInteger(), server_default='0', nullable=False, comment='Sum of employee total_xp'),
+    sa.Column('quests_assigned', sa.Integer(), server_default='0', nullable=False, comment='Quests assigned to employees'),
+    sa.Column('quests_completed', sa.Integer(), server_default='0', nullable=False, comment='Quests completed by employees'),
+    sa.Column('level_distribution', postgresql.JSONB(astext_type=sa.Text()), server_default='{}', nullable=False, comment="Employee count per level id ('none' for employees without a level)"),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=False, comment='Date and time when the stats were last updated'),
+    sa.PrimaryKeyConstraint('department')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('department_stats')
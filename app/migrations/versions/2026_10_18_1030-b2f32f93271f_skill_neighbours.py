@@ -0,0 +1,36 @@
+"""Skill neighbours for recommendations
+
+Revision ID: b2f32f93271f
+Revises: 55a245127696
+Create Date: 2026-10-18 10:30:00.000000
+
+"""
+from typing import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2f32f93271f'
+down_revision: Union[str, Sequence[str], None] = '55a245127696'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('skill_neighbours',
+    sa.Column('skill_id', sa.BigInteger(), nullable=False, comment='ID of the source skill'),
+    sa.Column('neighbour_skill_id', sa.BigInteger(), nullable=False, comment='ID of the similar skill'),
+    sa.Column('score', sa.Float(), nullable=False, comment='Similarity score (0-1)'),
+    sa.Column('rank', sa.Integer(), nullable=False, comment="Position of the neighbour in the source skill's list, starting at 1"),
+    sa.ForeignKeyConstraint(['neighbour_skill_id'], ['skills.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['skill_id'], ['skills.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('skill_id', 'neighbour_skill_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('skill_neighbours')
@@ -0,0 +1,57 @@
+"""Skill taxonomy with closure table
+
+Revision ID: 6d0c8e41f7a3
+Revises: b2f32f93271f
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '6d0c8e41f7a3'
+down_revision: Union[str, Sequence[str], None] = 'b2f32f93271f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('skill_categories',
+    sa.Column('id', sa.BigInteger(), nullable=False, comment='Unique identifier of the category'),
+    sa.Column('name', sa.String(), nullable=False, comment='Name of the category'),
+    sa.Column('parent_id', sa.BigInteger(), nullable=True, comment='Parent category, NULL for roots'),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=True, comment='Date and time when the category was created'),
+    sa.ForeignKeyConstraint(['parent_id'], ['skill_categories.id'], ondelete='RESTRICT'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_index(op.f('ix_skill_categories_id'), 'skill_categories', ['id'], unique=False)
+    op.create_index(op.f('ix_skill_categories_parent_id'), 'skill_categories', ['parent_id'], unique=False)
+    op.create_table('skill_category_closure',
+    sa.Column('ancestor_id', sa.BigInteger(), nullable=False, comment='Ancestor category'),
+    sa.Column('descendant_id', sa.BigInteger(), nullable=False, comment='Descendant category'),
+    sa.Column('depth', sa.Integer(), nullable=False, comment='Distance between the categories, 0 for the self row'),
+    sa.ForeignKeyConstraint(['ancestor_id'], ['skill_categories.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['descendant_id'], ['skill_categories.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('ancestor_id', 'descendant_id')
+    )
+    op.create_index(op.f('ix_skill_category_closure_descendant_id'), 'skill_category_closure', ['descendant_id'], unique=False)
+    op.add_column('skills', sa.Column('category_id', sa.BigInteger(), nullable=True, comment='Taxonomy category of the skill'))
+    op.create_index(op.f('ix_skills_category_id'), 'skills', ['category_id'], unique=False)
+    op.create_foreign_key('skills_category_id_fkey', 'skills', 'skill_categories', ['category_id'], ['id'], ondelete='SET NULL')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('skills_category_id_fkey', 'skills', type_='foreignkey')
+    op.drop_index(op.f('ix_skills_category_id'), table_name='skills')
+    op.drop_column('skills', 'category_id')
+    op.drop_index(op.f('ix_skill_category_closure_descendant_id'), table_name='skill_category_closure')
+    op.drop_table('skill_category_closure')
+    op.drop_index(op.f('ix_skill_categories_parent_id'), table_name='skill_categories')
+    op.drop_index(op.f('ix_skill_categories_id'), table_name='skill_categories')
+    op.drop_table('skill_categories')
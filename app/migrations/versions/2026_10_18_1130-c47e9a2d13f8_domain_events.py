@@ -0,0 +1,68 @@
+"""Domain event store and replay checkpoints
+
+Revision ID: c47e9a2d13f8
+Revises: 6d0c8e41f7a3
+Create Date: 2026-10-18 11:30:00.000000
+
+"""
+from typing import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c47e9a2d13f8'
+down_revision: Union[str, Sequence[str], None] = '6d0c8e41f7a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARTITIONS = 16
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE SEQUENCE domain_events_id_seq")
+    op.create_table('domain_events',
+    sa.Column('employee_id', sa.BigInteger(), nullable=False, comment='Employee the event belongs to (no foreign key, the log outlives deleted employees)'),
+    sa.Column('id', sa.BigInteger(), server_default=sa.text("nextval('domain_events_id_seq')"), nullable=False, comment='Global event order'),
+    sa.Column('action_type', sa.String(length=50), nullable=False, comment='Quest action type, or quest_assigned / quest_progress_imported'),
+    sa.Column('count', sa.Integer(), server_default='1', nullable=False, comment='Progress added by the event'),
+    sa.Column('quest_id', sa.BigInteger(), nullable=True, comment='Target quest of quest_assigned and quest_progress_imported events'),
+    sa.Column('occurred_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=False, comment='Date and time when the event was recorded'),
+    sa.PrimaryKeyConstraint('employee_id', 'id'),
+    postgresql_partition_by='HASH (employee_id)'
+    )
+    op.execute("ALTER SEQUENCE domain_events_id_seq OWNED BY domain_events.id")
+    for remainder in range(PARTITIONS):
+        op.execute(
+            f"CREATE TABLE domain_events_p{remainder} PARTITION OF domain_events "
+            f"FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {remainder})"
+        )
+    op.create_table('event_replay_checkpoints',
+    sa.Column('partition', sa.Integer(), nullable=False, comment='Partition number of domain_events'),
+    sa.Column('last_employee_id', sa.BigInteger(), nullable=False, comment='Employees up to this id are rebuilt'),
+    sa.Column('events_replayed', sa.BigInteger(), server_default='0', nullable=False, comment='Events replayed in this partition so far'),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=True, comment='Date and time of the last checkpoint'),
+    sa.PrimaryKeyConstraint('partition')
+    )
+    # quest state from before the event store: an assignment and a snapshot of the progress per quest,
+    # so that a replay reproduces it
+    op.execute(
+        """
+        INSERT INTO domain_events (employee_id, action_type, count, quest_id, occurred_at)
+        SELECT eq.employee_id, kind.action_type, kind.count, eq.quest_id, coalesce(eq.created_at, now())
+        FROM employee_quests eq
+        CROSS JOIN LATERAL (
+            VALUES ('quest_assigned', 1, 0), ('quest_progress_imported', coalesce(eq.current_count, 0), 1)
+        ) AS kind(action_type, count, position)
+        WHERE kind.action_type = 'quest_assigned' OR coalesce(eq.current_count, 0) > 0
+        ORDER BY eq.employee_id, eq.id, kind.position
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('event_replay_checkpoints')
+    op.drop_table('domain_events')
@@ -0,0 +1,27 @@
+"""Index on employees.updated_at for the incremental analytics snapshot
+
+Revision ID: e5b91c3f7a20
+Revises: c47e9a2d13f8
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence
+from typing import Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b91c3f7a20'
+down_revision: Union[str, Sequence[str], None] = 'c47e9a2d13f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_employees_updated_at'), 'employees', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_employees_updated_at'), table_name='employees')
@@ -0,0 +1,38 @@
+"""Completion time of employee quests, counted by the periodic leaderboards
+
+Existing completed rows keep NULL; app.jobs.event_replay fills them from domain_events.
+
+Revision ID: 9a3f6c2d1e84
+Revises: e5b91c3f7a20
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '9a3f6c2d1e84'
+down_revision: Union[str, Sequence[str], None] = 'e5b91c3f7a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'employee_quests',
+        sa.Column(
+            'completed_at',
+            sa.TIMESTAMP(),
+            nullable=True,
+            comment='Date and time when the quest was completed, NULL while in progress',
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('employee_quests', 'completed_at')
@@ -0,0 +1,246 @@
+"""
+Nearest-neighbour search over employee skill vectors (cosine over proficiency levels).
+
+ExactIndex scores queries against every employee with one sparse matrix product per batch.
+LSHIndex narrows candidates to employees sharing a random-hyperplane bucket with the query in
+any of several tables and re-ranks them exactly. The LSH bundle is published next to the skill
+matrix by python -m app.jobs.build_skill_matrix --lsh and rebuilt incrementally: hyperplanes
+are fixed per skill id and signatures are only recomputed for employees whose skills changed.
+"""
+from typing import Any
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse import diags
+
+from app.common.config import settings
+from app.ml.mmap_store import BundleHandle
+from app.ml.mmap_store import MappedBundle
+from app.ml.mmap_store import write_bundle
+from app.ml.skill_matrix import SkillMatrix
+from app.ml.skill_matrix import get_skill_matrix
+
+LSH_BUNDLE_NAME = "employee_lsh"
+SEARCH_BATCH_SIZE = 256
+LSH_TABLES = 12
+LSH_BITS = 10
+LSH_SEED = 32
+
+_FINGERPRINT_PRIME = np.uint64(0x9E3779B97F4A7C15)
+
+
+def normalize_rows(holdings: csr_matrix) -> csr_matrix:
+    """L2-normalised float32 copy, all-zero rows stay zero"""
+    holdings = holdings.astype(np.float32)
+    norms = np.sqrt(np.asarray(holdings.multiply(holdings).sum(axis=1)).ravel())
+    inverse = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+    return (diags(inverse.astype(np.float32)) @ holdings).tocsr()
+
+
+def _top_k(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    k = min(k, scores.shape[1])
+    if k < 1:
+        empty = np.empty((scores.shape[0], 0))
+        return empty.astype(np.int64), empty.astype(np.float32)
+    candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    order = np.argsort(-candidate_scores, axis=1, kind="stable")
+    return np.take_along_axis(candidates, order, axis=1), np.take_along_axis(candidate_scores, order, axis=1)
+
+
+class ExactIndex:
+    """Brute-force cosine kNN over row-normalised vectors, rows are positions in the skill matrix"""
+
+    def __init__(self, vectors: csr_matrix, transposed: csr_matrix):
+        self.vectors = vectors
+        self._transposed = transposed
+
+    @classmethod
+    def from_holdings(cls, holdings: csr_matrix) -> "ExactIndex":
+        """Private normalised copies, for matrices that are not a published bundle"""
+        vectors = normalize_rows(holdings)
+        return cls(vectors, vectors.T.tocsr())
+
+    def search(self, rows: np.ndarray, k: int,
+               batch_size: int = SEARCH_BATCH_SIZE) -> Tuple[np.ndarray, np.ndarray]:
+        """Top-k rows and scores for every query row, the query itself excluded"""
+        rows = np.asarray(rows, dtype=np.int64)
+        found, found_scores = [], []
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            scores = (self.vectors[batch] @ self._transposed).toarray()
+            scores[np.arange(len(batch)), batch] = -np.inf
+            indices, values = _top_k(scores, k)
+            found.append(indices)
+            found_scores.append(values)
+        if not found:
+            return np.empty((0, 0), dtype=np.int64), np.empty((0, 0), dtype=np.float32)
+        return np.vstack(found), np.vstack(found_scores)
+
+    def rerank(self, row: int, candidates: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        candidates = candidates[candidates != row]
+        if len(candidates) == 0:
+            return candidates.astype(np.int64), np.empty(0, dtype=np.float32)
+        scores = (self.vectors[candidates] @ self.vectors[row].T).toarray().ravel()
+        indices, values = _top_k(scores[None, :], k)
+        return candidates[indices[0]], values[0]
+
+
+def row_fingerprints(holdings: csr_matrix, skill_ids: np.ndarray) -> np.ndarray:
+    """Order-independent 64-bit hash of every row's (skill_id, level) pairs"""
+    with np.errstate(over="ignore"):
+        pairs = skill_ids[holdings.indices].astype(np.uint64) * _FINGERPRINT_PRIME
+        pairs ^= holdings.data.astype(np.uint64) + np.uint64(1)
+        pairs *= _FINGERPRINT_PRIME
+        pairs ^= pairs >> np.uint64(29)
+        fingerprints = np.zeros(holdings.shape[0], dtype=np.uint64)
+        non_empty = np.diff(holdings.indptr) > 0
+        if len(pairs):
+            fingerprints[non_empty] = np.add.reduceat(pairs, holdings.indptr[:-1][non_empty])
+    return fingerprints
+
+
+def _hyperplanes(skill_ids: np.ndarray, n_planes: int, seed: int,
+                 previous: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> np.ndarray:
+    """One random column per skill id, derived from (seed, skill_id) so it never changes"""
+    planes = np.empty((n_planes, len(skill_ids)), dtype=np.float32)
+    missing = np.ones(len(skill_ids), dtype=bool)
+    if previous is not None and len(previous[0]):
+        previous_ids, previous_planes = previous
+        position = np.clip(np.searchsorted(previous_ids, skill_ids), 0, len(previous_ids) - 1)
+        known = previous_ids[position] == skill_ids
+        planes[:, known] = previous_planes[:, position[known]]
+        missing = ~known
+    for column in np.flatnonzero(missing):
+        rng = np.random.default_rng([seed, int(skill_ids[column])])
+        planes[:, column] = rng.standard_normal(n_planes, dtype=np.float32)
+    return planes
+
+
+def _signatures(holdings: csr_matrix, planes: np.ndarray, n_tables: int, n_bits: int) -> np.ndarray:
+    bits = np.asarray(holdings @ planes.T) > 0
+    weights = np.left_shift(np.int64(1), np.arange(n_bits, dtype=np.int64))
+    return bits.reshape(-1, n_tables, n_bits).astype(np.int64) @ weights
+
+
+def build_lsh_arrays(holdings: csr_matrix, employee_ids: np.ndarray, skill_ids: np.ndarray,
+                     previous: Optional["LSHIndex"] = None, n_tables: int = LSH_TABLES,
+                     n_bits: int = LSH_BITS, seed: int = LSH_SEED) -> Tuple[Dict[str, np.ndarray], int]:
+    """
+    Arrays of a new LSH index and the number of employees whose signatures were recomputed.
+    A previous index with the same parameters donates hyperplanes and unchanged signatures.
+    """
+    if previous is not None and (previous.n_tables, previous.n_bits, previous.seed) != (n_tables, n_bits, seed):
+        previous = None
+
+    planes = _hyperplanes(
+        skill_ids, n_tables * n_bits, seed,
+        (previous.skill_ids, previous.planes) if previous is not None else None,
+    )
+    fingerprints = row_fingerprints(holdings, skill_ids)
+    codes = np.empty((len(employee_ids), n_tables), dtype=np.int64)
+    stale = np.ones(len(employee_ids), dtype=bool)
+    if previous is not None and len(previous.employee_ids):
+        position = np.clip(np.searchsorted(previous.employee_ids, employee_ids), 0, len(previous.employee_ids) - 1)
+        unchanged = (previous.employee_ids[position] == employee_ids) & (previous.fingerprints[position] == fingerprints)
+        codes[unchanged] = previous.codes[position[unchanged]]
+        stale = ~unchanged
+    if stale.any():
+        codes[stale] = _signatures(holdings[np.flatnonzero(stale)], planes, n_tables, n_bits)
+
+    orders = np.argsort(codes.T, axis=1, kind="stable").astype(np.int32)
+    arrays = {
+        "employee_ids": np.asarray(employee_ids, dtype=np.int64),
+        "skill_ids": np.asarray(skill_ids, dtype=np.int64),
+        "fingerprints": fingerprints,
+        "planes": planes,
+        "codes": codes,
+        "orders": orders,
+        "sorted_codes": np.take_along_axis(codes.T, orders.astype(np.int64), axis=1),
+    }
+    return arrays, int(stale.sum())
+
+
+class LSHIndex:
+    """Random-hyperplane LSH over the rows of one skill matrix version"""
+
+    def __init__(self, arrays: Dict[str, np.ndarray], meta: Dict[str, Any]):
+        self.matrix_version: Optional[int] = meta.get("matrix_version")
+        self.n_tables: int = meta["n_tables"]
+        self.n_bits: int = meta["n_bits"]
+        self.seed: int = meta["seed"]
+        self.employee_ids = arrays["employee_ids"]
+        self.skill_ids = arrays["skill_ids"]
+        self.fingerprints = arrays["fingerprints"]
+        self.planes = arrays["planes"]
+        self.codes = arrays["codes"]
+        self.orders = arrays["orders"]
+        self.sorted_codes = arrays["sorted_codes"]
+
+    def candidates(self, row: int, probe: bool = True) -> np.ndarray:
+        """Rows sharing a bucket with `row` in any table, plus buckets one bit away when probing"""
+        flips = np.left_shift(np.int64(1), np.arange(self.n_bits, dtype=np.int64))
+        found = []
+        for table in range(self.n_tables):
+            code = self.codes[row, table]
+            probes = np.concatenate(([code], code ^ flips)) if probe else np.array([code])
+            lower = np.searchsorted(self.sorted_codes[table], probes, side="left")
+            upper = np.searchsorted(self.sorted_codes[table], probes, side="right")
+            for start, end in zip(lower.tolist(), upper.tolist(), strict=True):
+                if end > start:
+                    found.append(self.orders[table, start:end])
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(found)).astype(np.int64)
+
+
+def publish_lsh_index(matrix: SkillMatrix, directory: Optional[str] = None) -> Tuple[str, int]:
+    """Build the LSH bundle for a published matrix, reusing the current bundle where possible"""
+    directory = directory or settings.SHARED_MATRIX_DIR
+    previous_bundle = BundleHandle(directory, LSH_BUNDLE_NAME).get()
+    previous = LSHIndex(previous_bundle.arrays, previous_bundle.meta) if previous_bundle else None
+    arrays, recomputed = build_lsh_arrays(matrix.to_scipy(), matrix.employee_ids, matrix.skill_ids, previous)
+    meta = {"matrix_version": matrix.version, "n_tables": LSH_TABLES, "n_bits": LSH_BITS, "seed": LSH_SEED}
+    return write_bundle(directory, LSH_BUNDLE_NAME, arrays, meta), recomputed
+
+
+class SimilarityIndex:
+    """Per-version search state of one worker"""
+
+    __slots__ = ("matrix", "exact", "lsh")
+
+    def __init__(self, matrix: SkillMatrix, lsh_bundle: Optional[MappedBundle]):
+        self.matrix = matrix
+        shared = matrix.cosine_vectors()
+        # a bundle from an older builder has no normalised arrays until the next rebuild
+        self.exact = ExactIndex(*shared) if shared is not None else ExactIndex.from_holdings(matrix.to_scipy())
+        self.lsh: Optional[LSHIndex] = None
+        if lsh_bundle is not None and lsh_bundle.meta.get("matrix_version") == matrix.version:
+            self.lsh = LSHIndex(lsh_bundle.arrays, lsh_bundle.meta)
+
+    def search(self, row: int, k: int, approximate: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """Top-k matrix rows similar to `row`; falls back to exact search without a matching LSH index"""
+        if approximate and self.lsh is not None:
+            return self.exact.rerank(row, self.lsh.candidates(row), k)
+        indices, scores = self.exact.search(np.array([row]), k)
+        return indices[0], scores[0]
+
+
+_lsh_handle = BundleHandle(settings.SHARED_MATRIX_DIR, LSH_BUNDLE_NAME)
+_index: Optional[SimilarityIndex] = None
+
+
+def get_similarity_index() -> Optional[SimilarityIndex]:
+    """Similarity index over the current shared matrix, None until the matrix is published"""
+    global _index
+    matrix = get_skill_matrix()
+    if matrix is None:
+        return None
+    lsh_bundle = _lsh_handle.get()
+    lsh_matches = lsh_bundle is not None and lsh_bundle.meta.get("matrix_version") == matrix.version
+    if _index is None or _index.matrix is not matrix or (_index.lsh is None and lsh_matches):
+        _index = SimilarityIndex(matrix, lsh_bundle)
+    return _index
@@ -0,0 +1,147 @@
+"""
+Versioned, memory-mapped array bundles shared between worker processes.
+
+A builder writes all arrays of a bundle into one file <name>.<version>.bin and then atomically
+repoints <name>.current at it. Workers map the file read-only, so every process shares the same
+page cache pages instead of holding a private copy, and switch to a newer version by swapping a
+single reference; readers still holding the old bundle keep a valid mapping until they drop it.
+
+File layout: 8-byte magic, little-endian uint64 header length, JSON header, arrays aligned to 64 bytes.
+"""
+import json
+import mmap
+import os
+import struct
+import time
+from typing import Any
+from typing import Dict
+from typing import Optional
+
+import numpy as np
+
+MAGIC = b"HRMMAP01"
+ALIGNMENT = 64
+KEEP_VERSIONS = 3
+
+
+def _pointer_path(directory: str, name: str) -> str:
+    return os.path.join(directory, f"{name}.current")
+
+
+def _aligned(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def write_bundle(directory: str, name: str, arrays: Dict[str, np.ndarray],
+                 meta: Optional[Dict[str, Any]] = None) -> str:
+    """Write a new version of the bundle and publish it. Returns the written file path."""
+    os.makedirs(directory, exist_ok=True)
+    version = time.time_ns()
+    arrays = {key: np.ascontiguousarray(value) for key, value in arrays.items()}
+
+    specs: Dict[str, Dict[str, Any]] = {}
+    offset = 0
+    for key, value in arrays.items():
+        specs[key] = {"dtype": value.dtype.str, "shape": list(value.shape), "offset": offset}
+        offset = _aligned(offset + value.nbytes)
+    header = json.dumps({"version": version, "meta": meta or {}, "arrays": specs}).encode()
+    data_start = _aligned(len(MAGIC) + 8 + len(header))
+
+    filename = f"{name}.{version}.bin"
+    path = os.path.join(directory, filename)
+    with open(f"{path}.tmp", "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        for key, value in arrays.items():
+            f.seek(data_start + specs[key]["offset"])
+            f.write(value.tobytes())
+        f.truncate(data_start + offset)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(f"{path}.tmp", path)
+
+    pointer = _pointer_path(directory, name)
+    with open(f"{pointer}.tmp", "w", encoding="utf-8") as f:
+        f.write(filename)
+    os.replace(f"{pointer}.tmp", pointer)
+
+    _remove_old_versions(directory, name, keep=filename)
+    return path
+
+
+def _remove_old_versions(directory: str, name: str, keep: str) -> None:
+    prefix = f"{name}."
+    versions = sorted(
+        entry for entry in os.listdir(directory)
+        if entry.startswith(prefix) and entry.endswith(".bin") and entry != keep
+    )
+    # mapped files stay readable for attached workers after unlink
+    for entry in versions[:max(0, len(versions) - (KEEP_VERSIONS - 1))]:
+        try:
+            os.remove(os.path.join(directory, entry))
+        except FileNotFoundError:
+            pass
+
+
+class MappedBundle:
+    """Read-only zero-copy view of one bundle version"""
+
+    __slots__ = ("path", "version", "meta", "arrays", "_mmap")
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not an array bundle")
+        (header_length,) = struct.unpack_from("<Q", self._mmap, len(MAGIC))
+        header_start = len(MAGIC) + 8
+        header = json.loads(self._mmap[header_start:header_start + header_length])
+        data_start = _aligned(header_start + header_length)
+
+        self.version: int = header["version"]
+        self.meta: Dict[str, Any] = header["meta"]
+        self.arrays: Dict[str, np.ndarray] = {}
+        for key, spec in header["arrays"].items():
+            dtype = np.dtype(spec["dtype"])
+            count = int(np.prod(spec["shape"])) if spec["shape"] else 1
+            array = np.frombuffer(self._mmap, dtype=dtype, count=count, offset=data_start + spec["offset"])
+            self.arrays[key] = array.reshape(spec["shape"])
+
+
+class BundleHandle:
+    """
+    Per-process handle that follows the published version of a bundle.
+    get() re-checks the pointer file at most every check_interval seconds.
+    """
+
+    def __init__(self, directory: str, name: str, check_interval: float = 5.0):
+        self.directory = directory
+        self.name = name
+        self.check_interval = check_interval
+        self._bundle: Optional[MappedBundle] = None
+        self._pointer_mtime: Optional[int] = None
+        self._checked_at = 0.0
+
+    def get(self) -> Optional[MappedBundle]:
+        now = time.monotonic()
+        if self._bundle is None or now - self._checked_at >= self.check_interval:
+            self._checked_at = now
+            self._refresh()
+        return self._bundle
+
+    def _refresh(self) -> None:
+        pointer = _pointer_path(self.directory, self.name)
+        try:
+            mtime = os.stat(pointer).st_mtime_ns
+            if mtime == self._pointer_mtime:
+                return
+            with open(pointer, encoding="utf-8") as f:
+                filename = f.read().strip()
+            bundle = MappedBundle(os.path.join(self.directory, filename))
+        except FileNotFoundError:
+            return
+        # a single reference assignment: in-flight readers keep the previous bundle
+        self._bundle = bundle
+        self._pointer_mtime = mtime
@@ -0,0 +1,157 @@
+"""
+Employee x skill proficiency matrix in CSR form, shared by all workers through a memory-mapped bundle.
+
+Build it with python -m app.jobs.build_skill_matrix; workers call get_skill_matrix(). The bundle
+also carries the row-normalised matrix and its transpose, so cosine search maps them instead of
+building a private copy in every worker.
+"""
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.common.config import settings
+from app.ml.mmap_store import BundleHandle
+from app.ml.mmap_store import MappedBundle
+from app.ml.mmap_store import write_bundle
+from app.models import EmployeeSkill
+from app.models import Skill
+
+BUNDLE_NAME = "skill_matrix"
+
+
+class SkillMatrix:
+    """
+    Rows are employees (sorted employee_ids), columns are skills (sorted skill_ids).
+    Arrays are read-only views over the shared mapping.
+    """
+
+    __slots__ = ("version", "indptr", "indices", "data", "employee_ids", "skill_ids", "_arrays")
+
+    def __init__(self, bundle: MappedBundle):
+        self.version = bundle.version
+        self.indptr = bundle.arrays["indptr"]
+        self.indices = bundle.arrays["indices"]
+        self.data = bundle.arrays["data"]
+        self.employee_ids = bundle.arrays["employee_ids"]
+        self.skill_ids = bundle.arrays["skill_ids"]
+        self._arrays = bundle.arrays
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self.employee_ids), len(self.skill_ids)
+
+    def row_index(self, employee_id: int) -> Optional[int]:
+        position = int(np.searchsorted(self.employee_ids, employee_id))
+        if position < len(self.employee_ids) and self.employee_ids[position] == employee_id:
+            return position
+        return None
+
+    def column_index(self, skill_id: int) -> Optional[int]:
+        position = int(np.searchsorted(self.skill_ids, skill_id))
+        if position < len(self.skill_ids) and self.skill_ids[position] == skill_id:
+            return position
+        return None
+
+    def employee_skills(self, employee_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Skill ids and proficiency levels of one employee"""
+        row = self.row_index(employee_id)
+        if row is None:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        start, end = self.indptr[row], self.indptr[row + 1]
+        return self.skill_ids[self.indices[start:end]], self.data[start:end]
+
+    def to_scipy(self):
+        """scipy.sparse.csr_matrix over the shared arrays (no copy)"""
+        from scipy.sparse import csr_matrix
+
+        return csr_matrix((self.data, self.indices, self.indptr), shape=self.shape, copy=False)
+
+    def cosine_vectors(self):
+        """
+        Row-normalised matrix and its transpose as csr_matrix over the shared arrays, None for a
+        bundle published by a builder that did not write them
+        """
+        from scipy.sparse import csr_matrix
+
+        if "normalized" not in self._arrays:
+            return None
+        vectors = csr_matrix((self._arrays["normalized"], self.indices, self.indptr), shape=self.shape, copy=False)
+        transposed = csr_matrix(
+            (self._arrays["columns_data"], self._arrays["columns_indices"], self._arrays["columns_indptr"]),
+            shape=(self.shape[1], self.shape[0]),
+            copy=False,
+        )
+        return vectors, transposed
+
+
+def cosine_arrays(arrays: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """L2-normalised values of every row (all-zero rows stay zero) and the transposed normalised matrix"""
+    from scipy.sparse import csr_matrix
+
+    shape = (len(arrays["employee_ids"]), len(arrays["skill_ids"]))
+    data = arrays["data"].astype(np.float32)
+    rows = np.repeat(np.arange(shape[0]), np.diff(arrays["indptr"]))
+    norms = np.sqrt(np.bincount(rows, weights=data.astype(np.float64) ** 2, minlength=shape[0]))
+    normalized = np.divide(data, norms[rows], out=np.zeros_like(data), where=norms[rows] > 0).astype(np.float32)
+    columns = csr_matrix((normalized, arrays["indices"], arrays["indptr"]), shape=shape).tocsc()
+    return {
+        "normalized": normalized,
+        # int32 like indices, so scipy uses the mapped arrays as they are
+        "columns_indptr": columns.indptr.astype(np.int32),
+        "columns_indices": columns.indices.astype(np.int32),
+        "columns_data": columns.data.astype(np.float32),
+    }
+
+
+async def build_skill_matrix_arrays(session: AsyncSession) -> dict:
+    """Load employee_skills in one ordered scan and lay it out as CSR arrays"""
+    skill_ids = np.fromiter(
+        (await session.execute(select(Skill.id).order_by(Skill.id))).scalars(), dtype=np.int64
+    )
+    result = await session.execute(
+        select(EmployeeSkill.employee_id, EmployeeSkill.skill_id, EmployeeSkill.proficiency_level)
+        .order_by(EmployeeSkill.employee_id, EmployeeSkill.skill_id)
+    )
+    rows = np.array(result.all(), dtype=np.int64).reshape(-1, 3)
+
+    employee_ids, row_starts = np.unique(rows[:, 0], return_index=True)
+    indptr = np.append(row_starts, len(rows)).astype(np.int64)
+    indices = np.searchsorted(skill_ids, rows[:, 1]).astype(np.int32)
+    data = rows[:, 2].astype(np.float32)
+    return {
+        "indptr": indptr,
+        "indices": indices,
+        "data": data,
+        "employee_ids": employee_ids.astype(np.int64),
+        "skill_ids": skill_ids,
+    }
+
+
+async def publish_skill_matrix(session: AsyncSession, directory: Optional[str] = None) -> str:
+    arrays = await build_skill_matrix_arrays(session)
+    arrays.update(cosine_arrays(arrays))
+    return write_bundle(
+        directory or settings.SHARED_MATRIX_DIR,
+        BUNDLE_NAME,
+        arrays,
+        meta={"employees": len(arrays["employee_ids"]), "skills": len(arrays["skill_ids"])},
+    )
+
+
+_handle = BundleHandle(settings.SHARED_MATRIX_DIR, BUNDLE_NAME)
+_matrix: Optional[SkillMatrix] = None
+
+
+def get_skill_matrix() -> Optional[SkillMatrix]:
+    """Current shared matrix of this worker, None until the builder has published one"""
+    global _matrix
+    bundle = _handle.get()
+    if bundle is None:
+        return None
+    if _matrix is None or _matrix.version != bundle.version:
+        _matrix = SkillMatrix(bundle)
+    return _matrix
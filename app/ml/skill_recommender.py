@@ -0,0 +1,89 @@
+"""
+Item-item skill similarity from employee_skills co-occurrence.
+
+Similarity is the cosine of binary "employee holds skill" columns, shrunk towards zero for
+pairs seen together only a few times. An optional truncated SVD of the same matrix adds
+latent similarity between skills that rarely co-occur directly but share neighbours.
+"""
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse import diags
+from scipy.sparse.linalg import svds
+
+SHRINKAGE = 5.0
+LOW_RANK_WEIGHT = 0.3
+BLOCK_SIZE = 512
+
+
+def cooccurrence_similarity(holdings: csr_matrix, shrinkage: float = SHRINKAGE) -> csr_matrix:
+    """Sparse skill x skill cosine similarity with support shrinkage, zero diagonal"""
+    binary = holdings.copy()
+    binary.data = np.ones_like(binary.data, dtype=np.float32)
+    counts = (binary.T @ binary).tocsr()
+
+    support = counts.diagonal()
+    inverse_norm = np.divide(1.0, np.sqrt(support), out=np.zeros_like(support, dtype=np.float64), where=support > 0)
+    # c_ij / sqrt(c_ii * c_jj) scaled by the shrink factor c_ij / (c_ij + shrinkage)
+    shrunk = counts.copy()
+    shrunk.data = counts.data * counts.data / (counts.data + shrinkage)
+    similarity = (diags(inverse_norm) @ shrunk @ diags(inverse_norm)).tocsr()
+    similarity.setdiag(0)
+    similarity.eliminate_zeros()
+    return similarity.astype(np.float32)
+
+
+def low_rank_factors(holdings: csr_matrix, rank: int) -> Optional[np.ndarray]:
+    """L2-normalised latent skill factors, None if the matrix is too small for the rank"""
+    rank = min(rank, min(holdings.shape) - 1)
+    if rank < 1:
+        return None
+    binary = holdings.astype(np.float32)
+    binary.data = np.ones_like(binary.data)
+    _, singular_values, vt = svds(binary, k=rank)
+    factors = (vt.T * singular_values).astype(np.float32)
+    norms = np.linalg.norm(factors, axis=1, keepdims=True)
+    return np.divide(factors, norms, out=np.zeros_like(factors), where=norms > 0)
+
+
+def top_neighbours(holdings: csr_matrix, top_n: int, rank: int = 0,
+                   low_rank_weight: float = LOW_RANK_WEIGHT) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Top-N neighbours for every skill column of an employee x skill matrix.
+    Returns parallel arrays (skill_index, neighbour_index, score) ordered by skill, then score desc.
+    """
+    similarity = cooccurrence_similarity(holdings)
+    factors = low_rank_factors(holdings, rank) if rank else None
+    n_skills = similarity.shape[0]
+
+    sources, neighbours, scores = [], [], []
+    for start in range(0, n_skills, BLOCK_SIZE):
+        end = min(start + BLOCK_SIZE, n_skills)
+        block = similarity[start:end].toarray()
+        if factors is not None:
+            latent = factors[start:end] @ factors.T
+            np.clip(latent, 0, None, out=latent)
+            block = (1 - low_rank_weight) * block + low_rank_weight * latent
+            block[np.arange(end - start), np.arange(start, end)] = 0
+
+        k = min(top_n, n_skills - 1)
+        if k < 1:
+            break
+        candidates = np.argpartition(-block, k - 1, axis=1)[:, :k]
+        candidate_scores = np.take_along_axis(block, candidates, axis=1)
+        order = np.argsort(-candidate_scores, axis=1)
+        candidates = np.take_along_axis(candidates, order, axis=1)
+        candidate_scores = np.take_along_axis(candidate_scores, order, axis=1)
+
+        keep = candidate_scores > 0
+        rows = np.repeat(np.arange(start, end), k).reshape(end - start, k)
+        sources.append(rows[keep])
+        neighbours.append(candidates[keep])
+        scores.append(candidate_scores[keep])
+
+    if not sources:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, np.empty(0, dtype=np.float32)
+    return np.concatenate(sources), np.concatenate(neighbours), np.concatenate(scores).astype(np.float32)
@@ -0,0 +1,198 @@
+"""
+Local semantic search over the skill catalog.
+
+Skills are embedded as TF-IDF vectors of hashed character n-grams of their name and description,
+so spelling variants ("Docker-compose/Docker", "docker compose") land close to each other without
+any model download, network or GPU. The index is built offline by
+python -m app.jobs.build_skill_search_index and shared between workers as a memory-mapped bundle,
+which also carries the transposed (feature x skill) matrix that queries are multiplied with.
+"""
+import math
+import re
+import zlib
+from collections import Counter
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from app.common.config import settings
+from app.ml.mmap_store import BundleHandle
+from app.ml.mmap_store import MappedBundle
+from app.ml.mmap_store import write_bundle
+
+BUNDLE_NAME = "skill_search"
+N_FEATURES = 1 << 20
+NGRAM_RANGE = (2, 4)
+# the name is what people type, the description only disambiguates
+NAME_WEIGHT = 2
+
+_SEPARATORS = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def normalize_text(text: str) -> str:
+    return _SEPARATORS.sub(" ", text.lower()).strip()
+
+
+def char_ngrams(text: str, ngram_range: Tuple[int, int] = NGRAM_RANGE) -> Iterable[str]:
+    """Character n-grams inside word boundaries, words padded with spaces"""
+    low, high = ngram_range
+    for word in normalize_text(text).split():
+        padded = f" {word} "
+        for n in range(low, high + 1):
+            for start in range(len(padded) - n + 1):
+                yield padded[start:start + n]
+
+
+def _feature(gram: str) -> int:
+    # crc32 is stable across processes, unlike hash()
+    return zlib.crc32(gram.encode()) & (N_FEATURES - 1)
+
+
+def term_counts(name: str, description: Optional[str] = None) -> Counter:
+    counts = Counter(_feature(gram) for gram in char_ngrams(name))
+    for feature in counts:
+        counts[feature] *= NAME_WEIGHT
+    if description:
+        counts.update(_feature(gram) for gram in char_ngrams(description))
+    return counts
+
+
+def _weighted_rows(documents: Sequence[Counter], weight) -> csr_matrix:
+    """L2-normalised sublinear tf * idf rows"""
+    indptr, indices, data = [0], [], []
+    for counts in documents:
+        features = np.fromiter(counts.keys(), dtype=np.int32, count=len(counts))
+        tf = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+        values = (1.0 + np.log(tf)) * weight(features)
+        norm = np.linalg.norm(values)
+        if norm > 0:
+            values /= norm
+        order = np.argsort(features)
+        indices.append(features[order])
+        data.append(values[order].astype(np.float32))
+        indptr.append(indptr[-1] + len(features))
+    return csr_matrix(
+        (
+            np.concatenate(data) if data else np.empty(0, dtype=np.float32),
+            np.concatenate(indices) if indices else np.empty(0, dtype=np.int32),
+            np.array(indptr, dtype=np.int64),
+        ),
+        shape=(len(documents), N_FEATURES),
+    )
+
+
+def build_skill_search_arrays(skills: Sequence[Tuple[int, str, Optional[str]]]) -> Dict[str, np.ndarray]:
+    """Index arrays for (skill_id, name, description) rows"""
+    documents = [term_counts(name, description) for _, name, description in skills]
+    document_frequency: Counter = Counter()
+    for counts in documents:
+        document_frequency.update(counts.keys())
+
+    feature_ids = np.array(sorted(document_frequency), dtype=np.int32)
+    total = len(documents)
+    idf = np.array(
+        [math.log((1 + total) / (1 + document_frequency[f])) + 1.0 for f in feature_ids.tolist()],
+        dtype=np.float32,
+    )
+    vectors = _weighted_rows(documents, _idf_lookup(feature_ids, idf, total))
+    columns = vectors.tocsc()
+    return {
+        "skill_ids": np.array([skill_id for skill_id, _, _ in skills], dtype=np.int64),
+        "indptr": vectors.indptr.astype(np.int64),
+        "indices": vectors.indices.astype(np.int32),
+        "data": vectors.data.astype(np.float32),
+        "feature_ids": feature_ids,
+        "idf": idf,
+        # int32, so scipy uses the mapped arrays as they are
+        "columns_indptr": columns.indptr.astype(np.int32),
+        "columns_indices": columns.indices.astype(np.int32),
+        "columns_data": columns.data.astype(np.float32),
+    }
+
+
+def _idf_lookup(feature_ids: np.ndarray, idf: np.ndarray, total: int):
+    # n-grams absent from the catalog get the idf of a feature seen in no document
+    unseen = np.float32(math.log(1 + total) + 1.0)
+
+    def weight(features: np.ndarray) -> np.ndarray:
+        if len(feature_ids) == 0:
+            return np.full(len(features), unseen, dtype=np.float32)
+        position = np.clip(np.searchsorted(feature_ids, features), 0, len(feature_ids) - 1)
+        return np.where(feature_ids[position] == features, idf[position], unseen)
+
+    return weight
+
+
+def publish_skill_search_index(skills: Sequence[Tuple[int, str, Optional[str]]],
+                               directory: Optional[str] = None) -> str:
+    arrays = build_skill_search_arrays(skills)
+    return write_bundle(
+        directory or settings.SHARED_MATRIX_DIR, BUNDLE_NAME, arrays, meta={"skills": len(skills)}
+    )
+
+
+class SkillSearchIndex:
+    """Read-only view of one published index version"""
+
+    def __init__(self, bundle: MappedBundle):
+        arrays = bundle.arrays
+        self.version = bundle.version
+        self.skill_ids = arrays["skill_ids"]
+        if "columns_indptr" in arrays:
+            self._transposed = csr_matrix(
+                (arrays["columns_data"], arrays["columns_indices"], arrays["columns_indptr"]),
+                shape=(N_FEATURES, len(self.skill_ids)), copy=False,
+            )
+        else:
+            # a bundle from an older builder, until the next rebuild
+            vectors = csr_matrix(
+                (arrays["data"], arrays["indices"], arrays["indptr"]),
+                shape=(len(self.skill_ids), N_FEATURES), copy=False,
+            )
+            self._transposed = vectors.T.tocsr()
+        self._weight = _idf_lookup(arrays["feature_ids"], arrays["idf"], len(self.skill_ids))
+
+    def vectorize(self, texts: Sequence[Tuple[str, Optional[str]]]) -> csr_matrix:
+        return _weighted_rows([term_counts(name, description) for name, description in texts], self._weight)
+
+    def search_many(self, texts: Sequence[Tuple[str, Optional[str]]], limit: int,
+                    min_score: float = 0.0) -> List[List[Tuple[int, float]]]:
+        """(skill_id, score) matches for every (name, description) query, scored in one product"""
+        if not texts or len(self.skill_ids) == 0:
+            return [[] for _ in texts]
+        scores = (self.vectorize(texts) @ self._transposed).toarray()
+        k = min(limit, scores.shape[1])
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        results = []
+        for row, candidates in enumerate(top):
+            ranked = candidates[np.argsort(-scores[row, candidates], kind="stable")]
+            results.append([
+                (int(self.skill_ids[column]), float(scores[row, column]))
+                for column in ranked.tolist()
+                if scores[row, column] > min_score
+            ])
+        return results
+
+    def search(self, query: str, limit: int, min_score: float = 0.0) -> List[Tuple[int, float]]:
+        return self.search_many([(query, None)], limit, min_score)[0]
+
+
+_handle = BundleHandle(settings.SHARED_MATRIX_DIR, BUNDLE_NAME)
+_index: Optional[SkillSearchIndex] = None
+
+
+def get_skill_search_index() -> Optional[SkillSearchIndex]:
+    """Current index of this worker, None until the builder has published one"""
+    global _index
+    bundle = _handle.get()
+    if bundle is None:
+        return None
+    if _index is None or _index.version != bundle.version:
+        _index = SkillSearchIndex(bundle)
+    return _index
@@ -10,6 +10,8 @@ from sqlalchemy import Integer
 from sqlalchemy import String
 from sqlalchemy import Text
 from sqlalchemy import func
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import mapped_column
@@ -66,6 +68,7 @@ class Employee(Base):
         TIMESTAMP(timezone=False),
         server_default=func.now(),
         onupdate=func.current_timestamp(),
+        index=True,
         comment="Date and time when the employee was last updated",
     )
 
@@ -151,6 +154,13 @@ class Skill(Base):
     description: Mapped[str] = mapped_column(
         Text, comment="Description of the skill", nullable=True
     )
+    category_id: Mapped[Optional[int]] = mapped_column(
+        BigInteger,
+        ForeignKey('skill_categories.id', ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+        comment="Taxonomy category of the skill"
+    )
     created_at: Mapped[TIMESTAMP] = mapped_column(
         TIMESTAMP(timezone=False),
         server_default=func.now(),
@@ -407,6 +417,11 @@ class EmployeeQuest(Base):
         default=0,
         comment="Current progress count for the quest action"
     )
+    completed_at: Mapped[Optional[TIMESTAMP]] = mapped_column(
+        TIMESTAMP(timezone=False),
+        nullable=True,
+        comment="Date and time when the quest was completed, NULL while in progress"
+    )
     # Relationships
     employee: Mapped["Employee"] = relationship(back_populates="quests_progress")
     quest: Mapped["Quest"] = relationship(back_populates="employee_quests")
@@ -418,6 +433,7 @@ class RoadmapQuest(Base):
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     roadmap_id: Mapped[int] = mapped_column(
         ForeignKey('career_roadmaps.id', ondelete="CASCADE"),
+        index=True,
         comment="ID of the career roadmap"
     )
     quest_id: Mapped[int] = mapped_column(
@@ -466,7 +482,7 @@ class RoadmapRequiredSkill(Base):
     __tablename__ = 'roadmap_required_skills'
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
-    roadmap_id: Mapped[int] = mapped_column(ForeignKey('career_roadmaps.id', ondelete="CASCADE"))
+    roadmap_id: Mapped[int] = mapped_column(ForeignKey('career_roadmaps.id', ondelete="CASCADE"), index=True)
     skill_id: Mapped[int] = mapped_column(ForeignKey('skills.id', ondelete="CASCADE"))
     required_level: Mapped[int] = mapped_column(Integer, nullable=False)
 
@@ -487,6 +503,7 @@ class EmployeeRoadmap(Base):
     employee_id: Mapped[int] = mapped_column(
         BigInteger,
         ForeignKey('employees.id', ondelete="CASCADE"),
+        index=True,
         comment="ID of the employee following the roadmap"
     )
     roadmap_id: Mapped[int] = mapped_column(
@@ -698,3 +715,197 @@ class ProjectTeam(Base):
     # Relationships
     project: Mapped["Project"] = relationship(back_populates="team_members")
     employee: Mapped["Employee"] = relationship(back_populates="project_teams")
+
+
+class DepartmentStats(Base):
+    """Per-department dashboard aggregates, maintained incrementally and reconciled nightly"""
+    __tablename__ = 'department_stats'
+
+    department: Mapped[str] = mapped_column(
+        String,
+        primary_key=True,
+        comment="Department name ('unassigned' for employees without a department)"
+    )
+    headcount: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False, comment="Number of employees"
+    )
+    rating_sum: Mapped[float] = mapped_column(
+        Float, default=0, server_default="0", nullable=False, comment="Sum of employee ratings"
+    )
+    total_xp_sum: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default="0", nullable=False, comment="Sum of employee total_xp"
+    )
+    quests_assigned: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False, comment="Quests assigned to employees"
+    )
+    quests_completed: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False, comment="Quests completed by employees"
+    )
+    level_distribution: Mapped[dict] = mapped_column(
+        JSONB,
+        default=dict,
+        server_default="{}",
+        nullable=False,
+        comment="Employee count per level id ('none' for employees without a level)"
+    )
+    updated_at: Mapped[TIMESTAMP] = mapped_column(
+        TIMESTAMP(timezone=False),
+        server_default=func.now(),
+        onupdate=func.current_timestamp(),
+        comment="Date and time when the stats were last updated",
+    )
+
+
+class SkillNeighbour(Base):
+    """Top-N similar skills per skill, produced offline by app.jobs.skill_recommendations"""
+    __tablename__ = 'skill_neighbours'
+
+    skill_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey('skills.id', ondelete="CASCADE"),
+        primary_key=True,
+        comment="ID of the source skill"
+    )
+    neighbour_skill_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey('skills.id', ondelete="CASCADE"),
+        primary_key=True,
+        comment="ID of the similar skill"
+    )
+    score: Mapped[float] = mapped_column(
+        Float,
+        nullable=False,
+        comment="Similarity score (0-1)"
+    )
+    rank: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        comment="Position of the neighbour in the source skill's list, starting at 1"
+    )
+
+
+class SkillCategory(Base):
+    """Node of the skill taxonomy ("Backend" -> "JVM" -> skills)"""
+    __tablename__ = 'skill_categories'
+
+    id: Mapped[int] = mapped_column(
+        BigInteger,
+        primary_key=True,
+        index=True,
+        comment="Unique identifier of the category"
+    )
+    name: Mapped[str] = mapped_column(
+        String,
+        unique=True,
+        nullable=False,
+        comment="Name of the category"
+    )
+    parent_id: Mapped[Optional[int]] = mapped_column(
+        BigInteger,
+        ForeignKey('skill_categories.id', ondelete="RESTRICT"),
+        nullable=True,
+        index=True,
+        comment="Parent category, NULL for roots"
+    )
+    created_at: Mapped[TIMESTAMP] = mapped_column(
+        TIMESTAMP(timezone=False),
+        server_default=func.now(),
+        comment="Date and time when the category was created"
+    )
+
+
+class SkillCategoryClosure(Base):
+    """Transitive closure of skill_categories: one row per (ancestor, descendant) pair, self included"""
+    __tablename__ = 'skill_category_closure'
+
+    ancestor_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey('skill_categories.id', ondelete="CASCADE"),
+        primary_key=True,
+        comment="Ancestor category"
+    )
+    descendant_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey('skill_categories.id', ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+        comment="Descendant category"
+    )
+    depth: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        comment="Distance between the categories, 0 for the self row"
+    )
+
+
+class DomainEvent(Base):
+    """
+    Append-only log of events that changed quest state, hash-partitioned by employee_id
+    (domain_events_p0 .. domain_events_p15). Source of truth for app.jobs.event_replay.
+    """
+    __tablename__ = 'domain_events'
+    __table_args__ = {"postgresql_partition_by": "HASH (employee_id)"}
+
+    employee_id: Mapped[int] = mapped_column(
+        BigInteger,
+        primary_key=True,
+        comment="Employee the event belongs to (no foreign key, the log outlives deleted employees)"
+    )
+    id: Mapped[int] = mapped_column(
+        BigInteger,
+        primary_key=True,
+        server_default=text("nextval('domain_events_id_seq')"),
+        comment="Global event order"
+    )
+    action_type: Mapped[str] = mapped_column(
+        String(50),
+        nullable=False,
+        comment="Quest action type, or quest_assigned / quest_progress_imported"
+    )
+    count: Mapped[int] = mapped_column(
+        Integer,
+        default=1,
+        server_default="1",
+        nullable=False,
+        comment="Progress added by the event"
+    )
+    quest_id: Mapped[Optional[int]] = mapped_column(
+        BigInteger,
+        nullable=True,
+        comment="Target quest of quest_assigned and quest_progress_imported events"
+    )
+    occurred_at: Mapped[TIMESTAMP] = mapped_column(
+        TIMESTAMP(timezone=False),
+        server_default=func.now(),
+        nullable=False,
+        comment="Date and time when the event was recorded"
+    )
+
+
+class EventReplayCheckpoint(Base):
+    """Progress of the running event replay: last employee rebuilt in each domain_events partition"""
+    __tablename__ = 'event_replay_checkpoints'
+
+    partition: Mapped[int] = mapped_column(
+        Integer,
+        primary_key=True,
+        comment="Partition number of domain_events"
+    )
+    last_employee_id: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        comment="Employees up to this id are rebuilt"
+    )
+    events_replayed: Mapped[int] = mapped_column(
+        BigInteger,
+        default=0,
+        server_default="0",
+        nullable=False,
+        comment="Events replayed in this partition so far"
+    )
+    updated_at: Mapped[TIMESTAMP] = mapped_column(
+        TIMESTAMP(timezone=False),
+        server_default=func.now(),
+        onupdate=func.current_timestamp(),
+        comment="Date and time of the last checkpoint"
+    )
@@ -0,0 +1,82 @@
+from typing import List
+from typing import Optional
+
+from sqlalchemy import TIMESTAMP
+from sqlalchemy import Float
+from sqlalchemy import Integer
+from sqlalchemy import String
+from sqlalchemy import column
+from sqlalchemy import func
+from sqlalchemy import select
+from sqlalchemy import table
+from sqlalchemy import text
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.common.exceptions import DatabaseException
+from app.models import Skill
+
+# Materialized view created by migration a1c1eb667409, not part of the ORM metadata
+skill_gap_matrix = table(
+    "skill_gap_matrix",
+    column("grouping_level", Integer),
+    column("department", String),
+    column("skill_id", Integer),
+    column("headcount", Integer),
+    column("holders", Integer),
+    column("avg_proficiency", Float),
+    column("required_count", Integer),
+    column("met_count", Integer),
+    column("coverage", Float),
+    column("avg_required_level", Float),
+    column("refreshed_at", TIMESTAMP),
+)
+
+# Arbitrary application-wide key for pg_try_advisory_xact_lock
+SKILL_GAP_REFRESH_LOCK_ID = 27_001
+
+
+class AnalyticsRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def get_skill_gap_rows(self, department: Optional[str] = None) -> List[RowMapping]:
+        """Read precomputed department x skill cells and their rollups"""
+        try:
+            query = (
+                select(skill_gap_matrix, Skill.name.label("skill_name"))
+                .outerjoin(Skill, Skill.id == skill_gap_matrix.c.skill_id)
+                .order_by(
+                    skill_gap_matrix.c.grouping_level,
+                    skill_gap_matrix.c.department,
+                    skill_gap_matrix.c.skill_id,
+                )
+            )
+            if department is not None:
+                # keep skill and organization rollups so the caller can compare against them
+                query = query.where(
+                    (skill_gap_matrix.c.department == department) | skill_gap_matrix.c.department.is_(None)
+                )
+            result = await self._session.execute(query)
+            return list(result.mappings().all())
+        except Exception as e:
+            raise DatabaseException(f"Failed to get skill gap matrix: {str(e)}") from e
+
+    async def refresh_skill_gap_matrix(self) -> bool:
+        """
+        Refresh the skill gap view without blocking readers.
+        Returns False if another worker is already refreshing it.
+        """
+        try:
+            locked = await self._session.scalar(
+                select(func.pg_try_advisory_xact_lock(SKILL_GAP_REFRESH_LOCK_ID))
+            )
+            if not locked:
+                await self._session.rollback()
+                return False
+            await self._session.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY skill_gap_matrix"))
+            await self._session.commit()
+            return True
+        except Exception as e:
+            await self._session.rollback()
+            raise DatabaseException(f"Failed to refresh skill gap matrix: {str(e)}") from e
@@ -0,0 +1,176 @@
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from sqlalchemy import Integer
+from sqlalchemy import String
+from sqlalchemy import cast
+from sqlalchemy import delete
+from sqlalchemy import func
+from sqlalchemy import literal
+from sqlalchemy import literal_column
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.expression import ColumnElement
+
+from app.common.exceptions import DatabaseException
+from app.models import DepartmentStats
+from app.models import Employee
+from app.models import EmployeeQuest
+
+UNASSIGNED_DEPARTMENT = "unassigned"
+NO_LEVEL_KEY = "none"
+
+_COUNTERS = ("headcount", "rating_sum", "total_xp_sum", "quests_assigned", "quests_completed")
+
+
+def department_key(department: Optional[str]) -> str:
+    return department or UNASSIGNED_DEPARTMENT
+
+
+def level_key(level_id: Optional[int]) -> str:
+    return str(level_id) if level_id is not None else NO_LEVEL_KEY
+
+
+class DepartmentStatsRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def get_all(self) -> List[DepartmentStats]:
+        try:
+            result = await self._session.execute(
+                select(DepartmentStats).order_by(DepartmentStats.department)
+            )
+            return list(result.scalars().all())
+        except Exception as e:
+            raise DatabaseException(f"Failed to get department stats: {str(e)}") from e
+
+    async def apply_delta(
+        self, department: str, levels: Optional[Dict[str, int]] = None, **counters: float
+    ) -> None:
+        """Add counter deltas (headcount, rating_sum, ...) and level count deltas to one department"""
+        try:
+            levels = levels or {}
+            stmt = insert(DepartmentStats).values(
+                department=department,
+                level_distribution=levels,
+                **{name: counters.get(name, 0) for name in _COUNTERS},
+            )
+            await self._upsert_delta(stmt, levels)
+        except Exception as e:
+            await self._session.rollback()
+            raise DatabaseException(f"Failed to update department stats: {str(e)}") from e
+
+    async def apply_employee_delta(self, employee_id: int, **counters: float) -> None:
+        """Same as apply_delta, resolving the department from the employee in the same statement"""
+        try:
+            source = select(
+                # department_key in SQL: an empty department is unassigned as well
+                func.coalesce(func.nullif(Employee.department, ""), UNASSIGNED_DEPARTMENT),
+                literal({}, JSONB),
+                *[literal(counters.get(name, 0)) for name in _COUNTERS],
+            ).where(Employee.id == employee_id)
+            stmt = insert(DepartmentStats).from_select(
+                ["department", "level_distribution", *_COUNTERS], source
+            )
+            await self._upsert_delta(stmt, {})
+        except Exception as e:
+            await self._session.rollback()
+            raise DatabaseException(f"Failed to update department stats: {str(e)}") from e
+
+    async def _upsert_delta(self, stmt, levels: Dict[str, int]) -> None:
+        distribution: ColumnElement = DepartmentStats.level_distribution.expression
+        for key, delta in levels.items():
+            current = func.coalesce(cast(DepartmentStats.level_distribution[key].astext, Integer), 0)
+            distribution = distribution.op("||", return_type=JSONB)(
+                func.jsonb_build_object(key, current + delta)
+            )
+        set_ = {
+            name: getattr(DepartmentStats, name) + getattr(stmt.excluded, name)
+            for name in _COUNTERS
+        }
+        set_["level_distribution"] = distribution
+        set_["updated_at"] = func.now()
+        await self._session.execute(
+            stmt.on_conflict_do_update(index_elements=[DepartmentStats.department], set_=set_)
+        )
+        await self._session.commit()
+
+    async def reconcile(self) -> int:
+        """Recompute every department from the source tables and drop departments without employees"""
+        try:
+            # department_key in SQL, inlined constants so the same expression can be matched in GROUP BY
+            department = func.coalesce(
+                func.nullif(Employee.department, literal_column("''")),
+                literal_column(f"'{UNASSIGNED_DEPARTMENT}'"),
+            )
+
+            quest_counts = (
+                select(
+                    EmployeeQuest.employee_id,
+                    func.count().label("assigned"),
+                    func.count().filter(EmployeeQuest.is_completed.is_(True)).label("completed"),
+                )
+                .group_by(EmployeeQuest.employee_id)
+                .subquery("quest_counts")
+            )
+            level_counts = (
+                select(
+                    department.label("department"),
+                    func.coalesce(cast(Employee.level_id, String), NO_LEVEL_KEY).label("level"),
+                    func.count().label("employees"),
+                )
+                .group_by(department, Employee.level_id)
+                .subquery("level_counts")
+            )
+            distributions = (
+                select(
+                    level_counts.c.department,
+                    func.jsonb_object_agg(level_counts.c.level, level_counts.c.employees).label("levels"),
+                )
+                .group_by(level_counts.c.department)
+                .subquery("distributions")
+            )
+            totals = (
+                select(
+                    department.label("department"),
+                    func.count(Employee.id).label("headcount"),
+                    func.coalesce(func.sum(Employee.rating), 0).label("rating_sum"),
+                    func.coalesce(func.sum(Employee.total_xp), 0).label("total_xp_sum"),
+                    func.coalesce(func.sum(quest_counts.c.assigned), 0).label("quests_assigned"),
+                    func.coalesce(func.sum(quest_counts.c.completed), 0).label("quests_completed"),
+                )
+                .outerjoin(quest_counts, quest_counts.c.employee_id == Employee.id)
+                .group_by(department)
+                .subquery("totals")
+            )
+            source = select(
+                totals.c.department,
+                *[totals.c[name] for name in _COUNTERS],
+                distributions.c.levels,
+            ).join(distributions, distributions.c.department == totals.c.department)
+
+            stmt = insert(DepartmentStats).from_select(
+                ["department", *_COUNTERS, "level_distribution"], source
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[DepartmentStats.department],
+                set_={
+                    **{name: getattr(stmt.excluded, name) for name in _COUNTERS},
+                    "level_distribution": stmt.excluded.level_distribution,
+                    "updated_at": func.now(),
+                },
+            )
+            result = await self._session.execute(stmt)
+            await self._session.execute(
+                delete(DepartmentStats).where(
+                    DepartmentStats.department.not_in(select(department).distinct())
+                )
+            )
+            await self._session.commit()
+            return result.rowcount
+        except Exception as e:
+            await self._session.rollback()
+            raise DatabaseException(f"Failed to reconcile department stats: {str(e)}") from e
@@ -0,0 +1,250 @@
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from sqlalchemy import TIMESTAMP
+from sqlalchemy import BigInteger
+from sqlalchemy import Boolean
+from sqlalchemy import Integer
+from sqlalchemy import String
+from sqlalchemy import column
+from sqlalchemy import delete
+from sqlalchemy import func
+from sqlalchemy import insert
+from sqlalchemy import select
+from sqlalchemy import table
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.common.exceptions import DatabaseException
+from app.models import DomainEvent
+from app.models import Employee
+from app.models import EmployeeQuest
+from app.models import EventReplayCheckpoint
+from app.models import ExperiencePoints
+from app.models import Quest
+from app.repositories.experience_repository import level_for_xp
+from app.repositories.experience_repository import unnest
+
+# must match the partitions created by the c47e9a2d13f8 migration
+DOMAIN_EVENT_PARTITIONS = 16
+
+QUEST_ASSIGNED = "quest_assigned"
+QUEST_PROGRESS_IMPORTED = "quest_progress_imported"
+
+
+class StoredEvent(NamedTuple):
+    employee_id: int
+    id: int
+    action_type: str
+    amount: int
+    quest_id: Optional[int]
+    occurred_at: object
+
+
+class QuestDefinition(NamedTuple):
+    id: int
+    action_type: str
+    required_count: int
+    xp_reward: int
+    is_active: bool
+
+
+class ReplayedQuest(NamedTuple):
+    employee_id: int
+    quest_id: int
+    current_count: int
+    is_completed: bool
+    created_at: object
+    completed_at: object
+
+
+class ReplayedXp(NamedTuple):
+    employee_id: int
+    points: int
+    action_type: str
+    created_at: object
+
+
+async def record_events(
+    session: AsyncSession, events: Sequence[Tuple[int, str, int, Optional[int]]]
+) -> None:
+    """Append (employee_id, action_type, count, quest_id) events inside the caller's transaction (no commit)"""
+    if not events:
+        return
+    employee_ids, action_types, counts, quest_ids = (list(values) for values in zip(*events, strict=True))
+    source = unnest(
+        "event",
+        employee_id=(employee_ids, BigInteger),
+        action_type=(action_types, String),
+        count=(counts, Integer),
+        quest_id=(quest_ids, BigInteger),
+    )
+    await session.execute(
+        insert(DomainEvent).from_select(
+            ["employee_id", "action_type", "count", "quest_id"],
+            select(source.c.employee_id, source.c.action_type, source.c.count, source.c.quest_id),
+        )
+    )
+
+
+def _partition(number: int):
+    return table(
+        f"domain_events_p{number}",
+        column("employee_id"),
+        column("id"),
+        column("action_type"),
+        column("count"),
+        column("quest_id"),
+        column("occurred_at"),
+    )
+
+
+class DomainEventRepository:
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def get_quest_definitions(self) -> Dict[int, QuestDefinition]:
+        try:
+            result = await self._session.execute(
+                select(Quest.id, Quest.action_type, Quest.required_count, Quest.xp_reward, Quest.is_active)
+            )
+            return {row.id: QuestDefinition(*row) for row in result.all()}
+        except Exception as e:
+            raise DatabaseException(f"Failed to get quest definitions: {str(e)}") from e
+
+    async def get_checkpoints(self) -> Dict[int, int]:
+        try:
+            result = await self._session.execute(
+                select(EventReplayCheckpoint.partition, EventReplayCheckpoint.last_employee_id)
+            )
+            return dict(result.tuples().all())
+        except Exception as e:
+            raise DatabaseException(f"Failed to get replay checkpoints: {str(e)}") from e
+
+    async def reset_checkpoints(self) -> None:
+        try:
+            await self._session.execute(delete(EventReplayCheckpoint))
+            await self._session.commit()
+        except Exception as e:
+            await self._session.rollback()
+            raise DatabaseException(f"Failed to reset replay checkpoints: {str(e)}") from e
+
+    async def replay_chunk(
+        self,
+        partition: int,
+        after_employee_id: int,
+        limit: int,
+        replay: Callable[[List[StoredEvent]], Tuple[List[ReplayedQuest], List[ReplayedXp]]],
+        xp_action: str,
+    ) -> Tuple[Optional[int], int, int]:
+        """
+        Rebuild quest progress and quest XP of the next `limit` employees of a partition from their
+        events, and move the partition checkpoint, in one REPEATABLE READ transaction: a concurrent
+        write to the same employees fails it with a serialization error instead of being overwritten.
+        Returns the last employee rebuilt (None when the partition is done), the number of employees
+        and the number of events.
+        """
+        try:
+            await self._session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+            events_table = _partition(partition)
+            result = await self._session.execute(
+                select(events_table.c.employee_id)
+                .where(events_table.c.employee_id > after_employee_id)
+                .distinct()
+                .order_by(events_table.c.employee_id)
+                .limit(limit)
+            )
+            employee_ids = list(result.scalars().all())
+            if not employee_ids:
+                await self._session.rollback()
+                return None, 0, 0
+            result = await self._session.execute(
+                select(events_table)
+                .where(events_table.c.employee_id.in_(employee_ids))
+                .order_by(events_table.c.employee_id, events_table.c.id)
+            )
+            events = [StoredEvent(*row) for row in result.all()]
+            quests, xp = replay(events)
+
+            await self._replace_quests(employee_ids, quests)
+            await self._replace_xp(employee_ids, xp, xp_action)
+            await self._save_checkpoint(partition, employee_ids[-1], len(events))
+            await self._session.commit()
+            return employee_ids[-1], len(employee_ids), len(events)
+        except Exception as e:
+            await self._session.rollback()
+            raise DatabaseException(f"Failed to replay domain events: {str(e)}") from e
+
+    async def _replace_quests(self, employee_ids: List[int], quests: List[ReplayedQuest]) -> None:
+        await self._session.execute(delete(EmployeeQuest).where(EmployeeQuest.employee_id.in_(employee_ids)))
+        if not quests:
+            return
+        source = unnest(
+            "quest",
+            employee_id=([q.employee_id for q in quests], BigInteger),
+            quest_id=([q.quest_id for q in quests], BigInteger),
+            current_count=([q.current_count for q in quests], Integer),
+            is_completed=([q.is_completed for q in quests], Boolean),
+            created_at=([q.created_at for q in quests], TIMESTAMP),
+            completed_at=([q.completed_at for q in quests], TIMESTAMP),
+        )
+        await self._session.execute(
+            insert(EmployeeQuest).from_select(
+                ["employee_id", "quest_id", "current_count", "is_completed", "created_at", "completed_at"],
+                select(*source.c),
+            )
+        )
+
+    async def _replace_xp(self, employee_ids: List[int], xp: List[ReplayedXp], xp_action: str) -> None:
+        # XP from other sources stays, total_xp and the level are recomputed from all of it
+        await self._session.execute(
+            delete(ExperiencePoints).where(
+                ExperiencePoints.employee_id.in_(employee_ids), ExperiencePoints.action_type == xp_action
+            )
+        )
+        if xp:
+            source = unnest(
+                "xp",
+                employee_id=([row.employee_id for row in xp], BigInteger),
+                points=([row.points for row in xp], Integer),
+                action_type=([row.action_type for row in xp], String),
+                created_at=([row.created_at for row in xp], TIMESTAMP),
+            )
+            await self._session.execute(
+                insert(ExperiencePoints).from_select(
+                    ["employee_id", "points", "action_type", "created_at"], select(*source.c)
+                )
+            )
+        total = func.coalesce(
+            select(func.sum(ExperiencePoints.points))
+            .where(ExperiencePoints.employee_id == Employee.id)
+            .correlate(Employee)
+            .scalar_subquery(),
+            0,
+        )
+        await self._session.execute(
+            update(Employee)
+            .where(Employee.id.in_(employee_ids))
+            .values(total_xp=total, level_id=func.coalesce(level_for_xp(total), Employee.level_id))
+        )
+
+    async def _save_checkpoint(self, partition: int, last_employee_id: int, events: int) -> None:
+        stmt = pg_insert(EventReplayCheckpoint).values(
+            partition=partition, last_employee_id=last_employee_id, events_replayed=events
+        )
+        await self._session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[EventReplayCheckpoint.partition],
+                set_={
+                    "last_employee_id": stmt.excluded.last_employee_id,
+                    "events_replayed": EventReplayCheckpoint.events_replayed + stmt.excluded.events_replayed,
+                    "updated_at": func.now(),
+                },
+            )
+        )
@@ -0,0 +1,177 @@
+from typing import Optional
+
+from sqlalchemy import Numeric
+from sqlalchemy import String
+from sqlalchemy import and_
+from sqlalchemy import case
+from sqlalchemy import cast
+from sqlalchemy import func
+from sqlalchemy import literal_column
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.expression import ColumnElement
+
+from app.common.config import settings
+from app.common.exceptions import DatabaseException
+from app.models import CareerRoadmap
+from app.models import Employee
+from app.models import EmployeeQuest
+from app.models import EmployeeReward
+from app.models import EmployeeRoadmap
+from app.models import EmployeeSkill
+from app.models import ExperiencePoints
+from app.models import Level
+from app.models import Quest
+from app.models import Reward
+from app.models import Skill
+from app.repositories.employee_repository import PROFILE_COMPLETION_WEIGHTS
+
+RECENT_XP_LIMIT = 10
+
+_EMPTY_ARRAY: ColumnElement = literal_column("'[]'::json")
+
+
+def _json_array(query, *pairs, order_by) -> object:
+    """coalesce(json_agg(json_build_object(pairs...) ORDER BY ...), '[]') as a correlated scalar"""
+    row = func.json_build_object(*pairs)
+    return (
+        query.with_only_columns(func.coalesce(func.json_agg(aggregate_order_by(row, *order_by)), _EMPTY_ARRAY))
+        .scalar_subquery()
+    )
+
+
+def _filled(column) -> ColumnElement[bool]:
+    return and_(column.is_not(None), func.btrim(column) != "")
+
+
+class EmployeeContextRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def get_context_json(self, employee_id: int) -> Optional[str]:
+        """
+        Employee profile with skills, quests, roadmaps, rewards, level and recent XP rendered by
+        PostgreSQL as one compact JSON document, in a single statement. None if there is no such employee.
+        Read from the primary: the document is kept in EmployeeContextCache for its whole TTL.
+        """
+        try:
+            skills = _json_array(
+                select(EmployeeSkill).join(Skill, Skill.id == EmployeeSkill.skill_id)
+                .where(EmployeeSkill.employee_id == Employee.id),
+                "skill_id", Skill.id,
+                "name", Skill.name,
+                "proficiency_level", EmployeeSkill.proficiency_level,
+                order_by=(EmployeeSkill.proficiency_level.desc(), Skill.name),
+            )
+            quest_progress = case(
+                (Quest.required_count > 0,
+                 func.round(cast(EmployeeQuest.current_count * 100.0 / Quest.required_count, Numeric), 1)),
+                else_=0,
+            )
+            quests = _json_array(
+                select(EmployeeQuest).join(Quest, Quest.id == EmployeeQuest.quest_id)
+                .where(EmployeeQuest.employee_id == Employee.id),
+                "quest_id", Quest.id,
+                "name", Quest.name,
+                "current_count", EmployeeQuest.current_count,
+                "required_count", Quest.required_count,
+                "progress_percentage", quest_progress,
+                "is_completed", EmployeeQuest.is_completed,
+                "xp_reward", Quest.xp_reward,
+                order_by=(EmployeeQuest.is_completed, Quest.id),
+            )
+            roadmaps = _json_array(
+                select(EmployeeRoadmap).join(CareerRoadmap, CareerRoadmap.id == EmployeeRoadmap.roadmap_id)
+                .where(EmployeeRoadmap.employee_id == Employee.id),
+                "roadmap_id", CareerRoadmap.id,
+                "title", CareerRoadmap.title,
+                "target_role", CareerRoadmap.target_role,
+                "progress_percentage", EmployeeRoadmap.progress_percentage,
+                "is_completed", EmployeeRoadmap.is_completed,
+                order_by=(EmployeeRoadmap.is_completed, CareerRoadmap.id),
+            )
+            rewards = _json_array(
+                select(EmployeeReward).join(Reward, Reward.id == EmployeeReward.reward_id)
+                .where(EmployeeReward.employee_id == Employee.id),
+                "reward_id", Reward.id,
+                "name", Reward.name,
+                "type", Reward.type,
+                "earned_at", EmployeeReward.earned_at,
+                "is_claimed", EmployeeReward.is_claimed,
+                order_by=(EmployeeReward.earned_at.desc(),),
+            )
+            recent = (
+                select(ExperiencePoints.points, ExperiencePoints.action_type, ExperiencePoints.created_at)
+                .where(ExperiencePoints.employee_id == Employee.id)
+                .order_by(ExperiencePoints.created_at.desc(), ExperiencePoints.id.desc())
+                .limit(RECENT_XP_LIMIT)
+                .correlate(Employee)
+                .subquery("recent")
+            )
+            recent_xp = (
+                select(func.coalesce(
+                    func.json_agg(aggregate_order_by(
+                        func.json_build_object(
+                            "points", recent.c.points,
+                            "action_type", recent.c.action_type,
+                            "created_at", recent.c.created_at,
+                        ),
+                        recent.c.created_at.desc(),
+                    )),
+                    _EMPTY_ARRAY,
+                ))
+                .select_from(recent)
+                .scalar_subquery()
+            )
+            level = (
+                select(func.json_build_object(
+                    "id", Level.id, "name", Level.level_name, "min_xp", Level.min_xp, "badge_url", Level.badge_url,
+                ))
+                .where(Level.id == Employee.level_id)
+                .scalar_subquery()
+            )
+            next_level_xp = (
+                select(func.min(Level.min_xp)).where(Level.min_xp > Employee.total_xp).scalar_subquery()
+            )
+            skill_count = (
+                select(func.count()).where(EmployeeSkill.employee_id == Employee.id).scalar_subquery()
+            )
+            # same weights as EmployeeService.calculate_completion
+            weights = PROFILE_COMPLETION_WEIGHTS
+            completion = func.least(
+                100,
+                func.round(
+                    case((_filled(Employee.first_name), weights["first_name"]), else_=0)
+                    + case((_filled(Employee.last_name), weights["last_name"]), else_=0)
+                    + case((_filled(Employee.email), weights["email"]), else_=0)
+                    + case((_filled(Employee.department), weights["department"]), else_=0)
+                    + case((Employee.rating >= 0, weights["rating"]), else_=0)
+                    + func.least(skill_count * 1.0 / settings.MAX_SKILLS_FOR_EMPLOYEE, 1) * weights["skills"]
+                ),
+            )
+
+            document = func.json_build_object(
+                "employee", func.json_build_object(
+                    "id", Employee.id,
+                    "email", Employee.email,
+                    "first_name", Employee.first_name,
+                    "last_name", Employee.last_name,
+                    "department", Employee.department,
+                    "rating", Employee.rating,
+                    "total_xp", Employee.total_xp,
+                ),
+                "profile_completion", completion,
+                "level", level,
+                "xp_to_next_level", next_level_xp - Employee.total_xp,
+                "skills", skills,
+                "quests", quests,
+                "roadmaps", roadmaps,
+                "rewards", rewards,
+                "recent_xp", recent_xp,
+            )
+            return await self._session.scalar(
+                select(cast(document, String)).where(Employee.id == employee_id)
+            )
+        except Exception as e:
+            raise DatabaseException(f"Failed to get employee context: {str(e)}") from e
@@ -1,7 +1,13 @@
+from typing import Collection
+from typing import List
 from typing import Optional
+from typing import Sequence
 
+from sqlalchemy import func
+from sqlalchemy import or_
 from sqlalchemy import select
 from sqlalchemy import update
+from sqlalchemy.engine import RowMapping
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
@@ -10,7 +16,20 @@ from app.common.exceptions import DatabaseException
 from app.common.exceptions import DuplicateEmployeeException
 from app.common.exceptions import IntegrityDataException
 from app.common.exceptions import NotFoundException
+from app.database import replica_read
 from app.models import Employee
+from app.models import EmployeeSkill
+from app.repositories.skill_taxonomy_repository import skills_in_categories
+
+# profile completion weights, skills count proportionally up to MAX_SKILLS_FOR_EMPLOYEE
+PROFILE_COMPLETION_WEIGHTS = {
+    'first_name': 15,
+    'last_name': 15,
+    'email': 20,
+    'department': 15,
+    'rating': 15,
+    'skills': 20,
+}
 
 
 class EmployeeRepository:
@@ -38,6 +57,15 @@ class EmployeeRepository:
         except Exception as e:
             raise DatabaseException(str(e)) from e
 
+    async def get_by_ids(self, employee_ids: Sequence[int]) -> List[Employee]:
+        try:
+            result = await self._session.execute(
+                select(Employee).where(Employee.id.in_(employee_ids))
+            )
+            return list(result.scalars().all())
+        except Exception as e:
+            raise DatabaseException(str(e)) from e
+
     async def create(self, employee_data: dict) -> Employee:
         try:
             existing_employee = await self.get_by_email(employee_data["email"])
@@ -84,6 +112,7 @@ class EmployeeRepository:
             await self._session.rollback()
             raise DatabaseException(f"Failed to update employee: {str(e)}") from e
 
+    @replica_read
     async def get_employee_with_skills(self, employee_id: int) -> Employee:
         try:
             query = (
@@ -101,3 +130,52 @@ class EmployeeRepository:
         except Exception as e:
             raise DatabaseException(str(e)) from e
 
+    async def search_by_skills(
+        self,
+        skill_ids: Collection[int],
+        category_ids: Optional[Collection[int]],
+        min_level: int,
+        department: Optional[str],
+        limit: int,
+        offset: int,
+    ) -> List[RowMapping]:
+        """
+        Employees holding any of the skills (or any skill under the categories) at min_level or above,
+        best matches first
+        """
+        try:
+            conditions = []
+            if skill_ids:
+                conditions.append(EmployeeSkill.skill_id.in_(list(skill_ids)))
+            if category_ids:
+                conditions.append(EmployeeSkill.skill_id.in_(skills_in_categories(category_ids)))
+            matches = (
+                select(
+                    EmployeeSkill.employee_id,
+                    func.count().label("matched_skills"),
+                    func.sum(EmployeeSkill.proficiency_level).label("proficiency_sum"),
+                )
+                .where(or_(*conditions), EmployeeSkill.proficiency_level >= min_level)
+                .group_by(EmployeeSkill.employee_id)
+                .subquery("matches")
+            )
+            query = (
+                select(
+                    Employee.id.label("employee_id"),
+                    Employee.first_name,
+                    Employee.last_name,
+                    Employee.department,
+                    matches.c.matched_skills,
+                    matches.c.proficiency_sum,
+                )
+                .join(matches, matches.c.employee_id == Employee.id)
+                .order_by(matches.c.matched_skills.desc(), matches.c.proficiency_sum.desc(), Employee.id)
+                .limit(limit)
+                .offset(offset)
+            )
+            if department is not None:
+                query = query.where(Employee.department == department)
+            result = await self._session.execute(query)
+            return list(result.mappings().all())
+        except Exception as e:
+            raise DatabaseException(f"Failed to search employees: {str(e)}") from e
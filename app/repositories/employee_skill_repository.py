@@ -3,14 +3,15 @@ from typing import List
 from sqlalchemy import delete
 from sqlalchemy import exists
 from sqlalchemy import select
+from sqlalchemy.engine import Row
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.common.exceptions import DatabaseException
 from app.common.exceptions import DuplicateSkillException
 from app.common.exceptions import IntegrityDataException
 from app.common.exceptions import SkillNotFoundException
+from app.database import replica_read
 from app.models import EmployeeSkill
 from app.models import Skill
 
@@ -79,15 +80,21 @@ class EmployeeSkillRepository:
         except Exception as e:
             raise DatabaseException(f"Failed to check employee skill existence: {str(e)}") from e
 
-    async def get_employee_skills(self, employee_id: int) -> List[EmployeeSkill]:
-        """Get all skills for an employee"""
+    @replica_read
+    async def get_employee_skills(self, employee_id: int) -> List[Row]:
+        """Get all skills for an employee, as the columns of EmployeeSkillResponseSchema"""
         try:
             result = await self._session.execute(
-                select(EmployeeSkill)
+                select(
+                    EmployeeSkill.skill_id,
+                    EmployeeSkill.proficiency_level,
+                    Skill.name.label("skill_name"),
+                    Skill.description.label("skill_description"),
+                )
+                .join(Skill, Skill.id == EmployeeSkill.skill_id)
                 .where(EmployeeSkill.employee_id == employee_id)
-                .options(selectinload(EmployeeSkill.skills))
             )
-            return list(result.scalars().all())
+            return list(result.all())
         except Exception as e:
             raise DatabaseException(f"Failed to get employee skills: {str(e)}") from e
 
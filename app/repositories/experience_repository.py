@@ -0,0 +1,116 @@
+from typing import Dict
+from typing import List
+from typing import Mapping
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Type
+
+from sqlalchemy import BigInteger
+from sqlalchemy import Integer
+from sqlalchemy import String
+from sqlalchemy import func
+from sqlalchemy import insert
+from sqlalchemy import literal
+from sqlalchemy import select
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.expression import TableValuedAlias
+from sqlalchemy.types import TypeEngine
+
+from app.models import Employee
+from app.models import ExperiencePoints
+from app.models import Level
+
+
+class XpChange(NamedTuple):
+    employee_id: int
+    points: int
+    total_xp: int
+    old_level_id: Optional[int]
+    new_level_id: Optional[int]
+    department: Optional[str]
+
+    @property
+    def level_changed(self) -> bool:
+        return self.old_level_id != self.new_level_id
+
+
+def level_for_xp(total_xp) -> object:
+    """Highest level reached with total_xp, as a scalar subquery"""
+    return (
+        select(Level.id)
+        .where(Level.min_xp <= total_xp)
+        .order_by(Level.min_xp.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+def unnest(name: str, **columns: Tuple[Sequence, Type[TypeEngine]]) -> TableValuedAlias:
+    """unnest(array, ...) AS name(column, ...) from parallel Python lists, one bind parameter per column"""
+    arrays = [literal(list(values), ARRAY(type_)) for values, type_ in columns.values()]
+    return func.unnest(*arrays).table_valued(*columns).render_derived(name=name)
+
+
+async def add_experience(
+    session: AsyncSession, employee_id: int, awards: Sequence[Tuple[int, str]]
+) -> Optional[XpChange]:
+    """
+    Record (points, action_type) awards and move total_xp and level_id along, inside the caller's
+    transaction (no commit). None if nothing was awarded.
+    """
+    changes = await add_experience_many(session, {employee_id: awards})
+    return changes[0] if changes else None
+
+
+async def add_experience_many(
+    session: AsyncSession, awards: Mapping[int, Sequence[Tuple[int, str]]]
+) -> List[XpChange]:
+    """Same as add_experience for many employees, with a constant number of statements"""
+    rows = [
+        (employee_id, points, action_type)
+        for employee_id, items in awards.items()
+        for points, action_type in items
+        if points > 0
+    ]
+    if not rows:
+        return []
+    employee_ids, points, action_types = (list(column) for column in zip(*rows, strict=True))
+    source = unnest(
+        "award",
+        employee_id=(employee_ids, BigInteger),
+        points=(points, Integer),
+        action_type=(action_types, String),
+    )
+    await session.execute(
+        insert(ExperiencePoints).from_select(
+            ["employee_id", "points", "action_type"],
+            select(source.c.employee_id, source.c.points, source.c.action_type),
+        )
+    )
+
+    totals: Dict[int, int] = {}
+    for employee_id, amount, _ in rows:
+        totals[employee_id] = totals.get(employee_id, 0) + amount
+    ids = sorted(totals)
+    # lock in id order first so the levels read here are the ones this update replaces
+    locked = await session.execute(
+        select(Employee.id, Employee.level_id).where(Employee.id.in_(ids)).order_by(Employee.id).with_for_update()
+    )
+    old_levels = dict(locked.tuples().all())
+
+    total = unnest("total", employee_id=(ids, BigInteger), points=([totals[i] for i in ids], Integer))
+    new_total = Employee.total_xp + total.c.points
+    result = await session.execute(
+        update(Employee)
+        .where(Employee.id == total.c.employee_id)
+        .values(total_xp=new_total, level_id=func.coalesce(level_for_xp(new_total), Employee.level_id))
+        .returning(Employee.id, Employee.total_xp, Employee.level_id, Employee.department)
+    )
+    return [
+        XpChange(employee_id, totals[employee_id], total_xp, old_levels.get(employee_id), level_id, department)
+        for employee_id, total_xp, level_id, department in result.all()
+    ]
@@ -0,0 +1,95 @@
+from datetime import timedelta
+
+from sqlalchemy import delete
+from sqlalchemy import func
+from sqlalchemy import insert
+from sqlalchemy import literal
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy.sql.expression import ColumnElement
+
+from app.common.exceptions import DatabaseException
+from app.common.logging import logger
+from app.models import Employee
+from app.models import EmployeeQuest
+from app.models import ExperiencePoints
+from app.models import Leaderboard
+from app.models import LeaderboardEntry
+
+# how far back XP counts for a leaderboard period, all-time (or anything else) has no limit
+PERIOD_WINDOWS = {
+    "weekly": timedelta(days=7),
+    "monthly": timedelta(days=30),
+}
+
+
+class LeaderboardRepository:
+    """
+    Leaderboard entries are derived data: score = sum(criterion weight * metric) over
+    xp (XP earned in the period), quests_completed (quests completed in the period, by
+    employee_quests.completed_at) and rating.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def rebuild_entries(self) -> int:
+        """Recompute scores and ranks of every active leaderboard, one INSERT ... SELECT per leaderboard"""
+        try:
+            result = await self._session.execute(
+                select(Leaderboard)
+                .where(Leaderboard.is_active.is_(True))
+                .options(selectinload(Leaderboard.criteria))
+            )
+            leaderboards = list(result.scalars().all())
+            await self._session.execute(
+                delete(LeaderboardEntry).where(LeaderboardEntry.leaderboard_id.in_([lb.id for lb in leaderboards]))
+            )
+            entries = 0
+            for leaderboard in leaderboards:
+                inserted = await self._session.execute(self._entries(leaderboard))
+                entries += inserted.rowcount
+            await self._session.commit()
+            return entries
+        except Exception as e:
+            await self._session.rollback()
+            raise DatabaseException(f"Failed to rebuild leaderboards: {str(e)}") from e
+
+    @staticmethod
+    def _entries(leaderboard: Leaderboard):
+        xp_earned = select(ExperiencePoints.employee_id, func.sum(ExperiencePoints.points).label("xp"))
+        # from employee_quests rather than the quest XP rows: quests with xp_reward 0 award no XP
+        quests_completed = select(EmployeeQuest.employee_id, func.count().label("quests_completed")).where(
+            EmployeeQuest.is_completed.is_(True)
+        )
+        window = PERIOD_WINDOWS.get(leaderboard.period)
+        if window is not None:
+            xp_earned = xp_earned.where(ExperiencePoints.created_at >= func.now() - window)
+            quests_completed = quests_completed.where(EmployeeQuest.completed_at >= func.now() - window)
+        earned = xp_earned.group_by(ExperiencePoints.employee_id).subquery("earned")
+        completed = quests_completed.group_by(EmployeeQuest.employee_id).subquery("completed")
+
+        metrics = {
+            "xp": func.coalesce(earned.c.xp, 0),
+            "quests_completed": func.coalesce(completed.c.quests_completed, 0),
+            "rating": Employee.rating,
+        }
+        score: ColumnElement[float] = literal(0.0)
+        for criterion in leaderboard.criteria:
+            metric = metrics.get(criterion.metric)
+            if metric is None:
+                logger.warning(f"Leaderboard {leaderboard.id}: unknown metric {criterion.metric} ignored")
+                continue
+            score = score + metric * criterion.weight
+        return insert(LeaderboardEntry).from_select(
+            ["leaderboard_id", "employee_id", "score", "rank"],
+            select(
+                literal(leaderboard.id),
+                Employee.id,
+                score,
+                func.rank().over(order_by=score.desc()),
+            )
+            .outerjoin(earned, earned.c.employee_id == Employee.id)
+            .outerjoin(completed, completed.c.employee_id == Employee.id),
+        )
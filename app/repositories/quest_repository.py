@@ -1,14 +1,38 @@
+from typing import Dict
 from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
 
+from sqlalchemy import BigInteger
+from sqlalchemy import Float
+from sqlalchemy import Integer
+from sqlalchemy import Numeric
+from sqlalchemy import case
+from sqlalchemy import cast
+from sqlalchemy import func
+from sqlalchemy import literal
 from sqlalchemy import select
+from sqlalchemy import update
+from sqlalchemy.engine import Row
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.common.exceptions import DatabaseException
 from app.common.exceptions import NotFoundException
+from app.database import replica_read
+from app.models import Employee
 from app.models import EmployeeQuest
 from app.models import Quest
+from app.repositories.domain_event_repository import QUEST_ASSIGNED
+from app.repositories.domain_event_repository import record_events
+from app.repositories.experience_repository import XpChange
+from app.repositories.experience_repository import add_experience
+from app.repositories.experience_repository import add_experience_many
+from app.repositories.experience_repository import unnest
+
+QUEST_XP_ACTION = "quest_complete"
 
 
 class QuestRepository:
@@ -26,11 +50,22 @@ class QuestRepository:
             await self._session.rollback()
             raise DatabaseException(f"Failed to create quest: {str(e)}") from e
 
-    async def get_all_quests(self) -> List[Quest]:
+    @replica_read
+    async def get_all_quests(self) -> List[Row]:
+        """Columns of QuestSchema, without loading Quest entities"""
         try:
-            query = select(Quest)
+            query = select(
+                Quest.id,
+                Quest.name,
+                Quest.description,
+                Quest.xp_reward,
+                Quest.action_type,
+                Quest.required_count,
+                Quest.is_active,
+                Quest.created_at,
+            )
             result = await self._session.execute(query)
-            return list(result.scalars().all())
+            return list(result.all())
         except Exception as e:
             raise DatabaseException(f"Failed to get quests: {str(e)}") from e
 
@@ -81,6 +116,7 @@ class QuestRepository:
                 is_completed=False
             )
             self._session.add(employee_quest)
+            await record_events(self._session, [(employee_id, QUEST_ASSIGNED, 1, quest_id)])
             await self._session.commit()
             await self._session.refresh(employee_quest)
             return employee_quest
@@ -88,18 +124,38 @@ class QuestRepository:
             await self._session.rollback()
             raise DatabaseException(f"Failed to assign quest: {str(e)}") from e
 
-    async def get_employee_quests(self, employee_id: int) -> List[EmployeeQuest]:
+    @replica_read
+    async def get_employee_quests(self, employee_id: int) -> List[Row]:
+        """Columns of EmployeeQuestProgressSchema, progress_percentage computed in the query"""
         try:
+            progress = case(
+                (
+                    Quest.required_count > 0,
+                    cast(func.round(cast(EmployeeQuest.current_count, Numeric) * 100 / Quest.required_count, 1), Float),
+                ),
+                else_=literal(0.0, Float),
+            )
             result = await self._session.execute(
-                select(EmployeeQuest)
+                select(
+                    EmployeeQuest.quest_id,
+                    Quest.name.label("quest_name"),
+                    EmployeeQuest.current_count,
+                    Quest.required_count,
+                    EmployeeQuest.is_completed,
+                    progress.label("progress_percentage"),
+                    Quest.xp_reward,
+                )
+                .join(Quest, Quest.id == EmployeeQuest.quest_id)
                 .where(EmployeeQuest.employee_id == employee_id)
-                .options(selectinload(EmployeeQuest.quest))
             )
-            return list(result.scalars().all())
+            return list(result.all())
         except Exception as e:
             raise DatabaseException(f"Failed to get employee quests: {str(e)}") from e
 
-    async def update_quest_progress(self, employee_id: int, action_type: str, count: int = 1) -> List[EmployeeQuest]:
+    async def update_quest_progress(
+        self, employee_id: int, action_type: str, count: int = 1
+    ) -> Tuple[List[EmployeeQuest], Optional[XpChange]]:
+        """Advance matching quests; XP of quests completed by this call is awarded in the same transaction"""
         try:
             # Find all active quests for this employee with matching action type
             result = await self._session.execute(
@@ -123,15 +179,90 @@ class QuestRepository:
                 # Check if completed
                 if new_count >= employee_quest.quest.required_count:
                     employee_quest.is_completed = True
+                    employee_quest.completed_at = func.now()  # type: ignore[assignment]
 
                 updated_quests.append(employee_quest)
 
+            await record_events(self._session, [(employee_id, action_type, count, None)])
+            xp = await add_experience(
+                self._session,
+                employee_id,
+                [(eq.quest.xp_reward, QUEST_XP_ACTION) for eq in updated_quests if eq.is_completed],
+            )
             await self._session.commit()
-            return updated_quests
+            return updated_quests, xp
         except Exception as e:
             await self._session.rollback()
             raise DatabaseException(f"Failed to update quest progress: {str(e)}") from e
 
+    async def existing_employee_ids(self, employee_ids: List[int]) -> List[int]:
+        try:
+            result = await self._session.execute(select(Employee.id).where(Employee.id.in_(employee_ids)))
+            return list(result.scalars().all())
+        except Exception as e:
+            raise DatabaseException(f"Failed to check employees: {str(e)}") from e
+
+    async def apply_progress_batch(
+        self, progress: Dict[str, Dict[int, int]], events: Sequence[Tuple[int, str, int]] = ()
+    ) -> Tuple[Dict[str, Sequence[Row]], List[XpChange]]:
+        """
+        Bulk version of update_quest_progress for {action_type: {employee_id: count}}: one UPDATE ... FROM
+        unnest(...) per action type, XP of completed quests, the (employee_id, action_type, count) events
+        appended to domain_events, a single commit. Returns the updated
+        employee_quests rows (employee_id, quest_id, name, current_count, required_count, is_completed,
+        xp_reward, department) by action type and the XP changes.
+        """
+        try:
+            rows: Dict[str, Sequence[Row]] = {}
+            for action_type, counts in progress.items():
+                employee_ids = sorted(counts)
+                source = unnest(
+                    "progress",
+                    employee_id=(employee_ids, BigInteger),
+                    count=([counts[i] for i in employee_ids], Integer),
+                )
+                new_count = func.least(EmployeeQuest.current_count + source.c.count, Quest.required_count)
+                result = await self._session.execute(
+                    update(EmployeeQuest)
+                    .where(
+                        EmployeeQuest.employee_id == source.c.employee_id,
+                        EmployeeQuest.quest_id == Quest.id,
+                        Employee.id == EmployeeQuest.employee_id,
+                        Quest.action_type == action_type,
+                        EmployeeQuest.is_completed.is_(False),
+                        Quest.is_active.is_(True),
+                    )
+                    .values(
+                        current_count=new_count,
+                        is_completed=new_count >= Quest.required_count,
+                        completed_at=case((new_count >= Quest.required_count, func.now())),
+                    )
+                    .returning(
+                        EmployeeQuest.employee_id,
+                        EmployeeQuest.quest_id,
+                        Quest.name,
+                        EmployeeQuest.current_count,
+                        Quest.required_count,
+                        EmployeeQuest.is_completed,
+                        Quest.xp_reward,
+                        Employee.department,
+                    )
+                )
+                rows[action_type] = result.all()
+
+            awards: Dict[int, List[Tuple[int, str]]] = {}
+            for updated in rows.values():
+                for row in updated:
+                    if row.is_completed:
+                        awards.setdefault(row.employee_id, []).append((row.xp_reward, QUEST_XP_ACTION))
+            xp = await add_experience_many(self._session, awards)
+            await record_events(self._session, [(*event, None) for event in events])
+            await self._session.commit()
+            return rows, xp
+        except Exception as e:
+            await self._session.rollback()
+            raise DatabaseException(f"Failed to apply quest progress batch: {str(e)}") from e
+
     async def get_quest_progress(self, employee_id: int, quest_id: int) -> EmployeeQuest:
         try:
             result = await self._session.execute(
@@ -174,6 +305,7 @@ class QuestRepository:
 
                 if new_count >= employee_quest.quest.required_count:
                     employee_quest.is_completed = True
+                    employee_quest.completed_at = func.now()  # type: ignore[assignment]
 
                 updated_quests.append(employee_quest)
 
@@ -0,0 +1,139 @@
+from typing import Optional
+from typing import Sequence
+
+from sqlalchemy import Float
+from sqlalchemy import Numeric
+from sqlalchemy import and_
+from sqlalchemy import case
+from sqlalchemy import cast
+from sqlalchemy import func
+from sqlalchemy import or_
+from sqlalchemy import select
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.common.exceptions import DatabaseException
+from app.models import EmployeeQuest
+from app.models import EmployeeRoadmap
+from app.models import EmployeeSkill
+from app.models import RoadmapQuest
+from app.models import RoadmapRequiredSkill
+
+
+class RoadmapRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def recalculate_progress(self, employee_ids: Optional[Sequence[int]] = None) -> int:
+        """
+        Recalculate progress_percentage and is_completed for employee roadmaps in one statement.
+
+        Progress is the mean of two components, each present only if the roadmap defines it:
+        skill coverage (proficiency / required_level, capped at 1, averaged over required skills)
+        and completed quests weighted by RoadmapQuest.importance.
+        Pass employee_ids to re-evaluate only those employees. Returns the number of changed rows.
+        """
+        try:
+            progress = self._progress_subquery(employee_ids)
+            stmt = (
+                update(EmployeeRoadmap)
+                .where(EmployeeRoadmap.id == progress.c.employee_roadmap_id)
+                .where(
+                    or_(
+                        EmployeeRoadmap.progress_percentage.is_distinct_from(progress.c.progress_percentage),
+                        EmployeeRoadmap.is_completed.is_distinct_from(progress.c.is_completed),
+                    )
+                )
+                .values(
+                    progress_percentage=progress.c.progress_percentage,
+                    is_completed=progress.c.is_completed,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            result = await self._session.execute(stmt)
+            await self._session.commit()
+            return result.rowcount
+        except Exception as e:
+            await self._session.rollback()
+            raise DatabaseException(f"Failed to recalculate roadmap progress: {str(e)}") from e
+
+    @staticmethod
+    def _progress_subquery(employee_ids: Optional[Sequence[int]]):
+        er = aliased(EmployeeRoadmap)
+
+        def scoped(query):
+            if employee_ids is not None:
+                query = query.where(er.employee_id.in_(list(employee_ids)))
+            return query
+
+        skill_scores = scoped(
+            select(
+                er.id.label("employee_roadmap_id"),
+                func.sum(
+                    case(
+                        (RoadmapRequiredSkill.required_level <= 0, 1.0),
+                        else_=func.least(
+                            cast(func.coalesce(EmployeeSkill.proficiency_level, 0), Float)
+                            / cast(RoadmapRequiredSkill.required_level, Float),
+                            1.0,
+                        ),
+                    )
+                ).label("covered"),
+                func.count(RoadmapRequiredSkill.id).label("total"),
+            )
+            .join(RoadmapRequiredSkill, RoadmapRequiredSkill.roadmap_id == er.roadmap_id)
+            .outerjoin(
+                EmployeeSkill,
+                and_(
+                    EmployeeSkill.employee_id == er.employee_id,
+                    EmployeeSkill.skill_id == RoadmapRequiredSkill.skill_id,
+                ),
+            )
+            .group_by(er.id)
+        ).subquery("skill_scores")
+
+        quest_done = EmployeeQuest.id.is_not(None)
+        quest_scores = scoped(
+            select(
+                er.id.label("employee_roadmap_id"),
+                func.sum(case((quest_done, RoadmapQuest.importance), else_=0.0)).label("done"),
+                func.sum(RoadmapQuest.importance).label("total"),
+                func.count().filter(and_(RoadmapQuest.is_required.is_(True), ~quest_done)).label("required_missing"),
+            )
+            .join(RoadmapQuest, RoadmapQuest.roadmap_id == er.roadmap_id)
+            .outerjoin(
+                EmployeeQuest,
+                and_(
+                    EmployeeQuest.employee_id == er.employee_id,
+                    EmployeeQuest.quest_id == RoadmapQuest.quest_id,
+                    EmployeeQuest.is_completed.is_(True),
+                ),
+            )
+            .group_by(er.id)
+        ).subquery("quest_scores")
+
+        skill_ratio = skill_scores.c.covered / func.nullif(skill_scores.c.total, 0)
+        quest_ratio = quest_scores.c.done / func.nullif(quest_scores.c.total, 0)
+        components = (
+            case((skill_ratio.is_not(None), 1), else_=0)
+            + case((quest_ratio.is_not(None), 1), else_=0)
+        )
+        raw_progress = func.coalesce(
+            100.0 * (func.coalesce(skill_ratio, 0.0) + func.coalesce(quest_ratio, 0.0)) / func.nullif(components, 0),
+            0.0,
+        )
+        progress_percentage = cast(func.round(cast(raw_progress, Numeric), 1), Float)
+
+        return scoped(
+            select(
+                er.id.label("employee_roadmap_id"),
+                progress_percentage.label("progress_percentage"),
+                and_(
+                    progress_percentage >= 100.0,
+                    func.coalesce(quest_scores.c.required_missing, 0) == 0,
+                ).label("is_completed"),
+            )
+            .outerjoin(skill_scores, skill_scores.c.employee_roadmap_id == er.id)
+            .outerjoin(quest_scores, quest_scores.c.employee_roadmap_id == er.id)
+        ).subquery("roadmap_progress")
@@ -0,0 +1,104 @@
+from typing import List
+from typing import Sequence
+
+from sqlalchemy import and_
+from sqlalchemy import case
+from sqlalchemy import delete
+from sqlalchemy import func
+from sqlalchemy import insert
+from sqlalchemy import or_
+from sqlalchemy import select
+from sqlalchemy import union
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.common.exceptions import DatabaseException
+from app.models import EmployeeRoadmap
+from app.models import EmployeeSkill
+from app.models import RoadmapRequiredSkill
+from app.models import Skill
+from app.models import SkillNeighbour
+
+INSERT_CHUNK_SIZE = 5000
+
+
+class SkillRecommendationRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def replace_neighbours(self, rows: Sequence[dict]) -> int:
+        """Atomically swap the whole neighbour table for a freshly computed one"""
+        try:
+            await self._session.execute(delete(SkillNeighbour))
+            for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+                await self._session.execute(insert(SkillNeighbour), rows[start:start + INSERT_CHUNK_SIZE])
+            await self._session.commit()
+            return len(rows)
+        except Exception as e:
+            await self._session.rollback()
+            raise DatabaseException(f"Failed to replace skill neighbours: {str(e)}") from e
+
+    async def get_recommendations(self, employee_id: int, limit: int, gap_boost: float) -> List[RowMapping]:
+        """
+        Merge the neighbour lists of the employee's skills (weighted by proficiency) and boost
+        skills their unfinished roadmaps require above the current level.
+        Reads only the neighbour rows of the employee's own skills via the primary key.
+        """
+        try:
+            owned = (
+                select(EmployeeSkill.skill_id, EmployeeSkill.proficiency_level)
+                .where(EmployeeSkill.employee_id == employee_id)
+                .cte("owned")
+            )
+            similar = (
+                select(
+                    SkillNeighbour.neighbour_skill_id.label("skill_id"),
+                    func.sum(SkillNeighbour.score * owned.c.proficiency_level).label("score"),
+                )
+                .join(owned, owned.c.skill_id == SkillNeighbour.skill_id)
+                .group_by(SkillNeighbour.neighbour_skill_id)
+                .cte("similar")
+            )
+            gaps = (
+                select(
+                    RoadmapRequiredSkill.skill_id,
+                    func.max(RoadmapRequiredSkill.required_level).label("required_level"),
+                )
+                .join(EmployeeRoadmap, EmployeeRoadmap.roadmap_id == RoadmapRequiredSkill.roadmap_id)
+                .where(EmployeeRoadmap.employee_id == employee_id, EmployeeRoadmap.is_completed.is_not(True))
+                .group_by(RoadmapRequiredSkill.skill_id)
+                .cte("gaps")
+            )
+            candidates = union(select(similar.c.skill_id), select(gaps.c.skill_id)).subquery("candidates")
+            total_proficiency = select(func.sum(owned.c.proficiency_level)).scalar_subquery()
+
+            is_gap = and_(
+                gaps.c.required_level.is_not(None),
+                func.coalesce(owned.c.proficiency_level, 0) < gaps.c.required_level,
+            )
+            score = (
+                func.coalesce(similar.c.score / func.nullif(total_proficiency, 0), 0.0)
+                + case((is_gap, gap_boost), else_=0.0)
+            )
+            query = (
+                select(
+                    Skill.id.label("skill_id"),
+                    Skill.name.label("skill_name"),
+                    score.label("score"),
+                    is_gap.label("roadmap_gap"),
+                    gaps.c.required_level,
+                    owned.c.proficiency_level.label("current_level"),
+                )
+                .select_from(candidates)
+                .join(Skill, Skill.id == candidates.c.skill_id)
+                .outerjoin(similar, similar.c.skill_id == candidates.c.skill_id)
+                .outerjoin(gaps, gaps.c.skill_id == candidates.c.skill_id)
+                .outerjoin(owned, owned.c.skill_id == candidates.c.skill_id)
+                .where(or_(owned.c.skill_id.is_(None), is_gap))
+                .order_by(score.desc(), Skill.id)
+                .limit(limit)
+            )
+            result = await self._session.execute(query)
+            return list(result.mappings().all())
+        except Exception as e:
+            raise DatabaseException(f"Failed to get skill recommendations: {str(e)}") from e
@@ -1,6 +1,10 @@
+from typing import List
 from typing import Optional
+from typing import Sequence
+from typing import Tuple
 
 from sqlalchemy import exists
+from sqlalchemy import func
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.exc import SQLAlchemyError
@@ -42,3 +46,40 @@ class SkillRepository:
             return bool(result.scalar())
         except SQLAlchemyError as e:
             raise DatabaseException(f"Failed to validate skill existence: {str(e)}") from e
+
+    async def get_by_ids(self, skill_ids: Sequence[int]) -> List[Skill]:
+        try:
+            result = await self._session.execute(select(Skill).where(Skill.id.in_(skill_ids)))
+            return list(result.scalars().all())
+        except SQLAlchemyError as e:
+            raise DatabaseException(f"Failed to get skills: {str(e)}") from e
+
+    async def get_catalog(self) -> List[Tuple[int, str, Optional[str]]]:
+        """(id, name, description) of every skill, for offline indexes"""
+        try:
+            result = await self._session.execute(
+                select(Skill.id, Skill.name, Skill.description).order_by(Skill.id)
+            )
+            return [tuple(row) for row in result.all()]
+        except SQLAlchemyError as e:
+            raise DatabaseException(f"Failed to get skill catalog: {str(e)}") from e
+
+    async def get_names(self) -> List[Tuple[int, str]]:
+        try:
+            result = await self._session.execute(select(Skill.id, Skill.name))
+            return [tuple(row) for row in result.all()]
+        except SQLAlchemyError as e:
+            raise DatabaseException(f"Failed to get skill names: {str(e)}") from e
+
+    async def autocomplete(self, prefix: str, limit: int) -> List[Tuple[int, str]]:
+        try:
+            key = func.lower(Skill.name)
+            result = await self._session.execute(
+                select(Skill.id, Skill.name)
+                .where(key.startswith(prefix.lower(), autoescape=True))
+                .order_by(key)
+                .limit(limit)
+            )
+            return [tuple(row) for row in result.all()]
+        except SQLAlchemyError as e:
+            raise DatabaseException(f"Failed to autocomplete skills: {str(e)}") from e
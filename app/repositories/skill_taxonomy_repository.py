@@ -0,0 +1,185 @@
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from sqlalchemy import Select
+from sqlalchemy import delete
+from sqlalchemy import exists
+from sqlalchemy import insert
+from sqlalchemy import literal
+from sqlalchemy import select
+from sqlalchemy import true
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.common.exceptions import DatabaseException
+from app.common.exceptions import IntegrityDataException
+from app.common.exceptions import NotFoundException
+from app.models import Skill
+from app.models import SkillCategory
+from app.models import SkillCategoryClosure
+
+
+def skills_in_categories(category_ids: Iterable[int]) -> Select:
+    """Ids of skills anywhere under the given categories, one join over the closure table"""
+    return (
+        select(Skill.id)
+        .join(SkillCategoryClosure, SkillCategoryClosure.descendant_id == Skill.category_id)
+        .where(SkillCategoryClosure.ancestor_id.in_(list(category_ids)))
+    )
+
+
+class SkillTaxonomyRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def create_category(self, name: str, parent_id: Optional[int] = None) -> SkillCategory:
+        category = SkillCategory(name=name, parent_id=parent_id)
+        try:
+            self._session.add(category)
+            await self._session.flush()
+            # the parent's ancestors become ancestors of the new node, plus the self row
+            inherited = select(
+                SkillCategoryClosure.ancestor_id,
+                literal(category.id),
+                SkillCategoryClosure.depth + 1,
+            ).where(SkillCategoryClosure.descendant_id == parent_id)
+            own = select(literal(category.id), literal(category.id), literal(0))
+            await self._session.execute(
+                insert(SkillCategoryClosure).from_select(
+                    ["ancestor_id", "descendant_id", "depth"], inherited.union_all(own)
+                )
+            )
+            await self._session.commit()
+            await self._session.refresh(category)
+            return category
+        except IntegrityError as e:
+            await self._session.rollback()
+            raise IntegrityDataException(str(e)) from e
+        except Exception as e:
+            await self._session.rollback()
+            raise DatabaseException(f"Failed to create skill category: {str(e)}") from e
+
+    async def move_categories(self, moves: Sequence[Tuple[int, Optional[int]]]) -> Optional[int]:
+        """
+        Reparent (category_id, new_parent_id) pairs in one transaction.
+        Each move rewrites the closure rows of the whole subtree with two set-based statements.
+        Returns the id of a category whose move would create a cycle (nothing is applied), else None.
+        """
+        try:
+            for category_id, parent_id in moves:
+                found = await self._session.scalar(
+                    select(exists().where(SkillCategory.id == category_id))
+                )
+                if not found:
+                    raise NotFoundException("Skill category", str(category_id))
+                if parent_id is not None and await self._session.scalar(
+                    select(exists().where(
+                        SkillCategoryClosure.ancestor_id == category_id,
+                        SkillCategoryClosure.descendant_id == parent_id,
+                    ))
+                ):
+                    await self._session.rollback()
+                    return category_id
+
+                subtree = select(SkillCategoryClosure.descendant_id).where(
+                    SkillCategoryClosure.ancestor_id == category_id
+                )
+                # detach the subtree from its old ancestors, keep paths inside it
+                await self._session.execute(
+                    delete(SkillCategoryClosure).where(
+                        SkillCategoryClosure.descendant_id.in_(subtree),
+                        SkillCategoryClosure.ancestor_id.not_in(subtree),
+                    )
+                )
+                if parent_id is not None:
+                    above = aliased(SkillCategoryClosure)
+                    below = aliased(SkillCategoryClosure)
+                    await self._session.execute(
+                        insert(SkillCategoryClosure).from_select(
+                            ["ancestor_id", "descendant_id", "depth"],
+                            select(above.ancestor_id, below.descendant_id, above.depth + below.depth + 1)
+                            .join(below, true())
+                            .where(above.descendant_id == parent_id, below.ancestor_id == category_id),
+                        )
+                    )
+                await self._session.execute(
+                    update(SkillCategory).where(SkillCategory.id == category_id).values(parent_id=parent_id)
+                )
+            await self._session.commit()
+            return None
+        except NotFoundException:
+            await self._session.rollback()
+            raise
+        except IntegrityError as e:
+            await self._session.rollback()
+            raise IntegrityDataException(str(e)) from e
+        except Exception as e:
+            await self._session.rollback()
+            raise DatabaseException(f"Failed to move skill categories: {str(e)}") from e
+
+    async def assign_skills(self, category_id: Optional[int], skill_ids: Sequence[int]) -> int:
+        try:
+            result = await self._session.execute(
+                update(Skill).where(Skill.id.in_(skill_ids)).values(category_id=category_id)
+            )
+            await self._session.commit()
+            return result.rowcount
+        except IntegrityError as e:
+            await self._session.rollback()
+            raise IntegrityDataException(str(e)) from e
+        except Exception as e:
+            await self._session.rollback()
+            raise DatabaseException(f"Failed to assign skills to category: {str(e)}") from e
+
+    async def rebuild_closure(self) -> int:
+        """Recompute the whole closure table from parent_id, e.g. after bulk imports"""
+        try:
+            paths = (
+                select(
+                    SkillCategory.id.label("ancestor_id"),
+                    SkillCategory.id.label("descendant_id"),
+                    literal(0).label("depth"),
+                )
+                .cte("paths", recursive=True)
+            )
+            paths = paths.union_all(
+                select(paths.c.ancestor_id, SkillCategory.id, paths.c.depth + 1)
+                .join(SkillCategory, SkillCategory.parent_id == paths.c.descendant_id)
+            )
+            await self._session.execute(delete(SkillCategoryClosure))
+            result = await self._session.execute(
+                insert(SkillCategoryClosure).from_select(
+                    ["ancestor_id", "descendant_id", "depth"],
+                    select(paths.c.ancestor_id, paths.c.descendant_id, paths.c.depth),
+                )
+            )
+            await self._session.commit()
+            return result.rowcount
+        except Exception as e:
+            await self._session.rollback()
+            raise DatabaseException(f"Failed to rebuild skill category closure: {str(e)}") from e
+
+    async def get_categories(self) -> List[Tuple[int, str, Optional[int]]]:
+        try:
+            result = await self._session.execute(
+                select(SkillCategory.id, SkillCategory.name, SkillCategory.parent_id).order_by(SkillCategory.name)
+            )
+            return [tuple(row) for row in result.all()]
+        except Exception as e:
+            raise DatabaseException(f"Failed to get skill categories: {str(e)}") from e
+
+    async def get_categorized_skills(self) -> List[Tuple[int, int]]:
+        """(skill_id, category_id) of every skill placed in the taxonomy"""
+        try:
+            result = await self._session.execute(
+                select(Skill.id, Skill.category_id).where(Skill.category_id.is_not(None))
+            )
+            return [tuple(row) for row in result.all()]
+        except Exception as e:
+            raise DatabaseException(f"Failed to get categorized skills: {str(e)}") from e
+
@@ -0,0 +1,80 @@
+from typing import Optional
+
+from fastapi import APIRouter
+from fastapi import Depends
+from fastapi import Query
+from starlette import status
+
+from app.dependencies import get_single_flight_service
+from app.dependencies import get_slow_query_service
+from app.dependencies import require_admin
+from app.schemas import SingleFlightReportSchema
+from app.schemas import SlowQueryReportSchema
+from app.services.single_flight_service import SingleFlightService
+from app.services.slow_query_service import SlowQueryService
+
+router = APIRouter(
+    prefix="/admin/v1",
+    tags=["admin"],
+    dependencies=[Depends(require_admin)],
+)
+
+
+@router.get("/slow-queries", response_model=SlowQueryReportSchema)
+async def get_slow_queries(
+    limit: int = Query(50, ge=1, le=500, description="Максимальное число групп"),
+    fingerprint: Optional[str] = Query(None, description="Только запросы с этим отпечатком"),
+    service: SlowQueryService = Depends(get_slow_query_service),
+):
+    """
+    Slow SQL statements of this worker, grouped by fingerprint
+
+    ## Params
+    - **limit**: максимальное число групп, по убыванию суммарного времени
+    - **fingerprint**: отпечаток запроса (форма запроса без значений параметров)
+
+    ## Returns:
+    - **groups**: число вызовов, суммарное, среднее и максимальное время, типы параметров
+    и планы выполнения (`EXPLAIN`), снятые для части вызовов
+
+    Значения параметров не сохраняются. Требуется заголовок `X-Admin-Key`.
+    """
+    return service.get_report(limit, fingerprint)
+
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_slow_queries(service: SlowQueryService = Depends(get_slow_query_service)):
+    """
+    Clear the slow query buffer of this worker
+    """
+    service.clear()
+
+
+@router.get("/single-flight", response_model=SingleFlightReportSchema)
+async def get_single_flight_stats(
+    limit: int = Query(50, ge=1, le=1000, description="Максимальное число ключей"),
+    name: Optional[str] = Query(None, description="Только ключи этого метода, например quests.employee"),
+    service: SingleFlightService = Depends(get_single_flight_service),
+):
+    """
+    Coalesced read calls of this worker by key
+
+    ## Params
+    - **limit**: максимальное число ключей, по убыванию числа вызовов
+    - **name**: имя метода (`quests.all`, `quests.employee`, `employee.skills`, `employee.profile`)
+
+    ## Returns:
+    - **keys**: для каждого ключа – число вызовов, ответов из микрокэша (`hits`), вызовов, дождавшихся
+    уже выполняющегося запроса (`coalesced`), и обращений к БД (`loads`)
+
+    Учитываются последние `SINGLE_FLIGHT_TRACKED_KEYS` ключей. Требуется заголовок `X-Admin-Key`.
+    """
+    return service.get_report(limit, name)
+
+
+@router.delete("/single-flight", status_code=status.HTTP_204_NO_CONTENT)
+async def reset_single_flight_stats(service: SingleFlightService = Depends(get_single_flight_service)):
+    """
+    Reset the per-key counters of this worker
+    """
+    service.reset()
@@ -0,0 +1,43 @@
+from typing import Optional
+
+from fastapi import APIRouter
+from fastapi import Depends
+from fastapi import HTTPException
+from fastapi import Query
+from starlette import status
+
+from app.common.exceptions import ServiceException
+from app.dependencies import get_analytics_service
+from app.schemas import SkillGapHeatmapSchema
+from app.services.analytics_service import AnalyticsService
+
+router = APIRouter(
+    prefix="/analytics/v1",
+    tags=["analytics"],
+)
+
+
+@router.get("/skill-gaps", response_model=SkillGapHeatmapSchema)
+async def get_skill_gap_heatmap(
+    department: Optional[str] = Query(None, description="Ограничить матрицу одним отделом"),
+    service: AnalyticsService = Depends(get_analytics_service),
+):
+    """
+    Skill gap heatmap: department x skill
+
+    ## Returns:
+    - **cells**: покрытие и средний уровень навыка в отделе
+    - **by_department**: агрегаты по отделам
+    - **by_skill**: агрегаты по навыкам во всей организации
+    - **total**: итог по организации
+
+    `coverage` – доля требований (дорожные карты и активные проекты), закрытых на требуемом уровне.
+    Данные читаются из предрассчитанного представления, время последнего обновления – `refreshed_at`.
+    """
+    try:
+        return await service.get_skill_gap_heatmap(department)
+    except ServiceException as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        ) from None
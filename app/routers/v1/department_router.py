@@ -0,0 +1,39 @@
+from typing import List
+
+from fastapi import APIRouter
+from fastapi import Depends
+from fastapi import HTTPException
+from starlette import status
+
+from app.common.exceptions import ServiceException
+from app.common.fast_json import RawJSONResponse
+from app.dependencies import get_department_stats_service
+from app.schemas import DepartmentStatsSchema
+from app.services.department_stats_service import DepartmentStatsService
+
+router = APIRouter(
+    prefix="/departments/v1",
+    tags=["departments"],
+)
+
+
+@router.get("/stats", response_model=List[DepartmentStatsSchema])
+async def get_department_stats(
+    service: DepartmentStatsService = Depends(get_department_stats_service),
+):
+    """
+    Dashboard statistics per department
+
+    ## Returns:
+    Численность, средний рейтинг, средний `total_xp`, доля выполненных квестов
+    и распределение сотрудников по уровням для каждого отдела.
+    Данные читаются из предрассчитанной таблицы `department_stats` и кэшируются
+    на `DEPARTMENT_STATS_CACHE_TTL_SECONDS` секунд.
+    """
+    try:
+        return RawJSONResponse(await service.get_stats_json())
+    except ServiceException as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        ) from None
@@ -1,23 +1,45 @@
+from typing import List
+from typing import Optional
+
 from fastapi import APIRouter
 from fastapi import Depends
 from fastapi import HTTPException
+from fastapi import Query
+from fastapi import Response
 from starlette import status
 
 from app.common.exceptions import DatabaseException
 from app.common.exceptions import DuplicateEmployeeException
+from app.common.exceptions import ExternalServiceException
+from app.common.exceptions import IndexNotReadyException
 from app.common.exceptions import IntegrityDataException
 from app.common.exceptions import NotFoundException
 from app.common.exceptions import ServiceException
+from app.common.fast_json import RawJSONResponse
+from app.dependencies import get_ai_consultant_service
+from app.dependencies import get_employee_context_service
 from app.dependencies import get_employee_service
 from app.dependencies import get_quest_service
+from app.dependencies import get_similar_employee_service
+from app.dependencies import get_skill_recommendation_service
+from app.schemas import AdviceRequestSchema
+from app.schemas import AdviceSchema
+from app.schemas import EmployeeContextSchema
 from app.schemas import EmployeeCreateSchema
+from app.schemas import EmployeeMatchSchema
 from app.schemas import EmployeeSchema
 from app.schemas import EmployeeUpdateSchema
 from app.schemas import EmployeeWithSkillsSchema
 from app.schemas import ProfileCompletionSchema
 from app.schemas import QuestEventSchema
+from app.schemas import RecommendedSkillSchema
+from app.schemas import SimilarEmployeeSchema
+from app.services.ai_consultant_service import AIConsultantService
+from app.services.employee_context_service import EmployeeContextService
 from app.services.employee_service import EmployeeService
 from app.services.quest_service import QuestService
+from app.services.similar_employee_service import SimilarEmployeeService
+from app.services.skill_recommendation_service import SkillRecommendationService
 
 router = APIRouter(
     prefix="/employees/v1",
@@ -46,6 +68,38 @@ async def create_employee(
         ) from None
 
 
+@router.get("/search", response_model=List[EmployeeMatchSchema])
+async def search_employees(
+    skill_ids: Optional[List[int]] = Query(None, description="Skills, any of them matches"),
+    category_ids: Optional[List[int]] = Query(None, description="Skill categories, expanded to every skill below them"),
+    min_level: int = Query(1, ge=1, le=10),
+    department: Optional[str] = Query(None, max_length=100),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    service: EmployeeService = Depends(get_employee_service),
+):
+    """
+    Search employees by skills and skill categories
+
+    ## Returns:
+    Сотрудники, владеющие хотя бы одним из навыков `skill_ids` или любым навыком из поддеревьев
+    категорий `category_ids` на уровне не ниже `min_level`. Сначала идут сотрудники с наибольшим
+    числом совпавших навыков, затем с наибольшей суммой уровней.
+    """
+    if not skill_ids and not category_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide skill_ids or category_ids"
+        )
+    try:
+        return await service.search_by_skills(skill_ids, category_ids, min_level, department, limit, offset)
+    except ServiceException as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        ) from None
+
+
 # @router.get("/me", response_model=EmployeeWithSkillsSchema)
 # async def get_employee_profile(
 #     employee_id: int,
@@ -94,8 +148,7 @@ async def get_employee(
 ):
     """Get employee by ID"""
     try:
-        employee = await service.get_employee_by_id(employee_id)
-        return employee
+        return RawJSONResponse(await service.get_employee_json(employee_id))
     except NotFoundException as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -107,6 +160,71 @@ async def get_employee(
             detail=str(e)
         ) from None
 
+@router.get(
+    "/{employee_id}/context",
+    response_class=Response,
+    responses={200: {"model": EmployeeContextSchema, "content": {"application/json": {}}}},
+)
+async def get_employee_context(
+    employee_id: int,
+    service: EmployeeContextService = Depends(get_employee_context_service),
+):
+    """
+    Everything an HR consultant needs about the employee in one response
+
+    ## Returns:
+    Профиль, навыки, квесты с прогрессом, роадмапы, награды, уровень и последние начисления XP.
+    Документ собирается одним SQL-запросом (агрегация в JSON на стороне PostgreSQL) и хранится
+    в кэше воркера до изменения профиля, навыков, квестов или роадмапов сотрудника
+    (`EMPLOYEE_CONTEXT_CACHE_TTL_SECONDS`, `EMPLOYEE_CONTEXT_CACHE_SIZE`).
+    """
+    try:
+        blob = await service.get_context(employee_id)
+    except NotFoundException as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        ) from None
+    except ServiceException as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        ) from None
+    return Response(content=blob, media_type="application/json")
+
+@router.post("/{employee_id}/advice", response_model=AdviceSchema)
+async def get_advice(
+    employee_id: int,
+    request: AdviceRequestSchema,
+    service: AIConsultantService = Depends(get_ai_consultant_service),
+):
+    """
+    Ask the AI consultant about the employee's development
+
+    ## Returns:
+    Ответ внешнего AI-консультанта (`AI_CONSULTANT_URL`) на вопрос с учетом контекста сотрудника
+    (тот же документ, что и `GET /employees/v1/{employee_id}/context`). Одинаковые вопросы
+    отвечаются из кэша; если консультант недоступен (размыкатель открыт после серии ошибок),
+    возвращается заглушка с `fallback=true`.
+    """
+    try:
+        return await service.advise(employee_id, request.question)
+    except NotFoundException as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        ) from None
+    except ExternalServiceException as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        ) from None
+    except ServiceException as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        ) from None
+
 @router.get(
     "/{employee_id}/completion",
     response_model=ProfileCompletionSchema,
@@ -134,3 +252,57 @@ async def calculate_profile_completion(
         raise HTTPException(status_code=404, detail=str(e)) from None
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to calculate completion: {str(e)}") from None
+
+
+@router.get("/{employee_id}/recommended-skills", response_model=List[RecommendedSkillSchema])
+async def get_recommended_skills(
+    employee_id: int,
+    limit: int = Query(10, ge=1, le=100),
+    service: SkillRecommendationService = Depends(get_skill_recommendation_service),
+):
+    """
+    Skills to learn next
+
+    ## Returns:
+    Навыки, которые чаще всего встречаются вместе с навыками сотрудника (соседи из таблицы
+    `skill_neighbours`, взвешенные по уровню владения), с приоритетом для навыков,
+    требуемых незавершёнными роадмапами выше текущего уровня.
+    Соседей пересчитывает `python -m app.jobs.skill_recommendations`.
+    """
+    try:
+        return await service.recommend(employee_id, limit)
+    except ServiceException as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        ) from None
+
+
+@router.get("/{employee_id}/similar", response_model=List[SimilarEmployeeSchema])
+async def get_similar_employees(
+    employee_id: int,
+    limit: int = Query(10, ge=1, le=100),
+    approximate: bool = Query(False, description="Use the LSH index if it is published"),
+    service: SimilarEmployeeService = Depends(get_similar_employee_service),
+):
+    """
+    Employees with the most similar skill profiles
+
+    ## Returns:
+    Ближайшие соседи по косинусному сходству векторов навыков (уровни владения) – для подбора
+    наставников и замены. Поиск идет по общей матрице навыков из `SHARED_MATRIX_DIR`;
+    `approximate=true` использует LSH-индекс (`python -m app.jobs.build_skill_matrix --lsh`),
+    без него выполняется точный перебор.
+    """
+    try:
+        return await service.find_similar(employee_id, limit, approximate)
+    except IndexNotReadyException as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        ) from None
+    except ServiceException as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        ) from None
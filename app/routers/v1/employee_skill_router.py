@@ -8,6 +8,7 @@ from starlette import status
 from app.common.exceptions import DuplicateSkillException
 from app.common.exceptions import ServiceException
 from app.common.exceptions import SkillNotFoundException
+from app.common.fast_json import RawJSONResponse
 from app.dependencies import get_employee_skill_service
 from app.schemas import EmployeeSkillCreateSchema
 from app.schemas import EmployeeSkillResponseSchema
@@ -68,8 +69,7 @@ async def get_employee_skills(
 ):
     """Get all skills for an employee"""
     try:
-        skills = await service.get_employee_skills(employee_id)
-        return skills
+        return RawJSONResponse(await service.get_employee_skills(employee_id))
     except ServiceException as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -0,0 +1,109 @@
+import json
+from typing import AsyncIterator
+
+from fastapi import APIRouter
+from fastapi import Depends
+from fastapi import HTTPException
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from starlette import status
+
+from app.common.config import settings
+from app.common.exceptions import ServiceException
+from app.common.exceptions import StreamLimitException
+from app.dependencies import get_event_batch_service
+from app.events.live_events import live_events
+from app.schemas import QuestEventBatchResultSchema
+from app.schemas import QuestEventBatchSchema
+from app.services.event_batch_service import EventBatchService
+
+router = APIRouter(
+    prefix="/events/v1",
+    tags=["events"],
+)
+
+SSE_RETRY_MS = 3000
+
+
+def _format_event(event_id: int, event_type: str, data: dict) -> str:
+    head = f"id: {event_id}\n" if event_id else ""
+    return f"{head}event: {event_type}\ndata: {json.dumps(data, separators=(',', ':'), default=str)}\n\n"
+
+
+async def _event_stream(request: Request, employee_id: int) -> AsyncIterator[str]:
+    # subscribe only once the response is being sent, so an aborted request leaves nothing behind
+    try:
+        subscription = live_events.subscribe(employee_id)
+    except StreamLimitException:
+        return
+    try:
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        while True:
+            event = await subscription.next(settings.EVENT_STREAM_HEARTBEAT_SECONDS)
+            if event is None:
+                if await request.is_disconnected():
+                    break
+                # comment line keeps proxies from closing an idle connection
+                yield ": keepalive\n\n"
+                continue
+            yield _format_event(*event)
+    finally:
+        live_events.unsubscribe(subscription)
+
+
+@router.get("/stream/{employee_id}", response_class=StreamingResponse)
+async def stream_employee_events(employee_id: int, request: Request):
+    """
+    Live quest progress, completions, XP and level changes of an employee (Server-Sent Events)
+
+    ## Returns:
+    Поток `text/event-stream` с событиями `quest_progress`, `quest_completed` (данные как в
+    `GET /quests/v1/employee/{employee_id}`), `xp_awarded` (`points`, `total_xp`) и `level_up`
+    (`old_level_id`, `level_id`). Событие `resync` означает, что часть событий потеряна
+    (клиент не успевал читать или воркер переподключался к БД) и состояние нужно перечитать
+    обычными запросами. Раз в `EVENT_STREAM_HEARTBEAT_SECONDS` отправляется комментарий keepalive.
+    """
+    if not live_events.has_capacity():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many open event streams, try again later"
+        )
+    return StreamingResponse(
+        _event_stream(request, employee_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/batch", response_model=QuestEventBatchResultSchema)
+async def ingest_event_batch(
+    batch: QuestEventBatchSchema,
+    service: EventBatchService = Depends(get_event_batch_service),
+):
+    """
+    Apply many quest events (e.g. `complete_project` from project tracking or LMS) in one request
+
+    ## Params
+    - **events**: Список событий в формате `{"employee_id": 1, "action_type": "complete_project", "count": 1}`,
+    не более `EVENT_BATCH_MAX_SIZE`. События одного сотрудника с одним `action_type` суммируются,
+    весь батч применяется одной транзакцией.
+
+    ## Returns:
+    Итоги по батчу (сколько событий применено, сколько квестов продвинуто и завершено, сколько XP
+    начислено) и результат для каждого события по его позиции `index`: `applied`, `no_matching_quests`
+    (у сотрудника нет активных незавершенных квестов этого типа) или `unknown_employee`. Счетчики
+    `quests_updated` / `quests_completed` группы событий одного сотрудника с одним `action_type` указаны
+    у первого события группы, у остальных – 0, так что их сумма совпадает с итогами батча.
+    """
+    if len(batch.events) > settings.EVENT_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.EVENT_BATCH_MAX_SIZE} events per batch"
+        )
+    try:
+        return await service.handle_batch(batch.events)
+    except ServiceException as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        ) from None
@@ -7,6 +7,7 @@ from fastapi import status
 
 from app.common.exceptions import NotFoundException
 from app.common.exceptions import ServiceException
+from app.common.fast_json import RawJSONResponse
 from app.dependencies import get_quest_service
 from app.schemas import AssignQuestSchema
 from app.schemas import EmployeeQuestProgressSchema
@@ -91,7 +92,7 @@ async def get_all_quests(
     ```
     """
     try:
-        return await service.get_all_quests()
+        return RawJSONResponse(await service.get_all_quests())
     except ServiceException as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -172,7 +173,7 @@ async def get_employee_quests(
     - 500: Внутренняя ошибка сервера
     """
     try:
-        return await service.get_employee_quests(employee_id)
+        return RawJSONResponse(await service.get_employee_quests(employee_id))
     except ServiceException as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -0,0 +1,123 @@
+from typing import List
+
+from fastapi import APIRouter
+from fastapi import Depends
+from fastapi import HTTPException
+from starlette import status
+
+from app.common.exceptions import DatabaseException
+from app.common.exceptions import IntegrityDataException
+from app.common.exceptions import NotFoundException
+from app.common.exceptions import ValidationException
+from app.dependencies import get_skill_taxonomy_service
+from app.schemas import SkillCategoryAssignSchema
+from app.schemas import SkillCategoryCreateSchema
+from app.schemas import SkillCategoryMovesSchema
+from app.schemas import SkillCategorySchema
+from app.schemas import SkillCategoryTreeSchema
+from app.services.skill_taxonomy_service import SkillTaxonomyService
+
+router = APIRouter(
+    prefix="/skill-categories/v1",
+    tags=["skill categories"],
+)
+
+
+@router.post("/", response_model=SkillCategorySchema, status_code=status.HTTP_201_CREATED)
+async def create_category(
+    category_data: SkillCategoryCreateSchema,
+    service: SkillTaxonomyService = Depends(get_skill_taxonomy_service),
+):
+    """Create a skill category, optionally under a parent"""
+    try:
+        return await service.create_category(category_data.name, category_data.parent_id)
+    except IntegrityDataException as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        ) from None
+    except DatabaseException as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        ) from None
+
+
+@router.get("/tree", response_model=List[SkillCategoryTreeSchema])
+async def get_category_tree(
+    service: SkillTaxonomyService = Depends(get_skill_taxonomy_service),
+):
+    """
+    Whole skill taxonomy
+
+    ## Returns:
+    Дерево категорий с навыками, привязанными к каждой категории. Отдается из копии дерева
+    в памяти воркера.
+    """
+    try:
+        return await service.get_tree()
+    except DatabaseException as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        ) from None
+
+
+@router.post("/move", status_code=status.HTTP_200_OK)
+async def move_categories(
+    moves_data: SkillCategoryMovesSchema,
+    service: SkillTaxonomyService = Depends(get_skill_taxonomy_service),
+):
+    """
+    Move categories to new parents
+
+    ## Params:
+    - **moves**: список пар `category_id` → `parent_id` (`null` – сделать корнем)
+
+    Все перемещения применяются в одной транзакции; таблица замыканий перестраивается
+    только для перемещаемых поддеревьев.
+
+    ## Errors:
+    - 400: Категорию нельзя переместить внутрь собственного поддерева
+    - 404: Категория не найдена
+    """
+    try:
+        await service.move_categories([(move.category_id, move.parent_id) for move in moves_data.moves])
+        return {"message": "Skill categories moved successfully"}
+    except ValidationException as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        ) from None
+    except NotFoundException as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        ) from None
+    except (DatabaseException, IntegrityDataException) as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        ) from None
+
+
+@router.put("/{category_id}/skills", status_code=status.HTTP_200_OK)
+async def assign_skills(
+    category_id: int,
+    assign_data: SkillCategoryAssignSchema,
+    service: SkillTaxonomyService = Depends(get_skill_taxonomy_service),
+):
+    """Place skills into a category (a skill belongs to one category)"""
+    try:
+        updated = await service.assign_skills(category_id, assign_data.skill_ids)
+        return {"updated": updated}
+    except IntegrityDataException as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        ) from None
+    except DatabaseException as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        ) from None
@@ -1,14 +1,21 @@
+from typing import List
+
 from fastapi import APIRouter
 from fastapi import Depends
 from fastapi import HTTPException
+from fastapi import Query
 from starlette import status
 
 from app.common.exceptions import DatabaseException
 from app.common.exceptions import DuplicateSkillException
+from app.common.exceptions import IndexNotReadyException
 from app.common.exceptions import IntegrityDataException
+from app.common.exceptions import SimilarSkillException
 from app.dependencies import get_skill_service
 from app.schemas import SkillCreateSchema
 from app.schemas import SkillSchema
+from app.schemas import SkillSearchResultSchema
+from app.schemas import SkillSuggestionSchema
 from app.services.skill_service import SkillService
 
 router = APIRouter(
@@ -20,15 +27,16 @@ router = APIRouter(
 @router.post("/", response_model=SkillSchema, status_code=status.HTTP_201_CREATED)
 async def create_skill(
     skill_data: SkillCreateSchema,
+    allow_similar: bool = Query(False, description="Skip the near-duplicate check"),
     service: SkillService = Depends(get_skill_service),
 ):
     """Create a new skill"""
     try:
         skill = await service.create(
-            name=skill_data.name, description=skill_data.description
+            name=skill_data.name, description=skill_data.description, allow_similar=allow_similar
         )
         return skill
-    except DuplicateSkillException as e:
+    except (DuplicateSkillException, SimilarSkillException) as e:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=str(e)
@@ -38,3 +46,53 @@ async def create_skill(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
         ) from None
+
+
+@router.get("/autocomplete", response_model=List[SkillSuggestionSchema])
+async def autocomplete_skills(
+    prefix: str = Query(..., min_length=1, max_length=60, examples=["doc"]),
+    limit: int = Query(10, ge=1, le=50),
+    service: SkillService = Depends(get_skill_service),
+):
+    """
+    Skill name autocomplete
+
+    ## Returns:
+    Навыки, название которых начинается с `prefix` (без учета регистра), по алфавиту.
+    Отвечает из каталога навыков в памяти воркера без обращения к БД.
+    """
+    try:
+        return await service.autocomplete(prefix, limit)
+    except DatabaseException as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        ) from None
+
+
+@router.get("/search", response_model=List[SkillSearchResultSchema])
+async def search_skills(
+    q: str = Query(..., min_length=1, max_length=200, examples=["docker compose"]),
+    limit: int = Query(10, ge=1, le=50),
+    service: SkillService = Depends(get_skill_service),
+):
+    """
+    Fuzzy skill search
+
+    ## Returns:
+    Навыки, ранжированные по сходству символьных n-грамм названия и описания с запросом
+    (TF-IDF, косинусная мера), поэтому находятся варианты написания вроде "docker compose"
+    для "Docker-compose/Docker". Индекс строит `python -m app.jobs.build_skill_search_index`.
+    """
+    try:
+        return await service.search(q, limit)
+    except IndexNotReadyException as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        ) from None
+    except DatabaseException as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        ) from None
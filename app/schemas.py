@@ -1,4 +1,6 @@
 from datetime import datetime
+from typing import Any
+from typing import Dict
 from typing import List
 from typing import Optional
 
@@ -30,6 +32,15 @@ class GetSkillSchema(SkillSchema):
     pass
 
 
+class SkillSuggestionSchema(BaseModel):
+    id: int
+    name: str
+
+
+class SkillSearchResultSchema(SkillSchema):
+    score: float = Field(..., ge=0, le=1, examples=[0.8], description="Cosine similarity to the query")
+
+
 class EmployeeBaseSchema(BaseModel):
     email: EmailStr = Field(..., examples=["john.doe@example.com"], description="Email address of the employee")
     first_name: str = Field(..., max_length=50, examples=["John"], description="First name of the employee")
@@ -130,3 +141,215 @@ class QuestEventSchema(BaseModel):
     employee_id: int
     action_type: str
     count: int = Field(default=1, ge=1)
+
+
+class QuestEventBatchSchema(BaseModel):
+    events: List[QuestEventSchema] = Field(..., min_length=1)
+
+
+class QuestEventResultSchema(BaseModel):
+    index: int = Field(..., description="Position of the event in the request")
+    status: str = Field(..., description="applied, no_matching_quests or unknown_employee")
+    quests_updated: int = Field(
+        default=0,
+        description="Quests of the employee advanced by this action type; reported on the first event of the "
+                    "(action_type, employee_id) in the request, 0 on the following ones",
+    )
+    quests_completed: int = Field(
+        default=0,
+        description="Quests of the employee completed by this action type; reported on the first event of the "
+                    "(action_type, employee_id) in the request, 0 on the following ones",
+    )
+
+
+class QuestEventBatchResultSchema(BaseModel):
+    received: int
+    applied: int
+    no_matching_quests: int
+    unknown_employee: int
+    quests_updated: int
+    quests_completed: int
+    xp_awarded: int
+    results: List[QuestEventResultSchema]
+
+class SkillGapCellSchema(BaseModel):
+    department: Optional[str] = Field(None, description="Department, empty for organization-wide rollups")
+    skill_id: Optional[int] = Field(None, description="Skill, empty for department-wide rollups")
+    skill_name: Optional[str] = None
+    headcount: int = Field(..., description="Employees in the department (or organization)")
+    holders: int = Field(..., description="Employee-skill pairs where the skill is held")
+    avg_proficiency: Optional[float] = None
+    required_count: int = Field(..., description="Employee-skill pairs required by roadmaps and projects")
+    met_count: int = Field(..., description="Required pairs where proficiency reaches the required level")
+    coverage: Optional[float] = Field(None, ge=0, le=1, examples=[0.75])
+    avg_required_level: Optional[float] = None
+
+class SkillGapHeatmapSchema(BaseModel):
+    cells: List[SkillGapCellSchema] = Field(default_factory=list)
+    by_department: List[SkillGapCellSchema] = Field(default_factory=list)
+    by_skill: List[SkillGapCellSchema] = Field(default_factory=list)
+    total: Optional[SkillGapCellSchema] = None
+    refreshed_at: Optional[datetime] = None
+
+class DepartmentStatsSchema(BaseModel):
+    department: str = Field(..., examples=["IT"])
+    headcount: int = Field(..., ge=0, examples=[42])
+    avg_rating: float = Field(..., examples=[4.1])
+    avg_total_xp: float = Field(..., examples=[1250.0])
+    quests_assigned: int = Field(..., ge=0)
+    quests_completed: int = Field(..., ge=0)
+    quest_completion_rate: float = Field(..., ge=0, le=1, examples=[0.63])
+    level_distribution: Dict[str, int] = Field(
+        default_factory=dict, examples=[{"1": 10, "2": 25, "none": 7}], description="Employees per level id"
+    )
+    updated_at: datetime
+
+class RecommendedSkillSchema(BaseModel):
+    skill_id: int
+    skill_name: str
+    score: float = Field(..., ge=0, examples=[0.82])
+    roadmap_gap: bool = Field(False, description="Required by an unfinished roadmap above the current level")
+    required_level: Optional[int] = None
+    current_level: Optional[int] = None
+
+class SimilarEmployeeSchema(BaseModel):
+    employee_id: int
+    first_name: str
+    last_name: str
+    department: Optional[str] = None
+    similarity: float = Field(..., ge=0, le=1, examples=[0.87], description="Cosine similarity of skill profiles")
+    shared_skills: int = Field(..., ge=0, description="Skills both employees hold")
+
+class EmployeeMatchSchema(BaseModel):
+    employee_id: int
+    first_name: str
+    last_name: str
+    department: Optional[str] = None
+    matched_skills: int = Field(..., ge=1, description="Requested skills the employee holds at the minimum level")
+    proficiency_sum: int = Field(..., ge=0)
+
+class SkillCategoryCreateSchema(BaseModel):
+    name: str = Field(..., max_length=100, examples=["Backend"])
+    parent_id: Optional[int] = Field(None, examples=[1], description="Parent category, empty for a root")
+
+class SkillCategorySchema(SkillCategoryCreateSchema):
+    id: int
+
+class SkillCategoryMoveSchema(BaseModel):
+    category_id: int
+    parent_id: Optional[int] = Field(None, description="New parent, empty to make the category a root")
+
+class SkillCategoryMovesSchema(BaseModel):
+    moves: List[SkillCategoryMoveSchema] = Field(..., min_length=1)
+
+class SkillCategoryAssignSchema(BaseModel):
+    skill_ids: List[int] = Field(..., min_length=1)
+
+class SkillCategoryTreeSchema(BaseModel):
+    id: int
+    name: str
+    skill_ids: List[int] = Field(default_factory=list)
+    children: List["SkillCategoryTreeSchema"] = Field(default_factory=list)
+
+class ContextEmployeeSchema(EmployeeBaseSchema):
+    id: int
+    total_xp: int
+
+class ContextSkillSchema(BaseModel):
+    skill_id: int
+    name: str
+    proficiency_level: int
+
+class ContextQuestSchema(BaseModel):
+    quest_id: int
+    name: str
+    current_count: int
+    required_count: int
+    progress_percentage: float
+    is_completed: bool
+    xp_reward: int
+
+class ContextRoadmapSchema(BaseModel):
+    roadmap_id: int
+    title: str
+    target_role: str
+    progress_percentage: float
+    is_completed: bool
+
+class ContextRewardSchema(BaseModel):
+    reward_id: int
+    name: str
+    type: str
+    earned_at: datetime
+    is_claimed: bool
+
+class ContextLevelSchema(BaseModel):
+    id: int
+    name: str
+    min_xp: int
+    badge_url: Optional[str] = None
+
+class ContextExperienceSchema(BaseModel):
+    points: int
+    action_type: str
+    created_at: datetime
+
+class EmployeeContextSchema(BaseModel):
+    """Shape of GET /employees/v1/{id}/context, the document itself is rendered by PostgreSQL"""
+    employee: ContextEmployeeSchema
+    profile_completion: int
+    level: Optional[ContextLevelSchema] = None
+    xp_to_next_level: Optional[int] = None
+    skills: List[ContextSkillSchema]
+    quests: List[ContextQuestSchema]
+    roadmaps: List[ContextRoadmapSchema]
+    rewards: List[ContextRewardSchema]
+    recent_xp: List[ContextExperienceSchema]
+
+class AdviceRequestSchema(BaseModel):
+    question: str = Field(..., min_length=1, max_length=2000, examples=["Какие навыки подтянуть до Senior?"])
+
+class AdviceSchema(BaseModel):
+    answer: str
+    fallback: bool = Field(False, description="The AI consultant was unavailable and a stub answer was returned")
+
+class SlowQueryPlanSchema(BaseModel):
+    captured_at: datetime
+    duration_ms: float
+    analyzed: bool = Field(False, description="EXPLAIN ANALYZE (actual times and buffers) or the estimated plan")
+    plan: Optional[Any] = None
+    error: Optional[str] = None
+
+class SlowQueryGroupSchema(BaseModel):
+    fingerprint: str
+    statement: str = Field(..., description="Latest captured text; parameters are placeholders, values are not kept")
+    parameter_types: List[str]
+    calls: int
+    total_ms: float
+    mean_ms: float
+    max_ms: float
+    first_seen: datetime
+    last_seen: datetime
+    plans: List[SlowQueryPlanSchema]
+
+class SlowQueryReportSchema(BaseModel):
+    threshold_ms: float
+    buffer_size: int
+    captured: int
+    groups: List[SlowQueryGroupSchema]
+
+class SingleFlightKeySchema(BaseModel):
+    name: str
+    arguments: List[Any]
+    calls: int
+    hits: int = Field(..., description="Served from the micro-cache")
+    coalesced: int = Field(..., description="Waited for a call of the same key that was already running")
+    loads: int = Field(..., description="Went to the database")
+    saved_ratio: float = Field(..., description="Share of calls that did not go to the database")
+    last_call: datetime
+
+class SingleFlightReportSchema(BaseModel):
+    ttl_seconds: float
+    cached_entries: int
+    tracked_keys: int
+    keys: List[SingleFlightKeySchema]
@@ -0,0 +1,117 @@
+"""
+Production server: gunicorn master with WEB_WORKERS uvicorn workers on uvloop and httptools.
+
+The application is imported once in the master (preload) and the objects it allocated are moved
+out of the garbage collector's reach with gc.freeze() before the workers are forked. Collections in
+the workers then do not touch, and so do not copy, the pages shared with the master. Every worker
+gets its own SQLAlchemy pool; with DB_CONNECTION_BUDGET the pool sizes are derived from it so that
+all workers together stay within the budget (see pool_sizes). Workers log to the console (stderr) only,
+app/logs/app.log is written by the master alone (see app.common.logging).
+
+On SIGTERM workers stop accepting connections and get WEB_GRACEFUL_TIMEOUT seconds to finish the
+requests in flight (open event streams included) before they are killed.
+
+Usage:
+    python -m app.serve                    # WEB_WORKERS, WEB_BIND from .env
+    python -m app.serve --workers 4 --bind 0.0.0.0:8000
+"""
+import argparse
+import gc
+import os
+import shutil
+from typing import Tuple
+
+from gunicorn.app.base import BaseApplication
+from uvicorn.workers import UvicornWorker
+
+from app.common.config import settings
+
+# per worker, outside the SQLAlchemy pool: the LISTEN connection and a sampled EXPLAIN
+CONNECTIONS_OUTSIDE_POOL = 2
+
+
+class Worker(UvicornWorker):
+    """UvicornWorker that requires uvloop and httptools instead of falling back to asyncio and h11"""
+
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools", "lifespan": "on"}
+
+
+def pool_sizes(budget: int, workers: int) -> Tuple[int, int]:
+    """pool_size and max_overflow of each worker, a quarter of its share kept as overflow"""
+    per_worker = budget // workers - CONNECTIONS_OUTSIDE_POOL
+    if per_worker < 1:
+        raise ValueError(
+            f"DB_CONNECTION_BUDGET={budget} is too small for {workers} workers, "
+            f"each needs at least {CONNECTIONS_OUTSIDE_POOL + 1} connections"
+        )
+    max_overflow = per_worker // 4
+    return per_worker - max_overflow, max_overflow
+
+
+def on_starting(server) -> None:
+    # snapshots of a previous run would be added to the totals of this one
+    directory = settings.METRICS_MULTIPROC_DIR
+    if directory:
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory, exist_ok=True)
+
+
+def when_ready(server) -> None:
+    # the preloaded application is in the master now; later workers are forked from this state too
+    gc.freeze()
+
+
+def post_fork(server, worker) -> None:
+    gc.enable()
+    from app.database import engine
+
+    # nothing should have connected in the master, but a connection must never cross a fork
+    engine.sync_engine.dispose(close=False)
+
+
+class ServerApplication(BaseApplication):
+    def __init__(self, options: dict):
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for name, value in self.options.items():
+            self.cfg.set(name, value)
+
+    def load(self):
+        from app.main import app
+
+        return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the API with several uvicorn workers under gunicorn")
+    parser.add_argument("--workers", type=int, default=settings.WEB_WORKERS or os.cpu_count() or 1)
+    parser.add_argument("--bind", default=settings.WEB_BIND)
+    args = parser.parse_args()
+
+    if settings.DB_CONNECTION_BUDGET:
+        # before app.database is imported, its engine is created from these settings
+        settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW = pool_sizes(settings.DB_CONNECTION_BUDGET, args.workers)
+
+    # no collections while the application is imported, they would only touch objects gc.freeze() keeps
+    gc.disable()
+    ServerApplication({
+        "bind": args.bind,
+        "workers": args.workers,
+        "worker_class": "app.serve.Worker",
+        "preload_app": True,
+        "timeout": settings.WEB_TIMEOUT,
+        "graceful_timeout": settings.WEB_GRACEFUL_TIMEOUT,
+        "keepalive": settings.WEB_KEEPALIVE,
+        "max_requests": settings.WEB_MAX_REQUESTS,
+        "max_requests_jitter": settings.WEB_MAX_REQUESTS // 10,
+        "forwarded_allow_ips": "*",
+        "on_starting": on_starting,
+        "when_ready": when_ready,
+        "post_fork": post_fork,
+    }).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+from typing import Optional
+
+from app.clients.ai_consultant import AIConsultantClient
+from app.common.exceptions import ExternalServiceException
+from app.schemas import AdviceSchema
+from app.services.employee_context_service import EmployeeContextService
+
+SYSTEM_PROMPT = (
+    "You are an HR consultant of the company. You get a JSON profile of an employee "
+    "(skills, quests, career roadmaps, rewards, level) and a question about their development. "
+    "Answer briefly and concretely, in the language of the question."
+)
+FALLBACK_ANSWER = "AI consultant is temporarily unavailable, please try again later"
+
+
+class AIConsultantService:
+    def __init__(self, context_service: EmployeeContextService, client: Optional[AIConsultantClient]):
+        self.context_service = context_service
+        self.client = client
+
+    async def advise(self, employee_id: int, question: str) -> AdviceSchema:
+        if self.client is None:
+            raise ExternalServiceException("AI consultant is not configured, set AI_CONSULTANT_URL")
+        context = await self.context_service.get_context(employee_id)
+        used_fallback = False
+
+        def fallback() -> str:
+            nonlocal used_fallback
+            used_fallback = True
+            return FALLBACK_ANSWER
+
+        answer = await self.client.chat(
+            [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": f"Employee: {context.decode()}\n\nQuestion: {question}"},
+            ],
+            fallback=fallback,
+        )
+        return AdviceSchema(answer=answer, fallback=used_fallback)
@@ -0,0 +1,46 @@
+from typing import Optional
+
+from app.common.exceptions import ServiceException
+from app.repositories.analytics_repository import AnalyticsRepository
+from app.schemas import SkillGapCellSchema
+from app.schemas import SkillGapHeatmapSchema
+
+# GROUPING(department, skill_id) values stored in skill_gap_matrix
+CELL_LEVEL = 0
+DEPARTMENT_LEVEL = 1
+SKILL_LEVEL = 2
+TOTAL_LEVEL = 3
+
+
+class AnalyticsService:
+    def __init__(self, repository: AnalyticsRepository):
+        self.repository = repository
+
+    async def get_skill_gap_heatmap(self, department: Optional[str] = None) -> SkillGapHeatmapSchema:
+        """Department x skill matrix served from the precomputed view"""
+        try:
+            rows = await self.repository.get_skill_gap_rows(department)
+
+            heatmap = SkillGapHeatmapSchema()
+            for row in rows:
+                cell = SkillGapCellSchema(**row)
+                level = row["grouping_level"]
+                if level == CELL_LEVEL:
+                    heatmap.cells.append(cell)
+                elif level == DEPARTMENT_LEVEL:
+                    heatmap.by_department.append(cell)
+                elif level == SKILL_LEVEL:
+                    heatmap.by_skill.append(cell)
+                else:
+                    heatmap.total = cell
+                heatmap.refreshed_at = row["refreshed_at"]
+
+            return heatmap
+        except Exception as e:
+            raise ServiceException(f"Failed to get skill gap heatmap: {str(e)}") from e
+
+    async def refresh_skill_gap_matrix(self) -> bool:
+        try:
+            return await self.repository.refresh_skill_gap_matrix()
+        except Exception as e:
+            raise ServiceException(f"Failed to refresh skill gap matrix: {str(e)}") from e
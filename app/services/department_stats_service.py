@@ -0,0 +1,150 @@
+from collections import defaultdict
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+
+from pydantic import TypeAdapter
+
+from app.cache.response_cache import cached
+from app.cache.single_flight import coalesced
+from app.common.config import settings
+from app.common.exceptions import ServiceException
+from app.common.logging import logger
+from app.common.metrics import registry
+from app.repositories.department_stats_repository import DepartmentStatsRepository
+from app.repositories.department_stats_repository import department_key
+from app.repositories.department_stats_repository import level_key
+from app.repositories.experience_repository import XpChange
+from app.schemas import DepartmentStatsSchema
+
+_STATS = TypeAdapter(List[DepartmentStatsSchema])
+
+SKIPPED_DELTAS = registry.counter(
+    "department_stats_skipped_deltas", "department_stats deltas that failed, restored by the reconciliation"
+)
+
+
+class DepartmentStatsService:
+    """
+    Keeps the department_stats read model in step with write paths.
+
+    Updates are best effort. Each delta is committed in its own transaction after the write it
+    follows has been committed (quest completions and XP included), so a failure in between loses
+    it: it is logged, counted in department_stats_skipped_deltas and left to the nightly
+    reconciliation (python -m app.jobs.department_stats_reconcile, reconcile()) instead of failing
+    the user's request.
+    """
+
+    def __init__(self, repository: DepartmentStatsRepository):
+        self.repository = repository
+
+    async def get_stats(self) -> List[DepartmentStatsSchema]:
+        try:
+            stats = await self.repository.get_all()
+            return [
+                DepartmentStatsSchema(
+                    department=row.department,
+                    headcount=row.headcount,
+                    avg_rating=round(row.rating_sum / row.headcount, 2) if row.headcount > 0 else 0.0,
+                    avg_total_xp=round(row.total_xp_sum / row.headcount, 1) if row.headcount > 0 else 0.0,
+                    quests_assigned=row.quests_assigned,
+                    quests_completed=row.quests_completed,
+                    quest_completion_rate=(
+                        round(row.quests_completed / row.quests_assigned, 3) if row.quests_assigned > 0 else 0.0
+                    ),
+                    level_distribution={key: count for key, count in row.level_distribution.items() if count},
+                    updated_at=row.updated_at,
+                )
+                for row in stats
+            ]
+        except Exception as e:
+            raise ServiceException(f"Failed to get department stats: {str(e)}") from e
+
+    @coalesced("departments.stats")
+    @cached("departments.stats", settings.DEPARTMENT_STATS_CACHE_TTL_SECONDS)
+    async def get_stats_json(self) -> bytes:
+        """get_stats() as a JSON array; changes with every event, so cached by TTL instead of invalidated"""
+        return _STATS.dump_json(await self.get_stats())
+
+    async def reconcile(self) -> int:
+        try:
+            return await self.repository.reconcile()
+        except Exception as e:
+            raise ServiceException(f"Failed to reconcile department stats: {str(e)}") from e
+
+    async def on_employee_created(self, department: Optional[str], rating: float, total_xp: int,
+                                  level_id: Optional[int]) -> None:
+        await self._apply(
+            department_key(department),
+            levels={level_key(level_id): 1},
+            headcount=1,
+            rating_sum=rating,
+            total_xp_sum=total_xp,
+        )
+
+    async def on_employee_updated(
+        self,
+        old_department: Optional[str],
+        old_rating: float,
+        new_department: Optional[str],
+        new_rating: float,
+        total_xp: int,
+        level_id: Optional[int],
+    ) -> None:
+        old_key, new_key = department_key(old_department), department_key(new_department)
+        if old_key == new_key:
+            if new_rating != old_rating:
+                await self._apply(new_key, rating_sum=new_rating - old_rating)
+            return
+        # quest counters move with the employee only through reconciliation
+        await self._apply(
+            old_key, levels={level_key(level_id): -1}, headcount=-1, rating_sum=-old_rating, total_xp_sum=-total_xp
+        )
+        await self._apply(
+            new_key, levels={level_key(level_id): 1}, headcount=1, rating_sum=new_rating, total_xp_sum=total_xp
+        )
+
+    async def on_quest_assigned(self, employee_id: int) -> None:
+        await self._apply_for_employee(employee_id, quests_assigned=1)
+
+    async def on_quests_completed(self, employee_id: int, count: int) -> None:
+        if count > 0:
+            await self._apply_for_employee(employee_id, quests_completed=count)
+
+    async def on_xp_awarded(self, department: Optional[str], points: int,
+                            old_level_id: Optional[int], new_level_id: Optional[int]) -> None:
+        levels = None
+        if old_level_id != new_level_id:
+            levels = {level_key(old_level_id): -1, level_key(new_level_id): 1}
+        await self._apply(department_key(department), levels=levels, total_xp_sum=points)
+
+    async def on_progress_batch(self, completed: Dict[Optional[str], int], xp_changes: Iterable[XpChange]) -> None:
+        """Completions per department and XP changes of a batch, one delta per department"""
+        counters: Dict[str, Dict[str, int]] = defaultdict(lambda: {"quests_completed": 0, "total_xp_sum": 0})
+        levels: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        for department, count in completed.items():
+            counters[department_key(department)]["quests_completed"] += count
+        for xp in xp_changes:
+            key = department_key(xp.department)
+            counters[key]["total_xp_sum"] += xp.points
+            if xp.level_changed:
+                levels[key][level_key(xp.old_level_id)] -= 1
+                levels[key][level_key(xp.new_level_id)] += 1
+        for department, values in counters.items():
+            changed = {level: delta for level, delta in levels[department].items() if delta}
+            await self._apply(department, levels=changed or None, **values)
+
+    async def _apply(self, department: str, levels=None, **counters) -> None:
+        try:
+            await self.repository.apply_delta(department, levels, **counters)
+        except Exception as e:
+            SKIPPED_DELTAS.inc()
+            logger.warning(f"Department stats update skipped for {department}: {str(e)}")
+
+    async def _apply_for_employee(self, employee_id: int, **counters) -> None:
+        try:
+            await self.repository.apply_employee_delta(employee_id, **counters)
+        except Exception as e:
+            SKIPPED_DELTAS.inc()
+            logger.warning(f"Department stats update skipped for employee {employee_id}: {str(e)}")
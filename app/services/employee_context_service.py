@@ -0,0 +1,28 @@
+from app.cache.employee_context import EmployeeContextCache
+from app.cache.employee_context import employee_context_cache
+from app.common.exceptions import NotFoundException
+from app.common.exceptions import ServiceException
+from app.repositories.employee_context_repository import EmployeeContextRepository
+
+
+class EmployeeContextService:
+    def __init__(self, repository: EmployeeContextRepository,
+                 cache: EmployeeContextCache = employee_context_cache):
+        self.repository = repository
+        self.cache = cache
+
+    async def get_context(self, employee_id: int) -> bytes:
+        """Ready-to-send JSON document, from the cache or one database round trip"""
+        blob = self.cache.get(employee_id)
+        if blob is not None:
+            return blob
+        token = self.cache.token(employee_id)
+        try:
+            document = await self.repository.get_context_json(employee_id)
+        except Exception as e:
+            raise ServiceException(f"Failed to get employee context: {str(e)}") from e
+        if document is None:
+            raise NotFoundException("Employee", str(employee_id))
+        blob = document.encode()
+        self.cache.put(employee_id, blob, token)
+        return blob
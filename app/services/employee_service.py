@@ -1,19 +1,35 @@
+from typing import List
+from typing import Optional
+from typing import Sequence
+
+from app.cache.employee_context import employee_context_cache
+from app.cache.single_flight import coalesced
+from app.cache.skill_taxonomy import skill_taxonomy
 from app.common.config import settings
 from app.common.exceptions import ServiceException
+from app.repositories.employee_repository import PROFILE_COMPLETION_WEIGHTS
 from app.repositories.employee_repository import EmployeeRepository
 from app.schemas import EmployeeCreateSchema
+from app.schemas import EmployeeMatchSchema
 from app.schemas import EmployeeSchema
 from app.schemas import EmployeeUpdateSchema
 from app.schemas import EmployeeWithSkillsSchema
 from app.schemas import ProfileCompletionSchema
 from app.schemas import QuestEventSchema
+from app.services.department_stats_service import DepartmentStatsService
 from app.services.quest_service import QuestService
 
 
 class EmployeeService:
-    def __init__(self, repository: EmployeeRepository, quest_service: QuestService):
+    def __init__(
+        self,
+        repository: EmployeeRepository,
+        quest_service: QuestService,
+        department_stats_service: DepartmentStatsService,
+    ):
         self.repository = repository
         self.quest_service = quest_service
+        self.department_stats_service = department_stats_service
         self.MAX_SKILLS_FOR_EMPLOYEE = settings.MAX_SKILLS_FOR_EMPLOYEE
 
     async def create_employee(self, employee_data: EmployeeCreateSchema) -> EmployeeSchema:
@@ -21,10 +37,40 @@ class EmployeeService:
         try:
             employee_dict = employee_data.model_dump()
             employee = await self.repository.create(employee_dict)
+            await self.department_stats_service.on_employee_created(
+                employee.department, employee.rating, employee.total_xp, employee.level_id
+            )
             return EmployeeSchema.model_validate(employee)
         except Exception as e:
             raise ServiceException(f"Failed to create employee: {str(e)}") from e
 
+    async def search_by_skills(
+        self,
+        skill_ids: Optional[Sequence[int]],
+        category_ids: Optional[Sequence[int]],
+        min_level: int = 1,
+        department: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> List[EmployeeMatchSchema]:
+        """Categories are expanded to their skills in memory, or in SQL until the taxonomy is loaded"""
+        try:
+            wanted = set(skill_ids or ())
+            sql_categories = None
+            if category_ids:
+                if skill_taxonomy.loaded:
+                    wanted |= skill_taxonomy.expand(category_ids)
+                else:
+                    sql_categories = category_ids
+            if not wanted and not sql_categories:
+                return []
+            rows = await self.repository.search_by_skills(
+                wanted, sql_categories, min_level, department, limit, offset
+            )
+            return [EmployeeMatchSchema.model_validate(dict(row)) for row in rows]
+        except Exception as e:
+            raise ServiceException(f"Failed to search employees: {str(e)}") from e
+
     async def get_employee_by_id(self, employee_id: int) -> EmployeeWithSkillsSchema:
         """Get employee by ID with skills"""
         try:
@@ -34,6 +80,11 @@ class EmployeeService:
         except Exception as e:
             raise ServiceException(f"Failed to get employee: {str(e)}") from e
 
+    @coalesced("employee.profile")
+    async def get_employee_json(self, employee_id: int) -> bytes:
+        """Employee with skills as a JSON document of EmployeeWithSkillsSchema"""
+        return (await self.get_employee_by_id(employee_id)).model_dump_json().encode()
+
     async def update_employee(
             self, employee_id: int, update_data: EmployeeUpdateSchema
     ) -> EmployeeSchema:
@@ -43,8 +94,20 @@ class EmployeeService:
             if not update_dict:
                 raise ServiceException("No data provided for update")
 
+            old_department, old_rating = None, 0.0
+            tracks_stats = "department" in update_dict or "rating" in update_dict
+            if tracks_stats:
+                current = await self.repository.get_by_id(employee_id)
+                old_department, old_rating = current.department, current.rating
+
             employee = await self.repository.update(employee_id, update_dict)
 
+            if tracks_stats:
+                await self.department_stats_service.on_employee_updated(
+                    old_department, old_rating, employee.department, employee.rating,
+                    employee.total_xp, employee.level_id,
+                )
+
             completion = await self.calculate_completion(employee_id)
 
             await self.quest_service.handle_quest_event(QuestEventSchema(
@@ -52,6 +115,7 @@ class EmployeeService:
                 action_type="profile_update",
                 count=1
             ))
+            await employee_context_cache.invalidate(employee_id)
 
             return EmployeeSchema.model_validate(employee)
         except Exception as e:
@@ -79,14 +143,7 @@ class EmployeeService:
 
     async def _calculate_completion_for_employee(self, employee) -> int:
         """Completion calculation based on field counts"""
-        FIELD_WEIGHTS = {
-            'first_name': 15,
-            'last_name': 15,
-            'email': 20,
-            'department': 15,
-            'rating': 15,
-            'skills': 20,
-        }
+        FIELD_WEIGHTS = PROFILE_COMPLETION_WEIGHTS
         fields_to_check = [
             ("first_name", lambda x: x and x.strip()),
             ("last_name", lambda x: x and x.strip()),
@@ -1,6 +1,8 @@
-from typing import List
-
+from app.cache.employee_context import employee_context_cache
+from app.cache.single_flight import coalesced
 from app.common.exceptions import ServiceException
+from app.common.fast_json import dump_rows
+from app.common.fast_json import row_dicts
 from app.repositories.employee_skill_repository import EmployeeSkillRepository
 from app.schemas import EmployeeSkillResponseSchema
 from app.schemas import QuestEventSchema
@@ -41,6 +43,7 @@ class EmployeeSkillService:
                 action_type="profile_completion",
                 count=completion.completion_percentage
             ))
+            await employee_context_cache.invalidate(employee_id)
 
             return EmployeeSkillResponseSchema(
                 skill_id=employee_skill.skill_id,
@@ -51,20 +54,11 @@ class EmployeeSkillService:
         except Exception as e:
             raise ServiceException(f"Failed to add skill to employee: {str(e)}") from e
 
-    async def get_employee_skills(self, employee_id: int) -> List[EmployeeSkillResponseSchema]:
-        """Get all skills for an employee"""
+    @coalesced("employee.skills")
+    async def get_employee_skills(self, employee_id: int) -> bytes:
+        """Get all skills for an employee, a JSON array of EmployeeSkillResponseSchema"""
         try:
-            employee_skills = await self.repository.get_employee_skills(employee_id)
-
-            return [
-                EmployeeSkillResponseSchema(
-                    skill_id=es.skill_id,
-                    proficiency_level=es.proficiency_level,
-                    skill_name=es.skills.name,
-                    skill_description=es.skills.description
-                )
-                for es in employee_skills
-            ]
+            return dump_rows(row_dicts(await self.repository.get_employee_skills(employee_id)))
         except Exception as e:
             raise ServiceException(f"Failed to get employee skills: {str(e)}") from e
 
@@ -72,6 +66,12 @@ class EmployeeSkillService:
         """Remove a skill from an employee"""
         try:
             await self.repository.remove_skill_from_employee(employee_id, skill_id)
+            await self.event_dispatcher.dispatch(QuestEventSchema(
+                employee_id=employee_id,
+                action_type="skill_remove",
+                count=1
+            ))
+            await employee_context_cache.invalidate(employee_id)
         except Exception as e:
             raise ServiceException(f"Failed to remove skill from employee: {str(e)}") from e
 
@@ -83,6 +83,12 @@ class EmployeeSkillService:
             employee_skill = await self.repository.update_employee_skill(
                 employee_id, skill_id, proficiency_level
             )
+            await self.event_dispatcher.dispatch(QuestEventSchema(
+                employee_id=employee_id,
+                action_type="skill_update",
+                count=1
+            ))
+            await employee_context_cache.invalidate(employee_id)
 
             return EmployeeSkillResponseSchema(
                 skill_id=employee_skill.skill_id,
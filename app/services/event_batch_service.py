@@ -0,0 +1,147 @@
+from collections import defaultdict
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+from app.cache.employee_context import employee_context_cache
+from app.common.exceptions import ServiceException
+from app.common.metrics import registry
+from app.events.live_events import live_events
+from app.repositories.experience_repository import XpChange
+from app.repositories.quest_repository import QuestRepository
+from app.schemas import EmployeeQuestProgressSchema
+from app.schemas import QuestEventBatchResultSchema
+from app.schemas import QuestEventResultSchema
+from app.schemas import QuestEventSchema
+from app.services.department_stats_service import DepartmentStatsService
+from app.services.quest_service import quest_live_events
+from app.services.roadmap_service import RoadmapService
+
+APPLIED = "applied"
+NO_MATCHING_QUESTS = "no_matching_quests"
+UNKNOWN_EMPLOYEE = "unknown_employee"
+
+BATCH_EVENTS = registry.counter(
+    "event_batch_events", "Events received in batches by result (applied, no_matching_quests, unknown_employee, failed)",
+    ("status",),
+)
+
+
+class EventBatchService:
+    """
+    Applies many quest events at once. Counts with the same (action_type, employee_id) are summed, which
+    gives the same progress as handling the events one by one with QuestService.handle_quest_event.
+    Everything is committed together; department stats, caches, roadmaps and live events are updated
+    once per batch instead of once per event.
+    """
+
+    def __init__(
+        self,
+        repository: QuestRepository,
+        department_stats_service: DepartmentStatsService,
+        roadmap_service: RoadmapService,
+    ):
+        self.repository = repository
+        self.department_stats_service = department_stats_service
+        self.roadmap_service = roadmap_service
+
+    async def handle_batch(self, events: List[QuestEventSchema]) -> QuestEventBatchResultSchema:
+        try:
+            known = set(await self.repository.existing_employee_ids(sorted({e.employee_id for e in events})))
+            progress: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+            accepted = []
+            for event in events:
+                if event.employee_id in known:
+                    progress[event.action_type][event.employee_id] += event.count
+                    accepted.append((event.employee_id, event.action_type, event.count))
+
+            rows, xp_changes = (
+                await self.repository.apply_progress_batch(progress, accepted) if progress else ({}, [])
+            )
+
+            quests: Dict[int, List[EmployeeQuestProgressSchema]] = defaultdict(list)
+            counts: Dict[Tuple[str, int], List[int]] = defaultdict(lambda: [0, 0])
+            completed: Dict[Optional[str], int] = defaultdict(int)
+            for action_type, updated in rows.items():
+                for row in updated:
+                    quests[row.employee_id].append(EmployeeQuestProgressSchema(
+                        quest_id=row.quest_id,
+                        quest_name=row.name,
+                        current_count=row.current_count,
+                        required_count=row.required_count,
+                        is_completed=row.is_completed,
+                        progress_percentage=(
+                            round(row.current_count / row.required_count * 100, 1) if row.required_count > 0 else 0
+                        ),
+                        xp_reward=row.xp_reward,
+                    ))
+                    counts[(action_type, row.employee_id)][0] += 1
+                    if row.is_completed:
+                        counts[(action_type, row.employee_id)][1] += 1
+                        completed[row.department] += 1
+
+            await self._after_batch(quests, completed, xp_changes)
+            summary = self._summary(events, known, counts, xp_changes)
+            BATCH_EVENTS.inc(summary.applied, status=APPLIED)
+            BATCH_EVENTS.inc(summary.no_matching_quests, status=NO_MATCHING_QUESTS)
+            BATCH_EVENTS.inc(summary.unknown_employee, status=UNKNOWN_EMPLOYEE)
+            return summary
+        except Exception as e:
+            BATCH_EVENTS.inc(len(events), status="failed")
+            raise ServiceException(f"Failed to handle event batch: {str(e)}") from e
+
+    async def _after_batch(
+        self,
+        quests: Dict[int, List[EmployeeQuestProgressSchema]],
+        completed: Dict[Optional[str], int],
+        xp_changes: List[XpChange],
+    ) -> None:
+        await self.department_stats_service.on_progress_batch(completed, xp_changes)
+        if not quests:
+            return
+        await employee_context_cache.invalidate(*quests)
+        await self.roadmap_service.recalculate_for_employees(
+            [employee_id for employee_id, items in quests.items() if any(quest.is_completed for quest in items)]
+        )
+        xp_by_employee = {xp.employee_id: xp for xp in xp_changes}
+        await live_events.publish_many({
+            employee_id: quest_live_events(items, xp_by_employee.get(employee_id))
+            for employee_id, items in quests.items()
+        })
+
+    @staticmethod
+    def _summary(
+        events: List[QuestEventSchema],
+        known: Set[int],
+        counts: Dict[Tuple[str, int], List[int]],
+        xp_changes: List[XpChange],
+    ) -> QuestEventBatchResultSchema:
+        results = []
+        # events of one (action_type, employee_id) were applied as one sum: the first of them reports the
+        # quests of the group, the others report 0, so the per-event counts add up to the batch totals
+        reported: Set[Tuple[str, int]] = set()
+        for index, event in enumerate(events):
+            if event.employee_id not in known:
+                results.append(QuestEventResultSchema(index=index, status=UNKNOWN_EMPLOYEE))
+                continue
+            group = (event.action_type, event.employee_id)
+            updated, done = counts.get(group, (0, 0))
+            results.append(QuestEventResultSchema(
+                index=index,
+                status=APPLIED if updated else NO_MATCHING_QUESTS,
+                quests_updated=0 if group in reported else updated,
+                quests_completed=0 if group in reported else done,
+            ))
+            reported.add(group)
+        return QuestEventBatchResultSchema(
+            received=len(events),
+            applied=sum(1 for result in results if result.status == APPLIED),
+            no_matching_quests=sum(1 for result in results if result.status == NO_MATCHING_QUESTS),
+            unknown_employee=sum(1 for result in results if result.status == UNKNOWN_EMPLOYEE),
+            quests_updated=sum(updated for updated, _ in counts.values()),
+            quests_completed=sum(done for _, done in counts.values()),
+            xp_awarded=sum(xp.points for xp in xp_changes),
+            results=results,
+        )
@@ -1,7 +1,20 @@
-from app.common.logging import logger
+import time
+
+from app.common.logging import get_logger
+from app.common.metrics import registry
 from app.events.event_handler_factory import EventHandlerFactory
 from app.schemas import QuestEventSchema
 
+EVENTS_DISPATCHED = registry.counter(
+    "events_dispatched", "Dispatched events by action type and outcome (ok, unhandled, failed)",
+    ("action_type", "outcome"),
+)
+DISPATCH_DURATION = registry.histogram(
+    "event_dispatch_duration_seconds", "Time to handle a dispatched event", ("action_type",)
+)
+
+logger = get_logger("events.dispatch")
+
 
 class EventDispatcherService:
     def __init__(self, handler_factory: EventHandlerFactory):
@@ -11,10 +24,20 @@ class EventDispatcherService:
         """Dispatch event to appropriate handler"""
         try:
             handler = self.handler_factory.get_handler(event.action_type)
+        except ValueError:
+            # unknown action types are not used as label values, they come from the request body
+            EVENTS_DISPATCHED.inc(action_type="unregistered", outcome="unhandled")
+            logger.warning("No handler registered for action type: %s", event.action_type)
+            return
+
+        started = time.perf_counter()
+        try:
             await handler.handle(event)
-            logger.info(f"Successfully handled event: {event.action_type}")
+            EVENTS_DISPATCHED.inc(action_type=event.action_type, outcome="ok")
+            logger.info("Successfully handled event: %s", event.action_type)
 
-        except ValueError:
-            logger.warning(f"No handler registered for action type: {event.action_type}")
         except Exception as e:
-            logger.error(f"Error handling event {event.action_type}: {str(e)}")
+            EVENTS_DISPATCHED.inc(action_type=event.action_type, outcome="failed")
+            logger.error("Error handling event %s: %s", event.action_type, e)
+        finally:
+            DISPATCH_DURATION.observe(time.perf_counter() - started, action_type=event.action_type)
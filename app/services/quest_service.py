@@ -1,63 +1,84 @@
 from typing import List
+from typing import Optional
 
+from app.cache.employee_context import employee_context_cache
+from app.cache.response_cache import cached
+from app.cache.response_cache import employee_scope
+from app.cache.response_cache import quests_scope
+from app.cache.response_cache import response_cache
+from app.cache.single_flight import coalesced
+from app.cache.single_flight import single_flight
+from app.common.config import settings
 from app.common.exceptions import ServiceException
+from app.common.fast_json import dump_rows
+from app.common.fast_json import row_dicts
+from app.events.live_events import live_events
+from app.repositories.experience_repository import XpChange
 from app.repositories.quest_repository import QuestRepository
 from app.schemas import EmployeeQuestProgressSchema
 from app.schemas import QuestCreateSchema
 from app.schemas import QuestEventSchema
 from app.schemas import QuestSchema
+from app.services.department_stats_service import DepartmentStatsService
+
+
+def quest_live_events(quests: List[EmployeeQuestProgressSchema], xp: Optional[XpChange]) -> List[tuple]:
+    """Live events of one employee after a progress update"""
+    events = [
+        ("quest_completed" if quest.is_completed else "quest_progress", quest.model_dump())
+        for quest in quests
+    ]
+    if xp is not None:
+        events.append(("xp_awarded", {"points": xp.points, "total_xp": xp.total_xp}))
+        if xp.level_changed:
+            events.append(("level_up", {"old_level_id": xp.old_level_id, "level_id": xp.new_level_id}))
+    return events
 
 
 class QuestService:
-    def __init__(self, repository: QuestRepository):
+    def __init__(self, repository: QuestRepository, department_stats_service: DepartmentStatsService):
         self.repository = repository
+        self.department_stats_service = department_stats_service
 
     async def create_quest(self, quest_data: QuestCreateSchema) -> QuestSchema:
         try:
             quest = await self.repository.create_quest(quest_data.model_dump())
+            await response_cache.invalidate(quests_scope())
+            single_flight.forget(("quests.all",))
             return QuestSchema.model_validate(quest)
         except Exception as e:
             raise ServiceException(f"Failed to create quest: {str(e)}") from e
 
-    async def get_all_quests(self) -> List[QuestSchema]:
+    @coalesced("quests.all")
+    @cached("quests.all", settings.RESPONSE_CACHE_TTL_SECONDS, quests_scope)
+    async def get_all_quests(self) -> bytes:
+        """JSON array of QuestSchema, serialized straight from the selected columns"""
         try:
-            quests = await self.repository.get_all_quests()
-            return [QuestSchema.model_validate(quest) for quest in quests]
+            return dump_rows(row_dicts(await self.repository.get_all_quests()))
         except Exception as e:
             raise ServiceException(f"Failed to get quests: {str(e)}") from e
 
     async def assign_quest(self, employee_id: int, quest_id: int) -> None:
         try:
             await self.repository.assign_quest_to_employee(employee_id, quest_id)
+            await self.department_stats_service.on_quest_assigned(employee_id)
+            await employee_context_cache.invalidate(employee_id)
         except Exception as e:
             raise ServiceException(f"Failed to assign quest: {str(e)}") from e
 
-    async def get_employee_quests(self, employee_id: int) -> List[EmployeeQuestProgressSchema]:
+    @coalesced("quests.employee")
+    @cached("quests.employee", settings.RESPONSE_CACHE_TTL_SECONDS, employee_scope)
+    async def get_employee_quests(self, employee_id: int) -> bytes:
+        """JSON array of EmployeeQuestProgressSchema, serialized straight from the selected columns"""
         try:
-            employee_quests = await self.repository.get_employee_quests(employee_id)
-
-            result = []
-            for eq in employee_quests:
-                progress_percentage = (
-                                                  eq.current_count / eq.quest.required_count) * 100 if eq.quest.required_count > 0 else 0
-                result.append(EmployeeQuestProgressSchema(
-                    quest_id=eq.quest_id,
-                    quest_name=eq.quest.name,
-                    current_count=eq.current_count,
-                    required_count=eq.quest.required_count,
-                    is_completed=eq.is_completed,
-                    progress_percentage=round(progress_percentage, 1),
-                    xp_reward=eq.quest.xp_reward
-                ))
-
-            return result
+            return dump_rows(row_dicts(await self.repository.get_employee_quests(employee_id)))
         except Exception as e:
             raise ServiceException(f"Failed to get employee quests: {str(e)}") from e
 
     async def handle_quest_event(self, event: QuestEventSchema) -> List[EmployeeQuestProgressSchema]:
         """Main method to handle quest progression events"""
         try:
-            updated_quests = await self.repository.update_quest_progress(
+            updated_quests, xp = await self.repository.update_quest_progress(
                 event.employee_id,
                 event.action_type,
                 event.count
@@ -76,6 +97,17 @@ class QuestService:
                     xp_reward=eq.quest.xp_reward
                 ))
 
+            # after the commit of the progress, see DepartmentStatsService
+            await self.department_stats_service.on_quests_completed(
+                event.employee_id, sum(1 for quest in result if quest.is_completed)
+            )
+            if xp is not None:
+                await self.department_stats_service.on_xp_awarded(
+                    xp.department, xp.points, xp.old_level_id, xp.new_level_id
+                )
+            if result:
+                await employee_context_cache.invalidate(event.employee_id)
+                await live_events.publish(event.employee_id, quest_live_events(result, xp))
             return result
         except Exception as e:
             raise ServiceException(f"Failed to handle quest event: {str(e)}") from e
@@ -0,0 +1,34 @@
+from typing import Sequence
+
+from app.cache.employee_context import employee_context_cache
+from app.common.exceptions import ServiceException
+from app.common.logging import logger
+from app.repositories.roadmap_repository import RoadmapRepository
+
+
+class RoadmapService:
+    def __init__(self, repository: RoadmapRepository):
+        self.repository = repository
+
+    async def recalculate_all(self) -> int:
+        """Recompute progress for every employee roadmap"""
+        try:
+            updated = await self.repository.recalculate_progress()
+            logger.info("Roadmap progress recalculated, %s rows changed", updated)
+            if updated:
+                await employee_context_cache.clear()
+            return updated
+        except Exception as e:
+            raise ServiceException(f"Failed to recalculate roadmap progress: {str(e)}") from e
+
+    async def recalculate_for_employees(self, employee_ids: Sequence[int]) -> int:
+        """Recompute progress only for roadmaps of the given employees"""
+        if not employee_ids:
+            return 0
+        try:
+            updated = await self.repository.recalculate_progress(employee_ids)
+            if updated:
+                await employee_context_cache.invalidate(*employee_ids)
+            return updated
+        except Exception as e:
+            raise ServiceException(f"Failed to recalculate roadmap progress: {str(e)}") from e
@@ -0,0 +1,56 @@
+from typing import List
+
+import numpy as np
+
+from app.common.exceptions import IndexNotReadyException
+from app.common.exceptions import ServiceException
+from app.ml.employee_similarity import get_similarity_index
+from app.repositories.employee_repository import EmployeeRepository
+from app.schemas import SimilarEmployeeSchema
+
+
+class SimilarEmployeeService:
+    def __init__(self, repository: EmployeeRepository):
+        self.repository = repository
+
+    async def find_similar(self, employee_id: int, limit: int = 10,
+                           approximate: bool = False) -> List[SimilarEmployeeSchema]:
+        """
+        Employees with the most similar skill profiles.
+        Employees without skills in the published matrix get an empty list.
+        """
+        index = get_similarity_index()
+        if index is None:
+            raise IndexNotReadyException(
+                "Skill matrix is not built yet, run python -m app.jobs.build_skill_matrix"
+            )
+        try:
+            matrix = index.matrix
+            row = matrix.row_index(employee_id)
+            if row is None:
+                return []
+            rows, scores = index.search(row, limit, approximate)
+            matches = [(int(r), float(s)) for r, s in zip(rows.tolist(), scores.tolist(), strict=True) if s > 0]
+            if not matches:
+                return []
+
+            own_skills, _ = matrix.employee_skills(employee_id)
+            employee_ids = [int(matrix.employee_ids[r]) for r, _ in matches]
+            employees = {e.id: e for e in await self.repository.get_by_ids(employee_ids)}
+            result = []
+            for (_, score), other_id in zip(matches, employee_ids, strict=True):
+                employee = employees.get(other_id)
+                if employee is None:
+                    continue
+                other_skills, _ = matrix.employee_skills(other_id)
+                result.append(SimilarEmployeeSchema(
+                    employee_id=other_id,
+                    first_name=employee.first_name,
+                    last_name=employee.last_name,
+                    department=employee.department,
+                    similarity=round(min(score, 1.0), 4),
+                    shared_skills=len(np.intersect1d(own_skills, other_skills, assume_unique=True)),
+                ))
+            return result
+        except Exception as e:
+            raise ServiceException(f"Failed to find similar employees: {str(e)}") from e
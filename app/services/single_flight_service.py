@@ -0,0 +1,40 @@
+from datetime import datetime
+from datetime import timezone
+from typing import Optional
+
+from app.cache.single_flight import KeyStats
+from app.cache.single_flight import SingleFlight
+from app.schemas import SingleFlightKeySchema
+from app.schemas import SingleFlightReportSchema
+
+
+class SingleFlightService:
+    def __init__(self, single_flight: SingleFlight):
+        self.single_flight = single_flight
+
+    def get_report(self, limit: int, name: Optional[str] = None) -> SingleFlightReportSchema:
+        """Counters of the tracked keys, the most called first"""
+        stats = self.single_flight.key_stats(name)
+        stats.sort(key=lambda item: item.calls, reverse=True)
+        return SingleFlightReportSchema(
+            ttl_seconds=self.single_flight.ttl,
+            cached_entries=len(self.single_flight),
+            tracked_keys=len(stats),
+            keys=[self._key(item) for item in stats[:limit]],
+        )
+
+    def reset(self) -> None:
+        self.single_flight.reset_stats()
+
+    @staticmethod
+    def _key(stats: KeyStats) -> SingleFlightKeySchema:
+        return SingleFlightKeySchema(
+            name=stats.key[0],
+            arguments=list(stats.key[1:]),
+            calls=stats.calls,
+            hits=stats.hits,
+            coalesced=stats.coalesced,
+            loads=stats.loads,
+            saved_ratio=round((stats.hits + stats.coalesced) / stats.calls, 3) if stats.calls else 0.0,
+            last_call=datetime.fromtimestamp(stats.last_call, timezone.utc),
+        )
@@ -0,0 +1,32 @@
+from typing import List
+
+from app.common.exceptions import ServiceException
+from app.repositories.skill_recommendation_repository import (
+    SkillRecommendationRepository,
+)
+from app.schemas import RecommendedSkillSchema
+
+# Added to the neighbour score (0..1) of skills the employee's open roadmaps require
+ROADMAP_GAP_BOOST = 0.5
+
+
+class SkillRecommendationService:
+    def __init__(self, repository: SkillRecommendationRepository):
+        self.repository = repository
+
+    async def recommend(self, employee_id: int, limit: int = 10) -> List[RecommendedSkillSchema]:
+        try:
+            rows = await self.repository.get_recommendations(employee_id, limit, ROADMAP_GAP_BOOST)
+            return [
+                RecommendedSkillSchema(
+                    skill_id=row.skill_id,
+                    skill_name=row.skill_name,
+                    score=round(float(row.score), 4),
+                    roadmap_gap=bool(row.roadmap_gap),
+                    required_level=row.required_level,
+                    current_level=row.current_level,
+                )
+                for row in rows
+            ]
+        except Exception as e:
+            raise ServiceException(f"Failed to recommend skills: {str(e)}") from e
@@ -1,8 +1,21 @@
+from typing import List
 from typing import Optional
 
+from app.cache.skill_catalog import skill_catalog
+from app.common.config import settings
 from app.common.exceptions import DuplicateSkillException
+from app.common.exceptions import IndexNotReadyException
+from app.common.exceptions import IntegrityDataException
+from app.common.exceptions import SimilarSkillException
+from app.ml.skill_search import get_skill_search_index
 from app.repositories.skill_repository import SkillRepository
 from app.schemas import SkillSchema
+from app.schemas import SkillSearchResultSchema
+from app.schemas import SkillSuggestionSchema
+
+# Matches below this score are noise from shared short n-grams
+SEARCH_MIN_SCORE = 0.05
+DUPLICATE_CANDIDATES = 3
 
 
 class SkillService:
@@ -10,15 +23,73 @@ class SkillService:
         self.repository = repository
 
 
-    async def create(self, name: str, description: Optional[str]) -> SkillSchema:
+    async def create(self, name: str, description: Optional[str], allow_similar: bool = False) -> SkillSchema:
         """Create a new skill"""
-        if await self.repository.validate_skill_exists_by_name(name):
+        if await self._name_exists(name):
             raise DuplicateSkillException(
                 f'Skill with name "{name}" already exists')
+        if not allow_similar:
+            await self._check_near_duplicates(name, description)
 
-        skill = await self.repository.create(name=name, description=description)
+        try:
+            skill = await self.repository.create(name=name, description=description)
+        except IntegrityDataException:
+            # the catalog may not have heard about a skill created by another worker yet
+            if await self.repository.validate_skill_exists_by_name(name):
+                raise DuplicateSkillException(f'Skill with name "{name}" already exists') from None
+            raise
+        await skill_catalog.publish_created(skill.id, skill.name)
         return SkillSchema(
             id=skill.id,
             name=skill.name,
             description=skill.description,
         )
+
+    async def _name_exists(self, name: str) -> bool:
+        if skill_catalog.loaded:
+            return skill_catalog.contains(name)
+        return await self.repository.validate_skill_exists_by_name(name)
+
+    async def autocomplete(self, prefix: str, limit: int = 10) -> List[SkillSuggestionSchema]:
+        """Served from the in-memory catalog, from the database until it is loaded"""
+        if skill_catalog.loaded:
+            suggestions = skill_catalog.autocomplete(prefix, limit)
+        else:
+            suggestions = await self.repository.autocomplete(prefix, limit)
+        return [SkillSuggestionSchema(id=skill_id, name=name) for skill_id, name in suggestions]
+
+    async def _check_near_duplicates(self, name: str, description: Optional[str]) -> None:
+        """Reject names the search index scores above SKILL_DUPLICATE_THRESHOLD (skipped without an index)"""
+        index = get_skill_search_index()
+        if index is None:
+            return
+        matches = index.search_many(
+            [(name, description)], DUPLICATE_CANDIDATES, min_score=settings.SKILL_DUPLICATE_THRESHOLD
+        )[0]
+        if matches:
+            skills = {skill.id: skill.name for skill in await self.repository.get_by_ids([i for i, _ in matches])}
+            similar = [skills[skill_id] for skill_id, _ in matches if skill_id in skills]
+            if similar:
+                raise SimilarSkillException(name, similar)
+
+    async def search(self, query: str, limit: int = 10) -> List[SkillSearchResultSchema]:
+        """Skills ranked by character n-gram similarity to the query"""
+        index = get_skill_search_index()
+        if index is None:
+            raise IndexNotReadyException(
+                "Skill search index is not built yet, run python -m app.jobs.build_skill_search_index"
+            )
+        matches = index.search(query, limit, min_score=SEARCH_MIN_SCORE)
+        if not matches:
+            return []
+        skills = {skill.id: skill for skill in await self.repository.get_by_ids([i for i, _ in matches])}
+        return [
+            SkillSearchResultSchema(
+                id=skill_id,
+                name=skills[skill_id].name,
+                description=skills[skill_id].description,
+                score=round(min(score, 1.0), 4),
+            )
+            for skill_id, score in matches
+            if skill_id in skills
+        ]
@@ -0,0 +1,46 @@
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from app.cache.skill_taxonomy import SkillTaxonomy
+from app.cache.skill_taxonomy import skill_taxonomy
+from app.common.exceptions import ValidationException
+from app.repositories.skill_taxonomy_repository import SkillTaxonomyRepository
+from app.schemas import SkillCategorySchema
+
+
+class SkillTaxonomyService:
+    def __init__(self, repository: SkillTaxonomyRepository, taxonomy: SkillTaxonomy = skill_taxonomy):
+        self.repository = repository
+        self.taxonomy = taxonomy
+
+    async def create_category(self, name: str, parent_id: Optional[int]) -> SkillCategorySchema:
+        category = await self.repository.create_category(name, parent_id)
+        await self.taxonomy.publish_changed()
+        return SkillCategorySchema(id=category.id, name=category.name, parent_id=category.parent_id)
+
+    async def move_categories(self, moves: Sequence[Tuple[int, Optional[int]]]) -> None:
+        """Apply all moves atomically, rejecting any that would put a category under itself"""
+        cyclic = await self.repository.move_categories(moves)
+        if cyclic is not None:
+            raise ValidationException(f"Skill category {cyclic} cannot be moved into its own subtree")
+        await self.taxonomy.publish_changed()
+
+    async def assign_skills(self, category_id: Optional[int], skill_ids: Sequence[int]) -> int:
+        updated = await self.repository.assign_skills(category_id, skill_ids)
+        await self.taxonomy.publish_changed()
+        return updated
+
+    async def rebuild_closure(self) -> int:
+        rows = await self.repository.rebuild_closure()
+        await self.taxonomy.publish_changed()
+        return rows
+
+    async def get_tree(self) -> List[Dict[str, Any]]:
+        if not self.taxonomy.loaded:
+            await self.taxonomy.load()
+        return self.taxonomy.tree()
+
@@ -0,0 +1,57 @@
+from collections import defaultdict
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from app.common.config import settings
+from app.common.slow_queries import SlowQuery
+from app.common.slow_queries import SlowQueryLog
+from app.schemas import SlowQueryGroupSchema
+from app.schemas import SlowQueryPlanSchema
+from app.schemas import SlowQueryReportSchema
+
+
+class SlowQueryService:
+    def __init__(self, log: SlowQueryLog):
+        self.log = log
+
+    def get_report(self, limit: int, fingerprint: Optional[str] = None) -> SlowQueryReportSchema:
+        """Captured statements grouped by fingerprint, the groups with the most total time first"""
+        entries = self.log.entries()
+        groups: Dict[str, List[SlowQuery]] = defaultdict(list)
+        for entry in entries:
+            if fingerprint is None or entry.fingerprint == fingerprint:
+                groups[entry.fingerprint].append(entry)
+
+        report = sorted(
+            (self._group(items) for items in groups.values()), key=lambda group: group.total_ms, reverse=True
+        )
+        return SlowQueryReportSchema(
+            threshold_ms=settings.SQL_SLOW_QUERY_MS,
+            buffer_size=self.log.size,
+            captured=len(entries),
+            groups=report[:limit],
+        )
+
+    def clear(self) -> None:
+        self.log.clear()
+
+    @staticmethod
+    def _group(items: List[SlowQuery]) -> SlowQueryGroupSchema:
+        latest = items[-1]
+        total = sum(item.duration_ms for item in items)
+        return SlowQueryGroupSchema(
+            fingerprint=latest.fingerprint,
+            statement=latest.statement,
+            parameter_types=latest.parameters,
+            calls=len(items),
+            total_ms=round(total, 1),
+            mean_ms=round(total / len(items), 1),
+            max_ms=round(max(item.duration_ms for item in items), 1),
+            first_seen=items[0].captured_at,
+            last_seen=latest.captured_at,
+            plans=[
+                SlowQueryPlanSchema(captured_at=item.captured_at, duration_ms=round(item.duration_ms, 1), **item.plan)
+                for item in reversed(items) if item.plan is not None
+            ],
+        )
@@ -0,0 +1,127 @@
+"""
+Throughput of quest event ingestion: one event per call (QuestService.handle_quest_event, what the
+per-request dispatch does) against POST /events/v1/batch (EventBatchService.handle_batch).
+
+Needs the database from .env with migrations applied. Creates --employees synthetic employees and one
+quest assigned to all of them, tagged with a random action type, and deletes them at the end. The quest
+cannot be completed (huge required_count), so XP and department stats are left untouched.
+
+Usage:
+    python -m benchmarks.event_batch --employees 5000 --events 20000 --batch-size 5000
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+
+from sqlalchemy import delete
+from sqlalchemy import insert
+from sqlalchemy import select
+
+from app.database import engine
+from app.database import session_maker
+from app.models import Employee
+from app.models import EmployeeQuest
+from app.models import Quest
+from app.repositories.department_stats_repository import DepartmentStatsRepository
+from app.repositories.quest_repository import QuestRepository
+from app.repositories.roadmap_repository import RoadmapRepository
+from app.schemas import QuestEventSchema
+from app.services.department_stats_service import DepartmentStatsService
+from app.services.event_batch_service import EventBatchService
+from app.services.quest_service import QuestService
+from app.services.roadmap_service import RoadmapService
+
+
+async def setup(tag: str, employees: int) -> tuple:
+    async with session_maker() as session:
+        quest_id = (await session.execute(
+            insert(Quest).values(
+                name=f"benchmark {tag}", xp_reward=0, is_active=True, action_type=tag, required_count=2**30
+            ).returning(Quest.id)
+        )).scalar_one()
+        employee_ids = list((await session.execute(
+            insert(Employee).returning(Employee.id),
+            [
+                {"email": f"{tag}-{i}@benchmark.invalid", "first_name": "Bench", "last_name": str(i), "rating": 0}
+                for i in range(employees)
+            ],
+        )).scalars().all())
+        await session.execute(
+            insert(EmployeeQuest),
+            [{"employee_id": i, "quest_id": quest_id, "current_count": 0, "is_completed": False} for i in employee_ids],
+        )
+        await session.commit()
+        return quest_id, employee_ids
+
+
+async def cleanup(tag: str, quest_id: int) -> None:
+    async with session_maker() as session:
+        await session.execute(delete(Quest).where(Quest.id == quest_id))
+        await session.execute(delete(Employee).where(Employee.email.like(f"{tag}-%@benchmark.invalid")))
+        await session.commit()
+
+
+async def progress_sum(quest_id: int) -> int:
+    async with session_maker() as session:
+        counts = await session.execute(select(EmployeeQuest.current_count).where(EmployeeQuest.quest_id == quest_id))
+        return sum(counts.scalars().all())
+
+
+async def one_by_one(events: list) -> float:
+    async with session_maker() as session:
+        service = QuestService(QuestRepository(session), DepartmentStatsService(DepartmentStatsRepository(session)))
+        started = time.perf_counter()
+        for event in events:
+            await service.handle_quest_event(event)
+        return time.perf_counter() - started
+
+
+async def batched(events: list, batch_size: int) -> float:
+    async with session_maker() as session:
+        service = EventBatchService(
+            QuestRepository(session),
+            DepartmentStatsService(DepartmentStatsRepository(session)),
+            RoadmapService(RoadmapRepository(session)),
+        )
+        started = time.perf_counter()
+        for offset in range(0, len(events), batch_size):
+            await service.handle_batch(events[offset:offset + batch_size])
+        return time.perf_counter() - started
+
+
+async def main_async(args) -> None:
+    engine.sync_engine.echo = False
+    tag = f"bench_{uuid.uuid4().hex[:12]}"
+    quest_id, employee_ids = await setup(tag, args.employees)
+    try:
+        rng = random.Random(0)
+        events = [
+            QuestEventSchema(employee_id=rng.choice(employee_ids), action_type=tag, count=rng.randint(1, 3))
+            for _ in range(args.events)
+        ]
+        sample = events[: args.single_events]
+        elapsed = await one_by_one(sample)
+        print(f"{'one event per call':<28} {len(sample) / elapsed:9.0f} events/s ({len(sample)} events)")
+        elapsed = await batched(events, args.batch_size)
+        print(f"{f'batches of {args.batch_size}':<28} {len(events) / elapsed:9.0f} events/s ({len(events)} events)")
+        expected = sum(event.count for event in sample) + sum(event.count for event in events)
+        print(f"progress check: {'ok' if await progress_sum(quest_id) == expected else 'MISMATCH'}")
+    finally:
+        await cleanup(tag, quest_id)
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=2000)
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--single-events", type=int, default=1000, help="events sent one by one")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
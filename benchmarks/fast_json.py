@@ -0,0 +1,104 @@
+"""
+CPU per item of a list endpoint response: a Pydantic model per row, validated again through
+response_model and serialized by JSONResponse (previous path) against column rows serialized
+once by app.common.fast_json.
+
+Rows come from an in-memory SQLite table, so fetching them is included in both paths; ORM
+hydration of the previous path (EmployeeQuest + selectinload of Quest) needs PostgreSQL and is
+not, the real difference is larger.
+
+Usage:
+    python -m benchmarks.fast_json --items 200 --repeat 500
+"""
+import argparse
+import asyncio
+import random
+import time
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from sqlalchemy import create_engine
+from sqlalchemy import text
+
+from app.common.fast_json import dump_rows
+from app.common.fast_json import row_dicts
+from app.schemas import EmployeeQuestProgressSchema
+
+SELECT = text(
+    "SELECT quest_id, quest_name, current_count, required_count, is_completed, "
+    "CASE WHEN required_count > 0 THEN round(current_count * 100.0 / required_count, 1) ELSE 0.0 END "
+    "AS progress_percentage, xp_reward FROM employee_quests"
+)
+
+
+def seed(connection, items: int) -> None:
+    connection.execute(text(
+        "CREATE TABLE employee_quests (quest_id INTEGER, quest_name TEXT, current_count INTEGER, "
+        "required_count INTEGER, is_completed BOOLEAN, xp_reward INTEGER)"
+    ))
+    rng = random.Random(0)
+    rows = []
+    for quest_id in range(1, items + 1):
+        required = rng.randint(1, 100)
+        current = rng.randint(0, required)
+        rows.append({
+            "quest_id": quest_id, "quest_name": f"Quest {quest_id}", "current_count": current,
+            "required_count": required, "is_completed": current == required, "xp_reward": rng.randint(10, 500),
+        })
+    connection.execute(text(
+        "INSERT INTO employee_quests VALUES "
+        "(:quest_id, :quest_name, :current_count, :required_count, :is_completed, :xp_reward)"
+    ), rows)
+
+
+async def previous_path(connection, field) -> bytes:
+    result = []
+    for row in connection.execute(SELECT).all():
+        result.append(EmployeeQuestProgressSchema(
+            quest_id=row.quest_id,
+            quest_name=row.quest_name,
+            current_count=row.current_count,
+            required_count=row.required_count,
+            is_completed=row.is_completed,
+            progress_percentage=row.progress_percentage,
+            xp_reward=row.xp_reward,
+        ))
+    content = await serialize_response(field=field, response_content=result, is_coroutine=True)
+    return JSONResponse(content).body
+
+
+async def fast_path(connection) -> bytes:
+    return dump_rows(row_dicts(connection.execute(SELECT).all()))
+
+
+async def measure(coroutine_factory, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        await coroutine_factory()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    field = create_response_field(name="Response_get_employee_quests", type_=List[EmployeeQuestProgressSchema])
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        seed(connection, args.items)
+        for title, factory in (
+            ("models + response_model", lambda: previous_path(connection, field)),
+            ("column rows -> bytes", lambda: fast_path(connection)),
+        ):
+            asyncio.run(measure(factory, 10))
+            elapsed = asyncio.run(measure(factory, args.repeat))
+            per_item = elapsed / (args.repeat * args.items) * 1e6
+            print(f"{title:<24} {elapsed / args.repeat * 1000:7.2f} ms/response  {per_item:6.2f} us/item")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Request latency impact of logging: handlers called on the event loop (the previous setup) against
+a queue + writer thread writing record by record, and the batching writer of app.common.logging,
+with and without sampling. Requests per second and p50 hide the cost of a writer thread: it takes
+the GIL from the event loop, so compare the p99 and max columns as well.
+
+Each simulated request awaits a few times (as a handler awaiting the database would) and writes
+--records INFO records plus as many DEBUG f-strings that the level filters out.
+
+Usage:
+    python -m benchmarks.logging_pipeline --requests 20000 --concurrency 100 --records 3
+"""
+import argparse
+import asyncio
+import gc
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import tempfile
+import time
+
+import numpy as np
+
+from app.common.logging import BatchingQueueListener
+from app.common.logging import LocalQueueHandler
+from app.common.logging import SamplingFilter
+from app.common.logging import datefmt
+from app.common.logging import fmt
+
+
+class _StripColorsFormatter(logging.Formatter):
+    # the file formatter of the previous setup
+    def format(self, record):
+        return re.sub(r'\033\[\d+m', '', super().format(record))
+
+
+def _handlers(directory: str, name: str):
+    file_handler = logging.handlers.RotatingFileHandler(
+        os.path.join(directory, f"{name}.log"), maxBytes=5 * 1024 * 1024, backupCount=3
+    )
+    console_handler = logging.StreamHandler(open(os.devnull, "w"))
+    formatter = _StripColorsFormatter(fmt, datefmt)
+    file_handler.setFormatter(formatter)
+    console_handler.setFormatter(formatter)
+    return file_handler, console_handler
+
+
+def direct_logger(directory: str) -> logging.Logger:
+    logger = logging.getLogger("benchmark.direct")
+    for handler in _handlers(directory, "direct"):
+        logger.addHandler(handler)
+    return logger
+
+
+def queued_logger(directory: str, name: str, sample_rate: float = 1.0, batch_size: int = 0):
+    logger = logging.getLogger(f"benchmark.{name}")
+    log_queue: queue.Queue = queue.Queue(100_000)
+    logger.addHandler(LocalQueueHandler(log_queue))
+    if sample_rate < 1:
+        logger.addFilter(SamplingFilter(sample_rate))
+    if batch_size:
+        listener = BatchingQueueListener(log_queue, *_handlers(directory, name), batch_size=batch_size)
+    else:
+        listener = logging.handlers.QueueListener(log_queue, *_handlers(directory, name))
+    listener.start()
+    return logger, listener
+
+
+async def run(logger: logging.Logger, requests: int, concurrency: int, records: int) -> np.ndarray:
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    timings = np.empty(requests)
+    semaphore = asyncio.Semaphore(concurrency)
+    payload = {"employee_id": 42, "action_type": "profile_updated", "count": 1}
+
+    async def request(i: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            for _ in range(records):
+                await asyncio.sleep(0)
+                logger.debug(f"Filtered out, still formatted: {payload}")
+                logger.info("Handled event %s for employee %s", payload["action_type"], payload["employee_id"])
+            timings[i] = time.perf_counter() - started
+
+    await asyncio.gather(*(request(i) for i in range(requests)))
+    return timings
+
+
+def report(title: str, timings: np.ndarray, elapsed: float) -> None:
+    p50, p99, worst = np.percentile(timings, [50, 99, 100]) * 1e6
+    print(f"{title:<22} {len(timings) / elapsed:>9.0f} req/s  p50 {p50:8.1f} us  p99 {p99:8.1f} us  max {worst:9.1f} us")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--records", type=int, default=3, help="INFO records per request")
+    parser.add_argument("--sample-rate", type=float, default=0.1)
+    parser.add_argument("--batch-size", type=int, default=512, help="records per write of the batching writer")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        setups = [("direct handlers", direct_logger(directory), None)]
+        setups.append(("queue, per record", *queued_logger(directory, "queue")))
+        setups.append(("queue, batched", *queued_logger(directory, "batched", batch_size=args.batch_size)))
+        setups.append((
+            f"batched, sampled {args.sample_rate:g}",
+            *queued_logger(directory, "sampled", args.sample_rate, args.batch_size),
+        ))
+        for title, logger, listener in setups:
+            gc.collect()  # the garbage of the previous setup is not collected during this one
+            started = time.perf_counter()
+            timings = asyncio.run(run(logger, args.requests, args.concurrency, args.records))
+            report(title, timings, time.perf_counter() - started)
+            if listener is not None:
+                started = time.perf_counter()
+                listener.stop()
+                print(f"{'':<22} writer thread drained the queue in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+Outbound client against a local OpenAI-compatible stub: pooling, batching, caching, circuit breaking.
+
+Usage:
+    python -m benchmarks.outbound_client --requests 2000 --concurrency 100 --latency-ms 20
+    python -m benchmarks.outbound_client --serve --port 8089   # stub only, for AI_CONSULTANT_URL
+
+The stub answers /embeddings and /chat/completions after --latency-ms and fails with 503 while
+its failure switch is on, which the circuit breaker scenario toggles.
+"""
+import argparse
+import asyncio
+import time
+
+import aiohttp
+import numpy as np
+from aiohttp import web
+
+from app.clients.ai_consultant import AIConsultantClient
+from app.clients.http import OutboundHttpClient
+from app.common.metrics import registry
+
+
+class StubServer:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.failing = False
+        self.calls = {"embeddings": 0, "chat": 0}
+        self.app = web.Application()
+        self.app.router.add_post("/embeddings", self.embeddings)
+        self.app.router.add_post("/chat/completions", self.chat)
+
+    async def embeddings(self, request: web.Request) -> web.Response:
+        self.calls["embeddings"] += 1
+        body = await request.json()
+        await asyncio.sleep(self.latency)
+        if self.failing:
+            return web.json_response({"error": "unavailable"}, status=503)
+        data = [
+            {"index": i, "embedding": [float(len(text)), float(sum(map(ord, text)) % 97)]}
+            for i, text in enumerate(body["input"])
+        ]
+        return web.json_response({"data": data})
+
+    async def chat(self, request: web.Request) -> web.Response:
+        self.calls["chat"] += 1
+        body = await request.json()
+        await asyncio.sleep(self.latency)
+        if self.failing:
+            return web.json_response({"error": "unavailable"}, status=503)
+        question = body["messages"][-1]["content"]
+        return web.json_response({"choices": [{"message": {"role": "assistant", "content": f"echo: {question}"}}]})
+
+    async def start(self, port: int = 0) -> str:
+        runner = web.AppRunner(self.app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", port)
+        await site.start()
+        self._runner = runner
+        return f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+    async def stop(self) -> None:
+        await self._runner.cleanup()
+
+
+def report(name: str, timings: list) -> None:
+    p50, p99 = np.percentile(np.array(timings) * 1000, [50, 99])
+    print(f"{name:<32} p50 {p50:7.2f} ms  p99 {p99:7.2f} ms")
+
+
+async def run_limited(count: int, concurrency: int, call) -> list:
+    semaphore = asyncio.Semaphore(concurrency)
+    timings = []
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await call(i)
+            timings.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(one(i) for i in range(count)))
+    return timings
+
+
+async def scenario_pooling(url: str, args) -> None:
+    async def fresh_session(i: int) -> None:
+        async with aiohttp.ClientSession() as session:
+            async with session.post(f"{url}/chat/completions", json=chat_body(i)) as response:
+                await response.json()
+
+    started = time.perf_counter()
+    timings = await run_limited(args.requests, args.concurrency, fresh_session)
+    report("session per call", timings)
+    print(f"{'':<32} {args.requests / (time.perf_counter() - started):7.0f} req/s")
+
+    client = OutboundHttpClient(limit=args.pool, limit_per_host=args.pool)
+    await client.start()
+    try:
+        async def pooled(i: int) -> None:
+            await client.request_json("POST", f"{url}/chat/completions", json_body=chat_body(i))
+
+        started = time.perf_counter()
+        timings = await run_limited(args.requests, args.concurrency, pooled)
+        report(f"pooled (limit {args.pool})", timings)
+        print(f"{'':<32} {args.requests / (time.perf_counter() - started):7.0f} req/s")
+    finally:
+        await client.close()
+
+
+def chat_body(i: int) -> dict:
+    return {"model": "stub", "messages": [{"role": "user", "content": f"question {i}"}]}
+
+
+async def scenario_batching(url: str, stub: StubServer, args) -> None:
+    client = OutboundHttpClient(limit=args.pool, limit_per_host=args.pool, cache_size=0)
+    await client.start()
+    consultant = AIConsultantClient(client, url, batch_size=args.batch_size, batch_delay=args.batch_delay_ms / 1000)
+    try:
+        before = stub.calls["embeddings"]
+        timings = await run_limited(args.requests, args.requests, lambda i: consultant.embed(f"skill {i}"))
+        report("embed, micro-batched", timings)
+        print(f"{'':<32} {args.requests} texts in {stub.calls['embeddings'] - before} upstream calls")
+    finally:
+        await consultant.close()
+        await client.close()
+
+
+async def scenario_cache(url: str, stub: StubServer, args) -> None:
+    client = OutboundHttpClient()
+    await client.start()
+    consultant = AIConsultantClient(client, url)
+    try:
+        before = stub.calls["chat"]
+        questions = [f"question {i % 50}" for i in range(args.requests)]
+        timings = await run_limited(
+            len(questions), 1, lambda i: consultant.chat([{"role": "user", "content": questions[i]}])
+        )
+        report("chat, 50 distinct questions", timings)
+        print(f"{'':<32} {len(questions)} calls, {stub.calls['chat'] - before} reached the stub")
+    finally:
+        await client.close()
+
+
+async def scenario_breaker(url: str, stub: StubServer, args) -> None:
+    client = OutboundHttpClient(failure_threshold=5, reset_timeout=0.5, cache_size=0)
+    await client.start()
+    consultant = AIConsultantClient(client, url)
+    fallbacks = 0
+
+    def fallback() -> str:
+        nonlocal fallbacks
+        fallbacks += 1
+        return "fallback"
+
+    async def ask(i: int) -> None:
+        await consultant.chat([{"role": "user", "content": f"q{i}"}], fallback=fallback)
+
+    try:
+        stub.failing = True
+        before = stub.calls["chat"]
+        timings = await run_limited(200, 1, ask)
+        report("chat while upstream fails", timings)
+        print(f"{'':<32} 200 calls, {stub.calls['chat'] - before} reached the stub, {fallbacks} fallbacks")
+        stub.failing = False
+        await asyncio.sleep(0.6)
+        await ask(0)
+        print(f"{'':<32} after reset timeout: circuit {client.breaker(url.split('//')[1]).state}")
+    finally:
+        await client.close()
+
+
+async def main_async(args) -> None:
+    stub = StubServer(args.latency_ms / 1000)
+    url = await stub.start(args.port)
+    if args.serve:
+        print(f"Stub AI consultant on {url}, Ctrl+C to stop")
+        await asyncio.Event().wait()
+    try:
+        print(f"stub latency {args.latency_ms} ms, {args.requests} requests, concurrency {args.concurrency}")
+        await scenario_pooling(url, args)
+        await scenario_batching(url, stub, args)
+        await scenario_cache(url, stub, args)
+        await scenario_breaker(url, stub, args)
+        if args.metrics:
+            print(registry.render())
+    finally:
+        await stub.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--pool", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--batch-delay-ms", type=float, default=10)
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--serve", action="store_true", help="only run the stub server")
+    parser.add_argument("--metrics", action="store_true", help="print collected metrics at the end")
+    args = parser.parse_args()
+    try:
+        asyncio.run(main_async(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
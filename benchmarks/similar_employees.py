@@ -0,0 +1,101 @@
+"""
+Recall / latency benchmark for GET /employees/v1/{employee_id}/similar.
+
+Generates a synthetic employee x skill matrix (employees cluster around role skill sets),
+then compares exact brute force with the LSH index on the same queries.
+
+Usage:
+    python -m benchmarks.similar_employees --employees 100000 --skills 2000 --queries 500
+"""
+import argparse
+import time
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from app.ml.employee_similarity import LSH_BITS
+from app.ml.employee_similarity import LSH_SEED
+from app.ml.employee_similarity import LSH_TABLES
+from app.ml.employee_similarity import ExactIndex
+from app.ml.employee_similarity import LSHIndex
+from app.ml.employee_similarity import build_lsh_arrays
+
+
+def synthetic_holdings(employees: int, skills: int, roles: int, seed: int = 0) -> csr_matrix:
+    rng = np.random.default_rng(seed)
+    role_skills = [rng.choice(skills, size=25, replace=False) for _ in range(roles)]
+    indptr, indices, data = [0], [], []
+    for role in rng.integers(0, roles, size=employees):
+        own = rng.choice(role_skills[role], size=rng.integers(4, 12), replace=False)
+        extra = rng.choice(skills, size=rng.integers(0, 4), replace=False)
+        columns = np.unique(np.concatenate([own, extra]))
+        indices.extend(columns.tolist())
+        data.extend(rng.integers(1, 6, size=len(columns)).tolist())
+        indptr.append(len(indices))
+    return csr_matrix(
+        (np.array(data, dtype=np.float32), np.array(indices, dtype=np.int32), np.array(indptr)),
+        shape=(employees, skills),
+    )
+
+
+def percentile_ms(samples: list, q: float) -> float:
+    return float(np.percentile(samples, q) * 1000)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=20_000)
+    parser.add_argument("--skills", type=int, default=1_000)
+    parser.add_argument("--roles", type=int, default=60)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    holdings = synthetic_holdings(args.employees, args.skills, args.roles)
+    employee_ids = np.arange(1, args.employees + 1, dtype=np.int64)
+    skill_ids = np.arange(1, args.skills + 1, dtype=np.int64)
+    queries = np.random.default_rng(1).choice(args.employees, size=args.queries, replace=False)
+
+    started = time.perf_counter()
+    exact = ExactIndex.from_holdings(holdings)
+    print(f"exact index build: {time.perf_counter() - started:.3f}s")
+
+    started = time.perf_counter()
+    arrays, _ = build_lsh_arrays(holdings, employee_ids, skill_ids)
+    meta = {"n_tables": LSH_TABLES, "n_bits": LSH_BITS, "seed": LSH_SEED}
+    lsh = LSHIndex(arrays, meta)
+    print(f"lsh index build: {time.perf_counter() - started:.3f}s")
+
+    # a rebuild after 1% of employees changed skills only re-signs those rows
+    changed = holdings.tolil()
+    for row in queries[: max(1, args.employees // 100)]:
+        changed[row, int(row) % args.skills] = 3
+    started = time.perf_counter()
+    _, recomputed = build_lsh_arrays(changed.tocsr(), employee_ids, skill_ids, lsh)
+    print(f"incremental lsh rebuild: {time.perf_counter() - started:.3f}s, {recomputed} signatures recomputed")
+
+    started = time.perf_counter()
+    batch_truth, truth_scores = exact.search(queries, args.k)
+    print(f"exact batched: {(time.perf_counter() - started) / len(queries) * 1000:.3f} ms/query")
+
+    exact_times, lsh_times, recalls, candidate_counts = [], [], [], []
+    for query, truth_score in zip(queries.tolist(), truth_scores, strict=True):
+        started = time.perf_counter()
+        exact.search(np.array([query]), args.k)
+        exact_times.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        candidates = lsh.candidates(query)
+        _, found_scores = exact.rerank(query, candidates, args.k)
+        lsh_times.append(time.perf_counter() - started)
+        candidate_counts.append(len(candidates))
+        # tie-aware: any result scoring at least the exact k-th score counts as a hit
+        recalls.append(np.count_nonzero(found_scores >= truth_score[-1] - 1e-6) / len(truth_score))
+
+    print(f"exact single: p50 {percentile_ms(exact_times, 50):.3f} ms, p95 {percentile_ms(exact_times, 95):.3f} ms")
+    print(f"lsh single:   p50 {percentile_ms(lsh_times, 50):.3f} ms, p95 {percentile_ms(lsh_times, 95):.3f} ms")
+    print(f"lsh recall@{args.k}: {np.mean(recalls):.3f}, mean candidates {np.mean(candidate_counts):.0f}")
+
+
+if __name__ == "__main__":
+    main()
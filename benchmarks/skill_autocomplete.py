@@ -0,0 +1,65 @@
+"""
+Latency of in-memory skill autocomplete (GET /skills/v1/autocomplete).
+
+Usage:
+    python -m benchmarks.skill_autocomplete --skills 100000 --queries 20000
+"""
+import argparse
+import random
+import string
+import time
+
+import numpy as np
+
+from app.cache.skill_catalog import SkillCatalog
+
+
+def random_names(count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    names = set()
+    while len(names) < count:
+        words = [
+            "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9))).capitalize()
+            for _ in range(rng.randint(1, 3))
+        ]
+        names.add(rng.choice([" ", "-", "/"]).join(words))
+    return sorted(names)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--skills", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=20_000)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    names = random_names(args.skills)
+    catalog = SkillCatalog(reload_interval=0)
+    started = time.perf_counter()
+    catalog.replace(list(enumerate(names, start=1)))
+    print(f"load {args.skills} skills: {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    rng = random.Random(1)
+    # keystroke-sized prefixes of existing names, plus misses
+    prefixes = [
+        rng.choice(names)[:rng.randint(1, 6)] if rng.random() < 0.9
+        else "".join(rng.choices(string.ascii_lowercase, k=4))
+        for _ in range(args.queries)
+    ]
+    timings = np.empty(len(prefixes))
+    for i, prefix in enumerate(prefixes):
+        started = time.perf_counter()
+        catalog.autocomplete(prefix, args.limit)
+        timings[i] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for skill_id, name in enumerate(random_names(1000, seed=2), start=args.skills + 1):
+        catalog.add(skill_id, name)
+    print(f"add: {(time.perf_counter() - started) / 1000 * 1e6:.1f} us/skill")
+
+    p50, p99, worst = np.percentile(timings, [50, 99, 100]) * 1e6
+    print(f"autocomplete p50 {p50:.1f} us, p99 {p99:.1f} us, max {worst:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Requests per second of the production server (python -m app.serve) by number of workers.
+
+For every worker count the server is started on --port, warmed up and loaded for --duration
+seconds by --clients client processes (so the load generator is not the bottleneck) with
+--concurrency connections each, then stopped with SIGTERM. Needs the database from .env, the
+requested path should be a read endpoint, e.g. /quests/v1/ or /skills/v1/autocomplete?q=py.
+
+Usage:
+    python -m benchmarks.workers --workers 1 2 4 8 --path /quests/v1/ --duration 20
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import aiohttp
+import numpy as np
+
+
+async def _load(url: str, concurrency: int, duration: float) -> tuple:
+    timings, errors = [], 0
+    deadline = time.perf_counter() + duration
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+
+        async def client() -> None:
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    async with session.get(url) as response:
+                        await response.read()
+                        if response.status != 200:
+                            errors += 1
+                            continue
+                except aiohttp.ClientError:
+                    errors += 1
+                    continue
+                timings.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+    return timings, errors
+
+
+def _client_process(url: str, concurrency: int, duration: float, results) -> None:
+    results.put(asyncio.run(_load(url, concurrency, duration)))
+
+
+def wait_until_up(url: str, timeout: float = 60.0) -> None:
+    async def probe() -> bool:
+        async with aiohttp.ClientSession() as session:
+            try:
+                async with session.get(url) as response:
+                    return response.status == 200
+            except aiohttp.ClientError:
+                return False
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if asyncio.run(probe()):
+            return
+        time.sleep(0.5)
+    raise RuntimeError(f"Server did not answer {url} within {timeout:.0f}s")
+
+
+def run(workers: int, args) -> None:
+    url = f"http://127.0.0.1:{args.port}{args.path}"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.serve", "--workers", str(workers), "--bind", f"127.0.0.1:{args.port}"],
+        env={**os.environ, "LOG_LEVEL": "WARNING"},
+    )
+    try:
+        wait_until_up(url)
+        asyncio.run(_load(url, args.concurrency, 2.0))
+
+        results = multiprocessing.Queue()
+        clients = [
+            multiprocessing.Process(target=_client_process, args=(url, args.concurrency, args.duration, results))
+            for _ in range(args.clients)
+        ]
+        for process in clients:
+            process.start()
+        collected = [results.get() for _ in clients]
+        for process in clients:
+            process.join()
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+
+    timings = np.array([timing for client_timings, _ in collected for timing in client_timings])
+    errors = sum(client_errors for _, client_errors in collected)
+    p50, p99 = np.percentile(timings, [50, 99]) * 1000 if len(timings) else (0.0, 0.0)
+    print(
+        f"{workers:>3} workers  {len(timings) / args.duration:>8.0f} req/s  "
+        f"p50 {p50:6.1f} ms  p99 {p99:6.1f} ms  errors {errors}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--path", default="/quests/v1/")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--clients", type=int, default=2, help="Load generator processes")
+    parser.add_argument("--concurrency", type=int, default=64, help="Connections per client process")
+    args = parser.parse_args()
+
+    for workers in args.workers:
+        run(workers, args)
+
+
+if __name__ == "__main__":
+    main()
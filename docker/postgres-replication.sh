@@ -0,0 +1,3 @@
+#!/bin/sh
+# Allows streaming replication connections from the compose network (runs on first initialisation)
+echo "host replication all all md5" >> "$PGDATA/pg_hba.conf"